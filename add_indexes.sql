@@ -12,6 +12,10 @@ CREATE INDEX IF NOT EXISTS idx_dept_dtls_tndr_pk ON "DEPT_DTLS"(tndr_pk);
 CREATE INDEX IF NOT EXISTS idx_dept_dtls_code ON "DEPT_DTLS"("DEPT_SUB_DEPT_CODE");
 CREATE INDEX IF NOT EXISTS idx_dept_dtls_name ON "DEPT_DTLS"("DEPT_NAME");
 
+-- Trigram index for department-name lookups (needs the pg_trgm contrib extension)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_dept_dtls_name_trgm ON "DEPT_DTLS" USING gin ("DEPT_NAME" gin_trgm_ops);
+
 -- Indexes for DISTRICT_DETAILS table
 CREATE INDEX IF NOT EXISTS idx_district_tndr_pk ON "DISTRICT_DETAILS"(tndr_pk);
 CREATE INDEX IF NOT EXISTS idx_district_code ON "DISTRICT_DETAILS"("DIST_CODE");
@@ -22,3 +26,14 @@ CREATE INDEX IF NOT EXISTS idx_dept_dtls_composite ON "DEPT_DTLS"(tndr_pk, "DEPT
 
 -- Index for tender_master
 CREATE INDEX IF NOT EXISTS idx_tender_master_pk ON tender_master(tndr_pk);
+
+-- Keyset pagination indexes (project listings seek on these instead of OFFSET)
+CREATE INDEX IF NOT EXISTS idx_tender_data_keyset ON "TENDER_DATA_DTLS"(tndr_pk, ("DEPARTMENT_CODE" IS NULL), COALESCE("DEPARTMENT_CODE", ''), ("PROJECT_NAME" IS NULL), COALESCE("PROJECT_NAME", ''), "TDM_PK");
+CREATE INDEX IF NOT EXISTS idx_tender_data_stage_keyset ON "TENDER_DATA_DTLS"(tndr_pk, "COMPLETION_STAGE", ("DEPARTMENT_CODE" IS NULL), COALESCE("DEPARTMENT_CODE", ''), ("PROJECT_NAME" IS NULL), COALESCE("PROJECT_NAME", ''), "TDM_PK");
+CREATE INDEX IF NOT EXISTS idx_dept_dtls_keyset ON "DEPT_DTLS"(tndr_pk, ("DEPT_NAME" IS NULL), COALESCE("DEPT_NAME", ''), "DEPT_DTLS_PK");
+
+-- Index for the snapshot summary table
+CREATE INDEX IF NOT EXISTS idx_tender_summary_tndr_pk ON "TENDER_SUMMARY"(tndr_pk, "DEPARTMENT_CODE");
+
+-- Index for the ingest job queue (claim scans by status in job order)
+CREATE INDEX IF NOT EXISTS idx_ingest_job_status ON ingest_job(status, job_pk);
@@ -1,12 +1,18 @@
-from fastapi import APIRouter, Query, Depends
+from fastapi import APIRouter, Query, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from app.api.services.dashboard_service import DashboardService
+from app.api.utils.cache import cache_stats
+from app.api.utils.fast_json import render
 
 router = APIRouter()
+# Data endpoints come in a sync and an async flavour; main.py mounts one of them (DASHBOARD_ASYNC)
+sync_router = APIRouter()
+async_router = APIRouter()
 
 def get_dashboard_service():
     return DashboardService()
 
-@router.get("/stats")
+@sync_router.get("/stats")
 def get_overview(
     tndr_id: int = Query(..., description="Tender primary key"),
     dept_name: str = Query(None, description="Optional department name filter"),
@@ -15,25 +21,28 @@ def get_overview(
     """Get overall tender stats, optionally filtered by department name"""
     return dashboard_service.get_overview(tndr_id, dept_name)
 
-@router.get("/tender-masters")
+@sync_router.get("/tender-masters")
 def get_all_tender_masters(
     dashboard_service: DashboardService = Depends(get_dashboard_service)
 ):
     """Get all tender master records"""
     return dashboard_service.get_all_tender_masters()
 
-@router.get("/tender-details-deptwise")
+@sync_router.get("/tender-details-deptwise")
 def get_tender_details_deptwise(
     tndr_id: int = Query(..., description="Tender primary key"),
     dept_name: str = Query(None, description="Optional department name filter"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Items per page"),
+    cursor: str = Query(None, description="next_cursor from the previous page; takes precedence over page"),
+    layout: str = Query(None, pattern="^(rows|columns)$", description="Opt-in fast JSON: rows (row objects) or columns ({columns, rows})"),
     dashboard_service: DashboardService = Depends(get_dashboard_service)
 ):
-    """Get tender details department-wise with optional dept_name filter and pagination"""
-    return dashboard_service.get_tender_details_deptwise(tndr_id, dept_name, page, page_size)
+    """Get tender details department-wise with optional dept_name filter and page or cursor pagination"""
+    result = dashboard_service.get_tender_details_deptwise(tndr_id, dept_name, page, page_size, cursor, layout)
+    return render(result) if layout else result
 
-@router.get("/fund-flow")
+@sync_router.get("/fund-flow")
 def get_fund_flow(
     tndr_id: int = Query(..., description="Tender primary key"),
     dept_name: str = Query(None, description="Optional department name filter"),
@@ -42,13 +51,126 @@ def get_fund_flow(
     """Get fund flow summary - sanctioned, received, utilized amounts, optionally filtered by department"""
     return dashboard_service.get_fund_flow(tndr_id, dept_name)
 
-@router.get("/projects-by-completion")
+@sync_router.get("/projects-by-completion")
 def get_projects_by_completion(
     tndr_id: int = Query(..., description="Tender primary key"),
     completion: str = Query(None, description="Optional filter: 25, 50, 75, completed"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Items per page"),
+    cursor: str = Query(None, description="next_cursor from the previous page; takes precedence over page"),
+    layout: str = Query(None, pattern="^(rows|columns)$", description="Opt-in fast JSON: rows (row objects) or columns ({columns, rows})"),
     dashboard_service: DashboardService = Depends(get_dashboard_service)
 ):
     """Get project details filtered by completion stage. completion: 25, 50, 75, completed. Leave empty for all."""
-    return dashboard_service.get_projects_by_completion(tndr_id, completion, page, page_size)
+    result = dashboard_service.get_projects_by_completion(tndr_id, completion, page, page_size, cursor, layout)
+    return render(result) if layout else result
+
+@sync_router.get("/summary")
+def get_summary(
+    tndr_id: int = Query(..., description="Tender primary key"),
+    dept_name: str = Query(None, description="Optional department name filter for overview and fund flow"),
+    completion: str = Query(None, description="Optional completion filter for the projects page: 25, 50, 75, completed"),
+    page_size: int = Query(10, ge=1, le=100, description="Projects on the first page"),
+    layout: str = Query(None, pattern="^(rows|columns)$", description="Opt-in fast JSON: rows (row objects) or columns ({columns, rows})"),
+    dashboard_service: DashboardService = Depends(get_dashboard_service)
+):
+    """Overview, fund flow and the first projects-by-completion page in one response"""
+    result = dashboard_service.get_summary(tndr_id, dept_name, completion, page_size, layout)
+    return render(result) if layout else result
+
+@router.get("/export")
+def export_projects(
+    tndr_id: int = Query(..., description="Tender primary key"),
+    dept_name: str = Query(None, description="Optional department name filter"),
+    completion: str = Query(None, description="Optional filter: 25, 50, 75, 100, completed"),
+    format: str = Query("csv", description="csv, xlsx or parquet"),
+    dashboard_service: DashboardService = Depends(get_dashboard_service)
+):
+    """Download every project row of a snapshot, optionally filtered, streamed from a server-side cursor"""
+    result = dashboard_service.export_projects(tndr_id, dept_name, completion, format)
+    if not result.get("success"):
+        raise HTTPException(status_code=400, detail=result.get("error"))
+    return StreamingResponse(
+        result["content"],
+        media_type=result["media_type"],
+        headers={"Content-Disposition": f'attachment; filename="{result["filename"]}"'}
+    )
+
+@router.get("/cache-stats")
+def get_cache_stats():
+    """Dashboard cache hit/miss counters for this process"""
+    return cache_stats.snapshot()
+
+@router.get("/query-stats")
+def get_query_stats(
+    dashboard_service: DashboardService = Depends(get_dashboard_service)
+):
+    """Prepared-statement reuse and plan counters for dashboard queries"""
+    return dashboard_service.get_query_stats()
+
+
+@async_router.get("/stats")
+async def get_overview_async(
+    tndr_id: int = Query(..., description="Tender primary key"),
+    dept_name: str = Query(None, description="Optional department name filter"),
+    dashboard_service: DashboardService = Depends(get_dashboard_service)
+):
+    """Get overall tender stats, optionally filtered by department name"""
+    return await dashboard_service.get_overview_async(tndr_id, dept_name)
+
+@async_router.get("/tender-masters")
+async def get_all_tender_masters_async(
+    dashboard_service: DashboardService = Depends(get_dashboard_service)
+):
+    """Get all tender master records"""
+    return await dashboard_service.get_all_tender_masters_async()
+
+@async_router.get("/tender-details-deptwise")
+async def get_tender_details_deptwise_async(
+    tndr_id: int = Query(..., description="Tender primary key"),
+    dept_name: str = Query(None, description="Optional department name filter"),
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(10, ge=1, le=100, description="Items per page"),
+    cursor: str = Query(None, description="next_cursor from the previous page; takes precedence over page"),
+    layout: str = Query(None, pattern="^(rows|columns)$", description="Opt-in fast JSON: rows (row objects) or columns ({columns, rows})"),
+    dashboard_service: DashboardService = Depends(get_dashboard_service)
+):
+    """Get tender details department-wise with optional dept_name filter and page or cursor pagination"""
+    result = await dashboard_service.get_tender_details_deptwise_async(tndr_id, dept_name, page, page_size, cursor, layout)
+    return render(result) if layout else result
+
+@async_router.get("/fund-flow")
+async def get_fund_flow_async(
+    tndr_id: int = Query(..., description="Tender primary key"),
+    dept_name: str = Query(None, description="Optional department name filter"),
+    dashboard_service: DashboardService = Depends(get_dashboard_service)
+):
+    """Get fund flow summary - sanctioned, received, utilized amounts, optionally filtered by department"""
+    return await dashboard_service.get_fund_flow_async(tndr_id, dept_name)
+
+@async_router.get("/projects-by-completion")
+async def get_projects_by_completion_async(
+    tndr_id: int = Query(..., description="Tender primary key"),
+    completion: str = Query(None, description="Optional filter: 25, 50, 75, completed"),
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(10, ge=1, le=100, description="Items per page"),
+    cursor: str = Query(None, description="next_cursor from the previous page; takes precedence over page"),
+    layout: str = Query(None, pattern="^(rows|columns)$", description="Opt-in fast JSON: rows (row objects) or columns ({columns, rows})"),
+    dashboard_service: DashboardService = Depends(get_dashboard_service)
+):
+    """Get project details filtered by completion stage. completion: 25, 50, 75, completed. Leave empty for all."""
+    result = await dashboard_service.get_projects_by_completion_async(tndr_id, completion, page, page_size, cursor, layout)
+    return render(result) if layout else result
+
+@async_router.get("/summary")
+async def get_summary_async(
+    tndr_id: int = Query(..., description="Tender primary key"),
+    dept_name: str = Query(None, description="Optional department name filter for overview and fund flow"),
+    completion: str = Query(None, description="Optional completion filter for the projects page: 25, 50, 75, completed"),
+    page_size: int = Query(10, ge=1, le=100, description="Projects on the first page"),
+    layout: str = Query(None, pattern="^(rows|columns)$", description="Opt-in fast JSON: rows (row objects) or columns ({columns, rows})"),
+    dashboard_service: DashboardService = Depends(get_dashboard_service)
+):
+    """Overview, fund flow and the first projects-by-completion page in one response"""
+    result = await dashboard_service.get_summary_async(tndr_id, dept_name, completion, page_size, layout)
+    return render(result) if layout else result
@@ -1,6 +1,12 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Request
 from app.api.services.doc_service import DocService
+from app.api.services.job_service import JobService
 from app.api.services.auth_service import get_current_user
+from app.api.services.doc_service import PRESIGNED_MAX_FILE_SIZE
+from app.api.models.upload import (
+    PresignedUploadCreate, PresignedUploadParts, PresignedUploadComplete, PresignedUploadAbort
+)
+from app.api.utils.executors import run_blocking
 import asyncio
 
 router = APIRouter()
@@ -8,6 +14,24 @@ router = APIRouter()
 def get_doc_service():
     return DocService()
 
+def get_job_service():
+    return JobService()
+
+UPLOAD_FILE_TYPES = ("tender", "district", "department")
+
+def validation_detail(file_type: str, result: dict):
+    return {
+        "message": f"{file_type.capitalize()} file failed validation",
+        "error": result.get('error'),
+        "missing_columns": result.get('missing_columns', []),
+        "available_columns": result.get('available_columns', [])
+    }
+
+def validate_upload_key(key: str):
+    """Presigned calls may only touch objects this API created for snapshot files"""
+    if not any(key.startswith(f"tender/{file_type}/") for file_type in UPLOAD_FILE_TYPES):
+        raise HTTPException(status_code=400, detail="Invalid upload key")
+
 @router.post("/upload-doc")
 async def upload_document(
     tender_file: UploadFile = File(..., description="Tender file (.xls, .xlsx, .dbf)"),
@@ -38,16 +62,27 @@ async def upload_document(
                 detail=f"{file_type.capitalize()} file too large. Maximum size is 1GB"
             )
     
-    # Upload all files
-    results = {}
-    for file_type, file in files.items():
-        result = doc_service.upload_document(file, file_type)
+    # Reject files with the wrong columns from their headers, before any bytes go to S3
+    errors = await asyncio.gather(*(
+        run_blocking(doc_service.validate_upload, file, file_type)
+        for file_type, file in files.items()
+    ))
+    for file_type, error in zip(files.keys(), errors):
+        if error:
+            raise HTTPException(status_code=400, detail=validation_detail(file_type, error))
+    
+    # Upload the three files in parallel, each streamed into its own S3 multipart upload
+    uploads = await asyncio.gather(*(
+        run_blocking(doc_service.upload_document, file, file_type)
+        for file_type, file in files.items()
+    ))
+    results = dict(zip(files.keys(), uploads))
+    for file_type, result in results.items():
         if not result:
             raise HTTPException(
                 status_code=500, 
                 detail=f"{file_type.capitalize()} file upload failed"
             )
-        results[file_type] = result
     
     return {
         "message": "All files uploaded successfully",
@@ -57,12 +92,126 @@ async def upload_document(
     }
 
 
+@router.put("/upload-stream/{file_type}")
+async def upload_document_stream(
+    file_type: str,
+    filename: str,
+    request: Request,
+    doc_service: DocService = Depends(get_doc_service)
+):
+    """Upload one file as the raw request body; parts reach S3 while the body is still arriving"""
+    MAX_FILE_SIZE = 1 * 1024 * 1024 * 1024
+    allowed_extensions = ['.xls', '.xlsx', '.dbf']
+
+    if file_type not in UPLOAD_FILE_TYPES:
+        raise HTTPException(status_code=400, detail="file_type must be tender, district or department")
+    file_ext = filename[filename.rfind('.'):].lower()
+    if file_ext not in allowed_extensions:
+        raise HTTPException(
+            status_code=400,
+            detail=f"{file_type.capitalize()} file type not allowed. Allowed types: {', '.join(allowed_extensions)}"
+        )
+    content_length = request.headers.get("content-length")
+    try:
+        declared_size = int(content_length) if content_length else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid Content-Length header")
+    if declared_size is not None and declared_size > MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"{file_type.capitalize()} file too large. Maximum size is 1GB"
+        )
+
+    # The header is only a hint (chunked bodies have none), so the service also counts the bytes
+    result = await doc_service.upload_document_stream(request.stream(), filename, file_type, MAX_FILE_SIZE)
+    if not result:
+        raise HTTPException(
+            status_code=500,
+            detail=f"{file_type.capitalize()} file upload failed"
+        )
+    if result.get("too_large"):
+        raise HTTPException(
+            status_code=413,
+            detail=f"{file_type.capitalize()} file too large. Maximum size is 1GB"
+        )
+    if "error" in result:
+        raise HTTPException(status_code=400, detail=validation_detail(file_type, result))
+    return result
+
+
+@router.post("/presigned-upload")
+async def create_presigned_upload(
+    body: PresignedUploadCreate,
+    doc_service: DocService = Depends(get_doc_service)
+):
+    """Start a multipart upload the client sends straight to S3 using the returned part URLs"""
+    allowed_extensions = ['.xls', '.xlsx', '.dbf']
+
+    if body.file_type not in UPLOAD_FILE_TYPES:
+        raise HTTPException(status_code=400, detail="file_type must be tender, district or department")
+    file_ext = body.filename[body.filename.rfind('.'):].lower()
+    if file_ext not in allowed_extensions:
+        raise HTTPException(
+            status_code=400,
+            detail=f"{body.file_type.capitalize()} file type not allowed. Allowed types: {', '.join(allowed_extensions)}"
+        )
+    if body.size <= 0 or body.size > PRESIGNED_MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"{body.file_type.capitalize()} file size must be between 1 byte and {PRESIGNED_MAX_FILE_SIZE // (1024 * 1024)}MB"
+        )
+
+    result = await run_blocking(doc_service.create_presigned_upload, body.file_type, body.filename, body.size)
+    if not result:
+        raise HTTPException(status_code=500, detail="Failed to start upload")
+    return result
+
+
+@router.post("/presigned-upload/parts")
+def presign_upload_parts(
+    body: PresignedUploadParts,
+    doc_service: DocService = Depends(get_doc_service)
+):
+    """Re-issue part URLs, e.g. after the originals expired"""
+    validate_upload_key(body.key)
+    return doc_service.presign_upload_parts(body.key, body.upload_id, body.part_numbers)
+
+
+@router.post("/presigned-upload/complete")
+async def complete_presigned_upload(
+    body: PresignedUploadComplete,
+    doc_service: DocService = Depends(get_doc_service)
+):
+    validate_upload_key(body.key)
+    if not body.parts:
+        raise HTTPException(status_code=400, detail="No parts uploaded")
+
+    result = await run_blocking(
+        doc_service.complete_presigned_upload,
+        body.key, body.upload_id, [part.model_dump() for part in body.parts]
+    )
+    if "error" in result:
+        raise HTTPException(status_code=400, detail=validation_detail(body.key.split("/")[1], result))
+    return result
+
+
+@router.post("/presigned-upload/abort")
+async def abort_presigned_upload(
+    body: PresignedUploadAbort,
+    doc_service: DocService = Depends(get_doc_service)
+):
+    validate_upload_key(body.key)
+    if not await run_blocking(doc_service.abort_presigned_upload, body.key, body.upload_id):
+        raise HTTPException(status_code=500, detail="Failed to abort upload")
+    return {"message": "Upload aborted"}
+
+
 @router.post("/process-all-doc")
 async def process_tender_document(
     tender_s3_path: str,
     district_s3_path: str,
     dept_s3_path: str,
-    doc_service: DocService = Depends(get_doc_service)
+    job_service: JobService = Depends(get_job_service)
 ):
     allowed_ext = ('.dbf', '.xls', '.xlsx')
     for path in [tender_s3_path, district_s3_path, dept_s3_path]:
@@ -74,41 +223,47 @@ async def process_tender_document(
     
     username = "system"
     
-    # Step 1: Create master record and get tndr_pk
-    tndr_pk = doc_service.create_master_record(
-        tender_s3_path, district_s3_path, dept_s3_path, username
-    )
+    # The snapshot itself is loaded by the ingest worker (python -m app.ingest_worker)
+    try:
+        job_id = await run_blocking(
+            job_service.enqueue_snapshot,
+            tender_s3_path, district_s3_path, dept_s3_path, username
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to queue processing job: {str(e)}")
 
-    if not tndr_pk:
-        raise HTTPException(status_code=500, detail="Failed to create master record")
+    if not job_id:
+        raise HTTPException(status_code=500, detail="Failed to queue processing job")
     
-    # Step 2: Process all three files with the shared tndr_pk
+    return {
+        "message": "Documents queued for processing",
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/api/docs/jobs/{job_id}"
+    }
+
+
+@router.get("/jobs/{job_id}")
+async def get_job_status(
+    job_id: int,
+    job_service: JobService = Depends(get_job_service)
+):
     try:
-        tender_result = doc_service.process_tender_file(tender_s3_path, tndr_pk, username)
-        district_result = doc_service.process_district_file(district_s3_path, tndr_pk, username)
-        dept_result = doc_service.process_department_file(dept_s3_path, tndr_pk, username)
-        
-        # Check for errors in results
-        for result, name in [(tender_result, "tender"), (district_result, "district"), (dept_result, "department")]:
-            if isinstance(result, dict) and result.get("error"):
-                missing = result.get('missing_columns', [])
-                available = result.get('available_columns', [])
-                detail = {
-                    "message": f"{name.capitalize()} processing failed",
-                    "error": result.get('error'),
-                    "missing_columns": missing,
-                    "available_columns": available
-                }
-                raise HTTPException(status_code=500, detail=detail)
-        
-        return {
-            "message": "All documents processed successfully",
-            "tndr_pk": tndr_pk,
-            "tender_result": tender_result,
-            "district_result": district_result,
-            "department_result": dept_result,
-        }
-    except HTTPException:
-        raise
+        job = await run_blocking(job_service.get_status, job_id)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Failed to fetch job status: {str(e)}")
+
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
+@router.delete("/snapshots/{tndr_id}")
+async def delete_snapshot(
+    tndr_id: int,
+    doc_service: DocService = Depends(get_doc_service)
+):
+    """Delete a snapshot and every cached dashboard result for it"""
+    if not await run_blocking(doc_service.delete_snapshot, tndr_id):
+        raise HTTPException(status_code=500, detail=f"Failed to delete snapshot {tndr_id}")
+    return {"message": f"Snapshot {tndr_id} deleted", "tndr_pk": tndr_id}
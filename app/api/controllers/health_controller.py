@@ -7,3 +7,9 @@ health_service = HealthService()
 @router.get("/health")
 def get_health():
     return health_service.get_health_info()
+
+
+@router.get("/health/db-pool")
+def get_db_pool_stats():
+    """Connection pool size, in-use/idle counts, checkout wait times and timeouts"""
+    return health_service.get_pool_stats()
@@ -1,32 +1,96 @@
 from app.api.utils.s3_client import s3_client
 from app.api.utils.database import get_db
 from app.api.utils.query_loader import query_loader
-import tempfile
+from app.api.utils.pg_copy import copy_frames, null_masked
 import os
+import time
 from dbfread import DBF
 from datetime import datetime
 import pandas as pd
 from psycopg2.extras import execute_batch
 
+# Loader modes: "batch" (execute_batch INSERTs) or "copy" (COPY ... FROM STDIN)
+BULK_LOAD_MODE = os.getenv("BULK_LOAD_MODE", "batch").lower()
+BULK_COPY_FORMAT = os.getenv("BULK_COPY_FORMAT", "text").lower()
+
+# Column types used to encode COPY payloads, in insert column order
+TENDER_COLUMN_TYPES = (
+    "int8", "int4", "int4", "text", "text", "float8", "text", "float8",
+    "text", "text", "float8", "float8", "float8", "float8", "float8", "text",
+)
+DISTRICT_COLUMN_TYPES = ("int8", "int4", "text", "text")
+DEPT_COLUMN_TYPES = ("int8", "text", "text", "text", "text")
+
+LOAD_TARGETS = {
+    "tender": ("query.tender.insert_tender_dtls", "query.tender.copy_tender_dtls", TENDER_COLUMN_TYPES),
+    "district": ("query.tender.insert_district_dtls", "query.tender.copy_district_dtls", DISTRICT_COLUMN_TYPES),
+    "department": ("query.tender.insert_dept_dtls", "query.tender.copy_dept_dtls", DEPT_COLUMN_TYPES),
+}
+
+
+def prepare_tender_frame(df, tndr_pk):
+    """Build TENDER_DATA_DTLS insert columns (tndr_pk, source columns, PHYSICAL_PROGRESS, remark) column-wise"""
+    sanction_cost = pd.to_numeric(df.iloc[:, 4], errors="coerce")
+    wip_total = pd.to_numeric(df.iloc[:, 11], errors="coerce")
+    physical_progress = (wip_total / sanction_cost * 100).round(2).where((sanction_cost > 0) & wip_total.notna())
+    return pd.concat(
+        [pd.Series(tndr_pk, index=df.index), df.iloc[:, :-1], physical_progress, df.iloc[:, -1]],
+        axis=1,
+        ignore_index=True,
+    )
+
+
+def prepare_prefixed_frame(df, tndr_pk):
+    """Prefix a DataFrame with a tndr_pk column"""
+    return pd.concat([pd.Series(tndr_pk, index=df.index), df], axis=1, ignore_index=True)
+
+
 class DocDAO:
     def __init__(self):
         self.db = get_db()
+
+    def _load_frames(self, cursor, target, frames, load_mode=None):
+        """Write prepared DataFrames with the configured loader and log throughput"""
+        load_mode = (load_mode or BULK_LOAD_MODE).lower()
+        insert_key, copy_key, column_types = LOAD_TARGETS[target]
+        started = time.perf_counter()
+
+        if load_mode == "copy":
+            if BULK_COPY_FORMAT != "text":
+                frames = (null_masked(frame, column_types) for frame in frames)
+            count = copy_frames(
+                cursor,
+                query_loader.get_query(copy_key),
+                frames,
+                column_types,
+                copy_format=BULK_COPY_FORMAT,
+            )
+            mode_label = f"copy-{BULK_COPY_FORMAT}"
+        else:
+            counter = {"rows": 0}
+
+            def rows():
+                for frame in frames:
+                    counter["rows"] += len(frame)
+                    yield from null_masked(frame, column_types).itertuples(index=False, name=None)
+
+            execute_batch(cursor, query_loader.get_query(insert_key), rows(), page_size=100)
+            count = counter["rows"]
+            mode_label = "batch"
+
+        elapsed = time.perf_counter() - started
+        rate = count / elapsed if elapsed > 0 else 0
+        print(f"DEBUG {target}: loaded {count} rows in {elapsed:.2f}s ({rate:.0f} rows/sec, mode={mode_label})")
+        return count
     
     def upload_to_s3(self, file, object_name: str):
         try:
-            with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-                chunk_size = 8 * 1024 * 1024  
-                while chunk := file.file.read(chunk_size):
-                    temp_file.write(chunk)
-                temp_file_path = temp_file.name
-            
-            success = s3_client.upload_file(temp_file_path, object_name)
-            os.unlink(temp_file_path)
-            return success
+            # Parts go straight from the request body to S3, no temp file in between
+            return s3_client.upload_stream(file.file, object_name)
 
         except Exception as e:
             print(f"Error in upload_to_s3: {e}")
-            return False
+            return None
     
     def create_master_record(self, master_records: dict):
         conn = None
@@ -65,115 +129,162 @@ class DocDAO:
             if conn:
                 self.db.release_connection(conn)
 
-    def bulk_insert_tender(self, df, tndr_pk):
-        conn = None
+    def _insert_frames(self, target, frames, load_mode=None, conn=None):
+        """Load a stream of prepared frames on one pooled connection as a single transaction.
+
+        Given conn (from open_load), the rows are written in its open transaction and left
+        uncommitted for publish_loads / discard_loads.
+        """
+        if conn is not None:
+            cursor = conn.cursor()
+            try:
+                return self._load_frames(cursor, target, frames, load_mode)
+            finally:
+                cursor.close()
         try:
             conn = self.db.get_connection()
             cursor = conn.cursor()
-            insert_query = query_loader.get_query("query.tender.insert_tender_dtls")
-            
-            print(f"DEBUG: DataFrame shape: {df.shape}")
-            print(f"DEBUG: DataFrame columns: {df.columns.tolist()}")
-            print(f"DEBUG: First row sample: {df.head(1).to_dict('records') if not df.empty else 'Empty'}")
-            print(f"DEBUG: Insert query: {insert_query}")
-            
-            # Replace NaT and NaN with None
-            df = df.replace({pd.NaT: None, float('nan'): None})
-            
-            # Calculate Physical Progress and prepare rows
-            rows = []
-            for row in df.itertuples(index=False, name=None):
-                row_list = list(row)
-                sanction_cost = row_list[4]
-                wip_total = row_list[11]
-                
-                if sanction_cost and sanction_cost > 0 and wip_total is not None:
-                    physical_progress = round((wip_total / sanction_cost) * 100, 2)
-                else:
-                    physical_progress = None
-                final_row = [tndr_pk] + row_list[:-1] + [physical_progress, row_list[-1]]
-                rows.append(final_row)
-            
-            print(f"DEBUG: Number of rows to insert: {len(rows)}")
-            if rows:
-                print(f"DEBUG: First row sample (cleaned): {rows[0]}")
-            
-            execute_batch(cursor, insert_query, rows, page_size=100)
-            
+            inserted = self._load_frames(cursor, target, frames, load_mode)
             conn.commit()
             cursor.close()
-            return len(rows)
+            return inserted
         except Exception as e:
             if conn:
                 conn.rollback()
-            print(f"Error in bulk_insert_tender: {e}")
+            print(f"Error loading {target} rows: {e}")
             import traceback
             traceback.print_exc()
-            return 0
+            raise
         finally:
             if conn:
                 self.db.release_connection(conn)
 
-    def bulk_insert_district(self, df, tndr_pk):
+    def open_load(self):
+        """A pooled connection for loading one snapshot file; its rows stay invisible until publish_loads"""
+        return self.db.get_connection()
+
+    def publish_loads(self, conns):
+        """Commit the loads of a snapshot back to back, once every file has been written"""
+        for conn in conns:
+            conn.commit()
+
+    def discard_loads(self, conns):
+        """Roll back whatever is still uncommitted and return the connections to the pool"""
+        for conn in conns:
+            try:
+                conn.rollback()
+            except Exception as e:
+                print(f"Error rolling back snapshot load: {e}")
+            finally:
+                self.db.release_connection(conn)
+
+    def delete_snapshot(self, tndr_pk):
+        """Remove every row of a snapshot, detail tables first, in one transaction"""
         conn = None
         try:
             conn = self.db.get_connection()
             cursor = conn.cursor()
-            insert_query = query_loader.get_query("query.tender.insert_district_dtls")
-
-            print(f"DEBUG District: DataFrame shape: {df.shape}")
-            print(f"DEBUG District: DataFrame columns: {df.columns.tolist()}")
-
-            # Replace NaT and NaN with None
-            df = df.replace({pd.NaT: None, float('nan'): None})
-
-            # Add tndr_pk as first column to each row
-            rows = [[tndr_pk] + list(row) for row in df.itertuples(index=False, name=None)]
-            print(f"DEBUG District: Number of rows to insert: {len(rows)}")
-
-            execute_batch(cursor, insert_query, rows, page_size=100)
-
+            for query_name in (
+                "query.tender.delete_summary",
+                "query.tender.delete_tender_dtls",
+                "query.tender.delete_district_dtls",
+                "query.tender.delete_dept_dtls",
+                "query.tender.delete_tender_main",
+            ):
+                cursor.execute(query_loader.get_query(query_name), (tndr_pk,))
             conn.commit()
             cursor.close()
-            return len(rows)
+            return True
         except Exception as e:
             if conn:
                 conn.rollback()
-            print(f"Error in bulk_insert_district: {e}")
+            print(f"Error in delete_snapshot: {e}")
             import traceback
             traceback.print_exc()
-            return 0
+            return False
         finally:
             if conn:
                 self.db.release_connection(conn)
 
-    
-    def bulk_insert_dept(self, df, tndr_pk):
+    def build_summary(self, tndr_pk):
+        """(Re)build the pre-aggregated dashboard rows for a loaded snapshot; returns the row count"""
         conn = None
         try:
+            started = time.perf_counter()
             conn = self.db.get_connection()
             cursor = conn.cursor()
-            insert_query = query_loader.get_query("query.tender.insert_dept_dtls")
-
-            # Replace NaT and NaN with None
-            df = df.replace({pd.NaT: None, float('nan'): None})
-
-            # Add tndr_pk as first column to each row
-            rows = [[tndr_pk] + list(row) for row in df.itertuples(index=False, name=None)]
-            execute_batch(cursor, insert_query, rows, page_size=100)
+            cursor.execute(query_loader.get_query("query.tender.delete_summary"), (tndr_pk,))
+            cursor.execute(query_loader.get_query("query.tender.build_summary"), (tndr_pk,))
+            row_count = cursor.rowcount
+            conn.commit()
+            cursor.close()
+            print(f"DEBUG build_summary: {row_count} summary rows for snapshot {tndr_pk} in {time.perf_counter() - started:.2f}s")
+            return row_count
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            print(f"Error in build_summary: {e}")
+            raise
+        finally:
+            if conn:
+                self.db.release_connection(conn)
 
+    def analyze_snapshot_tables(self):
+        """Refresh planner statistics after a bulk load; returns the seconds taken"""
+        conn = None
+        try:
+            started = time.perf_counter()
+            conn = self.db.get_connection()
+            cursor = conn.cursor()
+            cursor.execute(query_loader.get_query("query.tender.analyze_snapshot_tables"))
             conn.commit()
             cursor.close()
-            return len(rows)
+            return time.perf_counter() - started
         except Exception as e:
             if conn:
                 conn.rollback()
-            print(f"Error in bulk_insert_dept: {e}")
-            import traceback
-            traceback.print_exc()
-            return 0
+            print(f"Error in analyze_snapshot_tables: {e}")
+            raise
+        finally:
+            if conn:
+                self.db.release_connection(conn)
+
+    def get_snapshots_without_summary(self):
+        conn = None
+        try:
+            conn = self.db.get_connection()
+            cursor = conn.cursor()
+            cursor.execute(query_loader.get_query("query.tender.summary_missing"))
+            rows = cursor.fetchall()
+            cursor.close()
+            return [row[0] for row in rows]
         finally:
             if conn:
                 self.db.release_connection(conn)
 
+    def bulk_insert_tender(self, df, tndr_pk, load_mode=None):
+        print(f"DEBUG: DataFrame shape: {df.shape}")
+        print(f"DEBUG: DataFrame columns: {df.columns.tolist()}")
+        print(f"DEBUG: First row sample: {df.head(1).to_dict('records') if not df.empty else 'Empty'}")
+        return self.bulk_insert_tender_chunks([df], tndr_pk, load_mode)
+
+    def bulk_insert_tender_chunks(self, chunks, tndr_pk, load_mode=None, conn=None):
+        """Insert an iterable of tender DataFrame chunks without materialising the whole file"""
+        frames = (prepare_tender_frame(df, tndr_pk) for df in chunks)
+        return self._insert_frames("tender", frames, load_mode, conn)
+
+    def bulk_insert_district(self, df, tndr_pk, load_mode=None):
+        print(f"DEBUG District: DataFrame shape: {df.shape}")
+        print(f"DEBUG District: DataFrame columns: {df.columns.tolist()}")
+        return self.bulk_insert_district_chunks([df], tndr_pk, load_mode)
+
+    def bulk_insert_district_chunks(self, chunks, tndr_pk, load_mode=None, conn=None):
+        frames = (prepare_prefixed_frame(df, tndr_pk) for df in chunks)
+        return self._insert_frames("district", frames, load_mode, conn)
+
+    def bulk_insert_dept(self, df, tndr_pk, load_mode=None):
+        return self.bulk_insert_dept_chunks([df], tndr_pk, load_mode)
 
+    def bulk_insert_dept_chunks(self, chunks, tndr_pk, load_mode=None, conn=None):
+        frames = (prepare_prefixed_frame(df, tndr_pk) for df in chunks)
+        return self._insert_frames("department", frames, load_mode, conn)
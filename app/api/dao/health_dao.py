@@ -1,6 +1,14 @@
+from app.api.utils.async_database import async_db
+from app.api.utils.database import get_db
+
+
 class HealthDAO:
     def fetch_health_data(self):
         return {
             "status": "healthy",
             "version": "1.0.0"
         }
+
+    def fetch_pool_stats(self):
+        # Each is None until the first request has opened that pool
+        return {"sync": get_db().pool_stats(), "async": async_db.pool_stats()}
@@ -0,0 +1,75 @@
+from app.api.utils.database import get_db
+from app.api.utils.query_loader import query_loader
+from psycopg2.extras import Json
+
+JOB_COLUMNS = (
+    "job_pk", "status", "tndr_pk", "progress", "result", "error",
+    "attempts", "crt_user", "crt_dt", "started_dt", "finished_dt",
+)
+CLAIM_COLUMNS = (
+    "job_pk", "tender_s3_path", "district_s3_path", "dept_s3_path",
+    "crt_user", "tndr_pk", "attempts",
+)
+
+
+class JobDAO:
+    def __init__(self):
+        self.db = get_db()
+
+    def _execute(self, query_name, params, fetch=False, fetch_all=False):
+        conn = None
+        try:
+            conn = self.db.get_connection()
+            cursor = conn.cursor()
+            cursor.execute(query_loader.get_query(query_name), params)
+            if fetch_all:
+                row = cursor.fetchall()
+            else:
+                row = cursor.fetchone() if fetch else None
+            conn.commit()
+            cursor.close()
+            return row
+        except Exception:
+            if conn:
+                conn.rollback()
+            raise
+        finally:
+            if conn:
+                self.db.release_connection(conn)
+
+    def enqueue(self, tender_s3_path, district_s3_path, dept_s3_path, username):
+        row = self._execute(
+            "query.job.enqueue",
+            (tender_s3_path, district_s3_path, dept_s3_path, username),
+            fetch=True,
+        )
+        return row[0] if row else None
+
+    def claim(self, stale_seconds, max_attempts):
+        """Take the oldest queued (or abandoned) job; SKIP LOCKED keeps workers off each other's rows"""
+        row = self._execute("query.job.claim", (stale_seconds, max_attempts), fetch=True)
+        return dict(zip(CLAIM_COLUMNS, row)) if row else None
+
+    def expire_stale(self, stale_seconds, max_attempts):
+        """Fail jobs that keep dying; returns the tndr_pks their attempts left behind"""
+        rows = self._execute("query.job.expire_stale", (stale_seconds, max_attempts), fetch_all=True)
+        return [row[0] for row in rows if row[0] is not None]
+
+    def heartbeat(self, job_pk):
+        self._execute("query.job.heartbeat", (job_pk,))
+
+    def set_tndr_pk(self, job_pk, tndr_pk):
+        self._execute("query.job.set_tndr_pk", (tndr_pk, job_pk))
+
+    def update_progress(self, job_pk, progress: dict):
+        self._execute("query.job.update_progress", (Json(progress), job_pk))
+
+    def complete(self, job_pk, result: dict):
+        self._execute("query.job.complete", (Json(result), job_pk))
+
+    def fail(self, job_pk, error: dict):
+        self._execute("query.job.fail", (Json(error), job_pk))
+
+    def get(self, job_pk):
+        row = self._execute("query.job.get", (job_pk,), fetch=True)
+        return dict(zip(JOB_COLUMNS, row)) if row else None
@@ -0,0 +1,34 @@
+from pydantic import BaseModel, Field, conint
+from typing import List
+from app.api.utils.s3_client import S3_MAX_PARTS
+
+# S3 numbers multipart parts 1..10000
+PartNumber = conint(ge=1, le=S3_MAX_PARTS)
+
+
+class PresignedUploadCreate(BaseModel):
+    file_type: str
+    filename: str
+    size: int
+
+
+class PresignedUploadParts(BaseModel):
+    key: str
+    upload_id: str
+    part_numbers: List[PartNumber] = Field(..., min_length=1, max_length=S3_MAX_PARTS)
+
+
+class UploadedPart(BaseModel):
+    part_number: PartNumber
+    etag: str
+
+
+class PresignedUploadComplete(BaseModel):
+    key: str
+    upload_id: str
+    parts: List[UploadedPart] = Field(..., max_length=S3_MAX_PARTS)
+
+
+class PresignedUploadAbort(BaseModel):
+    key: str
+    upload_id: str
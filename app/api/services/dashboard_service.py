@@ -1,5 +1,13 @@
 from app.api.utils.database import get_db
+from app.api.utils.async_database import async_db
+from app.api.utils.cache import cached, remember, aremember
+from app.api.utils.pagination import split_key, encode_cursor, decode_cursor
+from app.api.utils.prepared_queries import prepared_queries
+from app.api.utils.query_loader import query_loader
+from app.api.utils.exporters import EXPORT_FORMATS, WRITERS, available_formats
+from app.api.utils.fast_json import float_numerics
 from decimal import Decimal
+import os
 
 
 def decimal_to_float(obj):
@@ -12,60 +20,31 @@ def decimal_to_float(obj):
     return obj
 
 
+# completion filter values -> "COMPLETION_STAGE"
+COMPLETION_STAGES = {"25": 0, "50": 1, "75": 2, "100": 3, "completed": 4}
+
+# Columns of the combined summary row that make up the fund-flow block; the rest are the overview
+FUND_FLOW_COLUMNS = ("sanctioned", "received", "utilized_previous", "utilized_current", "total_utilized",
+                     "amount_to_be_received", "amount_to_be_utilized")
+
+# Rows per server-side cursor round trip while streaming an export
+EXPORT_ITERSIZE = int(os.getenv("EXPORT_ITERSIZE", "10000"))
+
+# Length of each listing's sort key (the hidden _k columns)
+DEPTWISE_KEY_SIZE = 6
+COMPLETION_KEY_SIZE = 5
+
+
 class DashboardService:
     def __init__(self):
         self.db = get_db()
 
-    def get_overview(self, tndr_pk: int, dept_name: str = None):
-        dept_filter = ""
-        if dept_name:
-            dept_filter = f"AND dd.\"DEPT_NAME\" ILIKE '%{dept_name}%'"
-
-        query = f"""
-        WITH calc AS (
-            SELECT
-                t."SANCTION_COST",
-                t."FUND_RECEIVED",
-                t."WIP_PREVIOUS_YEAR",
-                t."WIP_CURRENT_YEAR",
-                t."WIP_CURRENT_MONTH",
-                t."WIP_TOTAL",
-                t."DEPARTMENT_CODE",
-                t."DISTRICT_CODE",
-                dd."DEPT_NAME",
-                ROUND(COALESCE((t."WIP_TOTAL" / NULLIF(t."SANCTION_COST", 0)) * 100, 0)::numeric, 2) AS physical_progress
-            FROM "TENDER_DATA_DTLS" t
-            LEFT JOIN "DEPT_DTLS" dd
-                ON t.tndr_pk = dd.tndr_pk
-                AND t."DEPARTMENT_CODE" = dd."DEPT_SUB_DEPT_CODE"
-            WHERE t.tndr_pk = {tndr_pk}
-            {dept_filter}
-        )
-        SELECT
-            COUNT(*) AS total_projects,
-            COUNT(DISTINCT "DEPT_NAME") AS total_departments,
-            COUNT(DISTINCT "DISTRICT_CODE") AS total_districts,
-            ROUND(COALESCE(SUM("SANCTION_COST"), 0)::numeric / 100, 3) AS total_sanction_cost,
-            ROUND(COALESCE(SUM("FUND_RECEIVED"), 0)::numeric / 100, 3) AS total_fund_received,
-            ROUND((COALESCE(SUM("SANCTION_COST"), 0) - COALESCE(SUM("FUND_RECEIVED"), 0))::numeric / 100, 3) AS total_fund_pending,
-            ROUND((COALESCE(SUM("FUND_RECEIVED"), 0) - COALESCE(SUM("WIP_TOTAL"), 0))::numeric / 100, 3) AS total_fund_pending_to_utilize,
-            ROUND(COALESCE(SUM("WIP_TOTAL"), 0)::numeric / 100, 3) AS total_fund_utilized,
-            ROUND(COALESCE(SUM("WIP_PREVIOUS_YEAR"), 0)::numeric / 100, 3) AS total_wip_previous_year,
-            ROUND(COALESCE(SUM("WIP_CURRENT_YEAR"), 0)::numeric / 100, 3) AS total_wip_current_year,
-            ROUND(COALESCE(SUM("WIP_CURRENT_MONTH"), 0)::numeric / 100, 3) AS total_wip_current_month,
-            ROUND(COALESCE(SUM("WIP_TOTAL") / NULLIF(SUM("SANCTION_COST"), 0), 0)::numeric * 100, 2) AS overall_physical_progress,
-            COUNT(*) FILTER (WHERE physical_progress < 25) AS below_25,
-            COUNT(*) FILTER (WHERE physical_progress >= 25 AND physical_progress < 50) AS between_25_50,
-            COUNT(*) FILTER (WHERE physical_progress >= 50 AND physical_progress < 75) AS between_50_75,
-            COUNT(*) FILTER (WHERE physical_progress >= 75 AND physical_progress < 100) AS between_75_100,
-            COUNT(*) FILTER (WHERE physical_progress >= 100) AS completed
-        FROM calc
-        """
+    def _fetch_one(self, query_name, params):
         conn = None
         try:
             conn = self.db.get_connection()
             cursor = conn.cursor()
-            cursor.execute(query)
+            prepared_queries.execute(cursor, query_name, params)
             row = cursor.fetchone()
             columns = [desc[0] for desc in cursor.description]
             cursor.close()
@@ -80,78 +59,129 @@ class DashboardService:
             if conn:
                 self.db.release_connection(conn)
 
-    def get_tender_details_deptwise(self, tndr_pk: int, dept_name: str = None, page: int = 1, page_size: int = 10):
-        where = f'WHERE d.tndr_pk = {tndr_pk} AND t.tndr_pk = {tndr_pk}'
-        if dept_name:
-            where += f" AND d.\"DEPT_NAME\" ILIKE '%{dept_name}%'"
+    def _match_departments(self, tndr_pk: int, dept_name: str):
+        """DEPT_DTLS rows whose name contains dept_name, resolved once per snapshot and filter"""
+        def lookup():
+            conn = None
+            try:
+                conn = self.db.get_connection()
+                cursor = conn.cursor()
+                prepared_queries.execute(cursor, "query.dashboard.match_departments", (tndr_pk, f"%{dept_name}%"))
+                rows = cursor.fetchall()
+                cursor.close()
+            finally:
+                if conn:
+                    self.db.release_connection(conn)
+            # pks keep exactly the matched department rows on joins; codes let the fact side use its index
+            return {"pks": [row[0] for row in rows], "codes": sorted({row[1] for row in rows if row[1] is not None})}
 
-        offset = (page - 1) * page_size
-
-        count_query = f"""
-        SELECT COUNT(*)
-        FROM "DEPT_DTLS" d
-        INNER JOIN "TENDER_DATA_DTLS" t
-            ON d.tndr_pk = t.tndr_pk
-            AND d."DEPT_SUB_DEPT_CODE" = t."DEPARTMENT_CODE"
-        {where}
-        """
-
-        query = f"""
-        SELECT
-            d."DEPT_SUB_DEPT_CODE" AS dept_code,
-            d."DEPT_NAME" AS dept_name,
-            d."SUB_DEPT_NAME" AS sub_dept_name,
-            t."TDM_PK" AS tdm_pk,
-            t."WORK_CODE" AS work_code,
-            t."PROJECT_NAME" AS project_name,
-            t."DISTRICT_CODE" AS district_code,
-            dist."DIST_NAME" AS district_name,
-            ROUND(COALESCE(t."SANCTION_COST", 0)::numeric / 100, 3) AS sanction_cost,
-            t."SANCTION_DATE" AS sanction_date,
-            ROUND(COALESCE(t."FUND_RECEIVED", 0)::numeric / 100, 3) AS fund_received,
-            t."FUND_RECEIVED_DATE" AS fund_received_date,
-            t."LAND_RECEIVED_DATE" AS land_received_date,
-            t."WIP_PREVIOUS_YEAR" AS wip_previous_year,
-            t."WIP_CURRENT_YEAR" AS wip_current_year,
-            t."WIP_CURRENT_MONTH" AS wip_current_month,
-            t."WIP_TOTAL" AS wip_total,
-            t."PHYSICAL_PROGRESS" AS physical_progress,
-            t."PHYSICAL_PROGRESS_REMARK" AS physical_progress_remark
-        FROM "DEPT_DTLS" d
-        INNER JOIN "TENDER_DATA_DTLS" t
-            ON d.tndr_pk = t.tndr_pk
-            AND d."DEPT_SUB_DEPT_CODE" = t."DEPARTMENT_CODE"
-        LEFT JOIN "DISTRICT_DETAILS" dist
-            ON t."DISTRICT_CODE" = dist."DIST_CODE"
-            AND dist.tndr_pk = {tndr_pk}
-        {where}
-        ORDER BY d."DEPT_NAME", t."PROJECT_NAME"
-        LIMIT {page_size} OFFSET {offset}
-        """
+        return remember("dept_match", tndr_pk, {"dept_name": dept_name.lower()}, lookup)
 
+    def get_department_names(self, tndr_pk: int, limit: int):
+        """Distinct department names of a snapshot, alphabetically, at most limit of them"""
         conn = None
         try:
             conn = self.db.get_connection()
             cursor = conn.cursor()
-
-            cursor.execute(count_query)
-            total = cursor.fetchone()[0]
-
-            cursor.execute(query)
+            prepared_queries.execute(cursor, "query.dashboard.department_names", (tndr_pk, limit))
             rows = cursor.fetchall()
-            columns = [desc[0] for desc in cursor.description]
             cursor.close()
+            return [row[0] for row in rows]
+        finally:
+            if conn:
+                self.db.release_connection(conn)
 
-            return {
-                "success": True,
-                "data": decimal_to_float([dict(zip(columns, row)) for row in rows]),
-                "pagination": {
-                    "total": total,
-                    "page": page,
-                    "page_size": page_size,
-                    "total_pages": (total + page_size - 1) // page_size
-                }
+    @cached("overview", case_insensitive=("dept_name",))
+    def get_overview(self, tndr_pk: int, dept_name: str = None):
+        # Reads the per-snapshot summary built at ingest time instead of every detail row
+        if not dept_name:
+            return self._fetch_one("query.dashboard.get_overview", (tndr_pk,))
+        try:
+            match = self._match_departments(tndr_pk, dept_name)
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+        return self._fetch_one("query.dashboard.get_overview_by_dept", (tndr_pk, match["pks"], match["codes"]))
+
+    @staticmethod
+    def _page_request(endpoint, tndr_pk, filters, queries, params, key_size, page, page_size, cursor, seek_prefix):
+        """(page, query name, params) for the requested page number or cursor; None for a bad cursor"""
+        _, page_query, after_query = queries
+        if cursor:
+            key = decode_cursor(cursor, endpoint, tndr_pk, filters)
+            if not isinstance(key, list) or len(key) != key_size:
+                return None
+            return None, after_query, [*params, *key[:seek_prefix], *key, page_size + 1, tndr_pk]
+        return page, page_query, [*params, page_size + 1, (page - 1) * page_size, tndr_pk]
+
+    @staticmethod
+    def _page_result(endpoint, tndr_pk, filters, rows, total, key_size, page, page_size, names=None, layout=None):
+        """rows are dicts, or with a layout, tuples whose numerics are already float"""
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if layout:
+            # The hidden _k columns come last in every listing query
+            last_key = list(rows[-1][-key_size:]) if rows else None
+            names = names[:-key_size]
+            if layout == "columns":
+                data = {"columns": names, "rows": [list(row[:-key_size]) for row in rows]}
+            else:
+                data = [dict(zip(names, row)) for row in rows]
+        else:
+            row_keys = [split_key(row, key_size) for row in rows]
+            last_key = row_keys[-1] if row_keys else None
+            data = decimal_to_float(rows)
+        return {
+            "success": True,
+            "data": data,
+            "pagination": {
+                "total": total,
+                "page": page,
+                "page_size": page_size,
+                "total_pages": (total + page_size - 1) // page_size,
+                "next_cursor": encode_cursor(endpoint, tndr_pk, filters, last_key) if has_more else None
             }
+        }
+
+    def _fetch_page(self, db_cursor, endpoint, tndr_pk, filters, queries, params, key_size, request, page_size,
+                    layout=None):
+        page, page_query, page_params = request
+
+        def count():
+            prepared_queries.execute(db_cursor, queries[0], params)
+            return db_cursor.fetchone()[0]
+
+        # The total only changes with the snapshot, so it is counted once per filter
+        total = remember(f"{endpoint}_count", tndr_pk, filters, count)
+
+        prepared_queries.execute(db_cursor, page_query, page_params)
+        names = [desc[0] for desc in db_cursor.description]
+        rows = db_cursor.fetchall()
+        if not layout:
+            rows = [dict(zip(names, row)) for row in rows]
+        return self._page_result(endpoint, tndr_pk, filters, rows, total, key_size, page, page_size, names, layout)
+
+    def _keyset_page(self, endpoint, tndr_pk, filters, queries, params, key_size,
+                     page, page_size, cursor=None, seek_prefix=0, layout=None):
+        """Fetch one page by cursor (keyset seek) or, without one, by page number.
+
+        queries is (count, page, after) registry names; one extra row tells whether another
+        page follows, and the trailing tndr_pk is for the district names joined onto the page.
+        """
+        request = self._page_request(endpoint, tndr_pk, filters, queries, params, key_size,
+                                     page, page_size, cursor, seek_prefix)
+        if request is None:
+            return {"success": False, "error": "Invalid cursor"}
+
+        conn = None
+        try:
+            conn = self.db.get_connection()
+            db_cursor = conn.cursor()
+            if layout:
+                float_numerics(db_cursor)
+            result = self._fetch_page(db_cursor, endpoint, tndr_pk, filters, queries, params, key_size, request,
+                                      page_size, layout)
+            db_cursor.close()
+            return result
         except Exception as e:
             import traceback
             traceback.print_exc()
@@ -160,43 +190,103 @@ class DashboardService:
             if conn:
                 self.db.release_connection(conn)
 
-    def get_fund_flow(self, tndr_pk: int, dept_name: str = None):
-        dept_join = ""
-        dept_filter = ""
+    @cached("tender_details_deptwise", case_insensitive=("dept_name",))
+    def get_tender_details_deptwise(self, tndr_pk: int, dept_name: str = None, page: int = 1, page_size: int = 10,
+                                    cursor: str = None, layout: str = None):
+        # Ordered by dept name, project name (NULLS LAST), with primary keys as tie-breakers
+        queries = ("query.dashboard.count_deptwise", "query.dashboard.get_deptwise_page", "query.dashboard.get_deptwise_after")
+        params = [tndr_pk, tndr_pk]
         if dept_name:
-            dept_join = f"""
-            INNER JOIN "DEPT_DTLS" d
-                ON t.tndr_pk = d.tndr_pk
-                AND t."DEPARTMENT_CODE" = d."DEPT_SUB_DEPT_CODE"
-            """
-            dept_filter = f"AND d.\"DEPT_NAME\" ILIKE '%{dept_name}%'"
-
-        query = f"""
-        SELECT
-            ROUND(COALESCE(SUM(NULLIF(t."SANCTION_COST", 'NaN'::float)), 0)::numeric, 2) AS sanctioned,
-            ROUND(COALESCE(SUM(NULLIF(t."FUND_RECEIVED", 'NaN'::float)), 0)::numeric, 2) AS received,
-            ROUND(COALESCE(SUM(NULLIF(t."WIP_PREVIOUS_YEAR", 'NaN'::float)), 0)::numeric, 2) AS utilized_previous,
-            ROUND(COALESCE(SUM(NULLIF(t."WIP_CURRENT_YEAR", 'NaN'::float)), 0)::numeric, 2) AS utilized_current,
-            ROUND(COALESCE(SUM(NULLIF(t."WIP_TOTAL", 'NaN'::float)), 0)::numeric, 2) AS total_utilized,
-            ROUND((COALESCE(SUM(NULLIF(t."SANCTION_COST", 'NaN'::float)), 0) - COALESCE(SUM(NULLIF(t."FUND_RECEIVED", 'NaN'::float)), 0))::numeric, 2) AS amount_to_be_received,
-            ROUND((COALESCE(SUM(NULLIF(t."FUND_RECEIVED", 'NaN'::float)), 0) - COALESCE(SUM(NULLIF(t."WIP_TOTAL", 'NaN'::float)), 0))::numeric, 2) AS amount_to_be_utilized
-        FROM "TENDER_DATA_DTLS" t
-        {dept_join}
-        WHERE t.tndr_pk = {tndr_pk}
-        {dept_filter}
+            try:
+                match = self._match_departments(tndr_pk, dept_name)
+            except Exception as e:
+                import traceback
+                traceback.print_exc()
+                return {"success": False, "error": str(e)}
+            queries = tuple(f"{name}_by_dept" for name in queries)
+            params += [match["pks"], match["codes"]]
+
+        filters = {"dept_name": dept_name.lower() if dept_name else None}
+        return self._keyset_page("tender_details_deptwise", tndr_pk, filters, queries, params,
+                                 DEPTWISE_KEY_SIZE, page, page_size, cursor, seek_prefix=2, layout=layout)
+
+    @cached("fund_flow", case_insensitive=("dept_name",))
+    def get_fund_flow(self, tndr_pk: int, dept_name: str = None):
+        if not dept_name:
+            return self._fetch_one("query.dashboard.get_fund_flow", (tndr_pk,))
+        try:
+            match = self._match_departments(tndr_pk, dept_name)
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+        return self._fetch_one("query.dashboard.get_fund_flow_by_dept", (tndr_pk, match["pks"], match["codes"]))
+
+    @staticmethod
+    def _completion_queries(tndr_pk, completion):
+        # COMPLETION_STAGE is stored per row, so a single stage is an index range on idx_tender_data_stage_keyset
+        queries = ("query.dashboard.count_by_completion", "query.dashboard.get_completion_page", "query.dashboard.get_completion_after")
+        params = [tndr_pk]
+        if completion in COMPLETION_STAGES:
+            queries = tuple(f"{name}_by_stage" for name in queries)
+            params.append(COMPLETION_STAGES[completion])
+        return queries, params
+
+    @cached("projects_by_completion")
+    def get_projects_by_completion(self, tndr_pk: int, completion: str = None, page: int = 1, page_size: int = 10,
+                                   cursor: str = None, layout: str = None):
+        queries, params = self._completion_queries(tndr_pk, completion)
+        return self._keyset_page("projects_by_completion", tndr_pk, {"completion": completion or None}, queries,
+                                 params, COMPLETION_KEY_SIZE, page, page_size, cursor, layout=layout)
+
+    @staticmethod
+    def _summary_query(tndr_pk, match):
+        if match is None:
+            return "query.dashboard.get_summary", (tndr_pk,)
+        return "query.dashboard.get_summary_by_dept", (tndr_pk, match["pks"], match["codes"])
+
+    @staticmethod
+    def _summary_result(summary, projects):
+        summary = decimal_to_float(summary)
+        return {
+            "success": True,
+            "data": {
+                "overview": {k: v for k, v in summary.items() if k not in FUND_FLOW_COLUMNS},
+                "fund_flow": {k: summary[k] for k in FUND_FLOW_COLUMNS},
+                "projects_by_completion": {"data": projects["data"], "pagination": projects["pagination"]},
+            }
+        }
+
+    @cached("summary", case_insensitive=("dept_name",))
+    def get_summary(self, tndr_pk: int, dept_name: str = None, completion: str = None, page_size: int = 10,
+                    layout: str = None):
+        """What a dashboard page load needs: /stats, /fund-flow and the first /projects-by-completion page.
+
+        Overview and fund flow come from one statement over the snapshot's summary rows, and the
+        projects page runs on the same connection. dept_name filters overview and fund flow only,
+        as it does on the separate endpoints.
         """
+        try:
+            match = self._match_departments(tndr_pk, dept_name) if dept_name else None
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+        summary_query, summary_params = self._summary_query(tndr_pk, match)
+        queries, params = self._completion_queries(tndr_pk, completion)
+        filters = {"completion": completion or None}
+        request = self._page_request("projects_by_completion", tndr_pk, filters, queries, params,
+                                     COMPLETION_KEY_SIZE, 1, page_size, None, 0)
 
         conn = None
         try:
             conn = self.db.get_connection()
-            cursor = conn.cursor()
-            cursor.execute(query)
-            row = cursor.fetchone()
-            columns = [desc[0] for desc in cursor.description]
-            cursor.close()
-            if not row:
-                return {"success": False, "error": "No data found"}
-            return {"success": True, "data": decimal_to_float(dict(zip(columns, row)))}
+            db_cursor = conn.cursor()
+            if layout:
+                float_numerics(db_cursor)
+            prepared_queries.execute(db_cursor, summary_query, summary_params)
+            names = [desc[0] for desc in db_cursor.description]
+            summary = dict(zip(names, db_cursor.fetchone()))
+            projects = self._fetch_page(db_cursor, "projects_by_completion", tndr_pk, filters, queries, params,
+                                        COMPLETION_KEY_SIZE, request, page_size, layout)
+            db_cursor.close()
+            return self._summary_result(summary, projects)
         except Exception as e:
             import traceback
             traceback.print_exc()
@@ -205,23 +295,36 @@ class DashboardService:
             if conn:
                 self.db.release_connection(conn)
 
-    def get_all_tender_masters(self):
-        query = """
-        SELECT
-            tndr_pk,
-            tndr_source_file,
-            dst_source_file,
-            dept_source_file,
-            crt_dt,
-            crt_user
-        FROM tender_master
-        ORDER BY crt_dt DESC
+    def get_snapshot_version(self, tndr_pk: int):
+        """When a snapshot was published and whether its load has finished; None if it does not exist.
+
+        published_at is the finish time of the ingest job that built it, or the master row's
+        crt_dt for snapshots loaded without a job. Only a finished snapshot is cached.
         """
+        def lookup():
+            conn = None
+            try:
+                conn = self.db.get_connection()
+                cursor = conn.cursor()
+                prepared_queries.execute(cursor, "query.dashboard.get_snapshot_version", (tndr_pk,))
+                row = cursor.fetchone()
+                cursor.close()
+            finally:
+                if conn:
+                    self.db.release_connection(conn)
+            if not row:
+                return None
+            return {"published_at": row[0].isoformat() if row[0] else None, "final": row[1]}
+
+        return remember("snapshot_version", tndr_pk, {}, lookup, should_cache=lambda version: bool(version and version["final"]))
+
+    @cached("tender_masters")
+    def get_all_tender_masters(self):
         conn = None
         try:
             conn = self.db.get_connection()
             cursor = conn.cursor()
-            cursor.execute(query)
+            prepared_queries.execute(cursor, "query.dashboard.get_all_tender_masters")
             rows = cursor.fetchall()
             columns = [desc[0] for desc in cursor.description]
             cursor.close()
@@ -234,117 +337,209 @@ class DashboardService:
             if conn:
                 self.db.release_connection(conn)
 
-    def get_projects_by_completion(self, tndr_pk: int, completion: str = None, page: int = 1, page_size: int = 10):
-        completion_filter = ""
-        if completion == "25":
-            completion_filter = 'AND COALESCE((t."WIP_TOTAL" / NULLIF(t."SANCTION_COST", 0)) * 100, 0) < 25'
-        elif completion == "50":
-            completion_filter = 'AND COALESCE((t."WIP_TOTAL" / NULLIF(t."SANCTION_COST", 0)) * 100, 0) >= 25 AND COALESCE((t."WIP_TOTAL" / NULLIF(t."SANCTION_COST", 0)) * 100, 0) < 50'
-        elif completion == "75":
-            completion_filter = 'AND COALESCE((t."WIP_TOTAL" / NULLIF(t."SANCTION_COST", 0)) * 100, 0) >= 50 AND COALESCE((t."WIP_TOTAL" / NULLIF(t."SANCTION_COST", 0)) * 100, 0) < 75'
-        elif completion == "100":
-            completion_filter = 'AND COALESCE((t."WIP_TOTAL" / NULLIF(t."SANCTION_COST", 0)) * 100, 0) >= 75 AND COALESCE((t."WIP_TOTAL" / NULLIF(t."SANCTION_COST", 0)) * 100, 0) < 100'
-        elif completion == "completed":
-            completion_filter = 'AND COALESCE((t."WIP_TOTAL" / NULLIF(t."SANCTION_COST", 0)) * 100, 0) >= 100'
-
-        offset = (page - 1) * page_size
-
-        count_query = f"""
-        SELECT COUNT(*)
-        FROM "TENDER_DATA_DTLS" t
-        WHERE t.tndr_pk = {tndr_pk}
-        {completion_filter}
-        """
+    def export_projects(self, tndr_pk: int, dept_name: str = None, completion: str = None, fmt: str = "csv"):
+        """Stream a snapshot's project rows (deptwise columns and order) as csv, xlsx or parquet.
 
-        query = f"""
-        SELECT
-            t."TDM_PK" AS tdm_pk,
-            t."WORK_CODE" AS work_code,
-            t."DEPARTMENT_CODE" AS department_code,
-            t."PROJECT_NAME" AS project_name,
-            t."DISTRICT_CODE" AS district_code,
-            dist."DIST_NAME" AS district_name,
-            t."SANCTION_COST" AS sanction_cost,
-            t."SANCTION_DATE" AS sanction_date,
-            t."FUND_RECEIVED" AS fund_received,
-            t."FUND_RECEIVED_DATE" AS fund_received_date,
-            t."LAND_RECEIVED_DATE" AS land_received_date,
-            t."WIP_PREVIOUS_YEAR" AS wip_previous_year,
-            t."WIP_CURRENT_YEAR" AS wip_current_year,
-            t."WIP_CURRENT_MONTH" AS wip_current_month,
-            t."WIP_TOTAL" AS wip_total,
-            t."PHYSICAL_PROGRESS_REMARK" AS physical_progress_remark,
-            ROUND(COALESCE((t."WIP_TOTAL" / NULLIF(t."SANCTION_COST", 0)) * 100, 0)::numeric, 2) AS physical_progress,
-            CASE
-                WHEN COALESCE((t."WIP_TOTAL" / NULLIF(t."SANCTION_COST", 0)) * 100, 0) < 25 THEN 'Below 25%'
-                WHEN COALESCE((t."WIP_TOTAL" / NULLIF(t."SANCTION_COST", 0)) * 100, 0) < 50 THEN '25-50%'
-                WHEN COALESCE((t."WIP_TOTAL" / NULLIF(t."SANCTION_COST", 0)) * 100, 0) < 75 THEN '50-75%'
-                WHEN COALESCE((t."WIP_TOTAL" / NULLIF(t."SANCTION_COST", 0)) * 100, 0) < 100 THEN '75-100%'
-                ELSE 'Completed'
-            END AS completion_stage
-        FROM "TENDER_DATA_DTLS" t
-        LEFT JOIN "DISTRICT_DETAILS" dist
-            ON t."DISTRICT_CODE" = dist."DIST_CODE"
-            AND dist.tndr_pk = {tndr_pk}
-        WHERE t.tndr_pk = {tndr_pk}
-        {completion_filter}
-        ORDER BY t."DEPARTMENT_CODE", t."PROJECT_NAME"
-        LIMIT {page_size} OFFSET {offset}
+        Rows come from one query through a named cursor, EXPORT_ITERSIZE at a time, so memory
+        stays flat whatever the snapshot size. Returns the response pieces, or an error.
         """
+        fmt = (fmt or "csv").lower()
+        if fmt not in available_formats():
+            return {"success": False, "error": f"format must be one of: {', '.join(available_formats())}"}
+        if completion and completion not in COMPLETION_STAGES:
+            return {"success": False, "error": f"completion must be one of: {', '.join(COMPLETION_STAGES)}"}
+        try:
+            match = self._match_departments(tndr_pk, dept_name) if dept_name else None
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+        pks, codes = (match["pks"], match["codes"]) if match else (None, None)
+        stage = COMPLETION_STAGES.get(completion)
+        params = (tndr_pk, tndr_pk, tndr_pk, pks, pks, codes, stage, stage)
+        sql = query_loader.get_query("query.dashboard.export_projects")
+
+        def rows():
+            conn = None
+            try:
+                conn = self.db.get_connection()
+                # Named cursor: Postgres holds the result and hands it over itersize rows at a time
+                cursor = conn.cursor(name="dashboard_export")
+                cursor.itersize = EXPORT_ITERSIZE
+                cursor.execute(sql, params)
+                chunk = cursor.fetchmany(EXPORT_ITERSIZE)
+                columns = [desc[0] for desc in cursor.description]
+                type_codes = [desc[1] for desc in cursor.description]
+
+                def chunks():
+                    batch = chunk
+                    while batch:
+                        yield batch
+                        batch = cursor.fetchmany(EXPORT_ITERSIZE)
 
+                yield from WRITERS[fmt](columns, chunks(), type_codes)
+                cursor.close()
+            except GeneratorExit:
+                print(f"DEBUG export: client stopped reading snapshot {tndr_pk} {fmt} export")
+                raise
+            except Exception:
+                # Headers are already sent, so all that is left is to log and cut the download short
+                import traceback
+                traceback.print_exc()
+                raise
+            finally:
+                if conn:
+                    self.db.release_connection(conn)
+
+        media_type, extension = EXPORT_FORMATS[fmt]
+        return {
+            "success": True,
+            "filename": f"tender_{tndr_pk}_projects{extension}",
+            "media_type": media_type,
+            "content": rows(),
+        }
+
+    def get_query_stats(self):
+        """Prepared-statement reuse counters for this process, plus plan counts from one pooled connection"""
         conn = None
         try:
             conn = self.db.get_connection()
             cursor = conn.cursor()
-            cursor.execute(count_query)
-            total = cursor.fetchone()[0]
-            cursor.execute(query)
-            rows = cursor.fetchall()
-            columns = [desc[0] for desc in cursor.description]
+            stats = prepared_queries.snapshot(cursor)
             cursor.close()
-            return {
-                "success": True,
-                "data": decimal_to_float([dict(zip(columns, row)) for row in rows]),
-                "pagination": {
-                    "total": total,
-                    "page": page,
-                    "page_size": page_size,
-                    "total_pages": (total + page_size - 1) // page_size
-                }
-            }
+            return stats
         except Exception as e:
-            import traceback
-            traceback.print_exc()
             return {"success": False, "error": str(e)}
         finally:
             if conn:
                 self.db.release_connection(conn)
 
-    def get_all_tender_masters(self):
-        query = """
-        SELECT
-            tndr_pk,
-            tndr_source_file,
-            dst_source_file,
-            dept_source_file,
-            crt_dt,
-            crt_user
-        FROM tender_master
-        ORDER BY crt_dt DESC
-        """
-        conn = None
+    # Async variants for the async routes: same queries and cache entries, run on the asyncpg pool
+    # so a request waiting on Postgres holds neither a threadpool worker nor a psycopg2 connection
+
+    async def _fetch_one_async(self, query_name, params):
         try:
-            conn = self.db.get_connection()
-            cursor = conn.cursor()
-            cursor.execute(query)
-            rows = cursor.fetchall()
-            columns = [desc[0] for desc in cursor.description]
-            cursor.close()
-            return {"success": True, "data": [dict(zip(columns, row)) for row in rows]}
+            row = await async_db.fetchrow(query_name, params)
+            if not row:
+                return {"success": False, "error": "No data found"}
+            return {"success": True, "data": decimal_to_float(dict(row))}
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            return {"success": False, "error": str(e)}
+
+    async def _match_departments_async(self, tndr_pk: int, dept_name: str):
+        async def lookup():
+            rows = await async_db.fetch("query.dashboard.match_departments", (tndr_pk, f"%{dept_name}%"))
+            return {"pks": [row[0] for row in rows], "codes": sorted({row[1] for row in rows if row[1] is not None})}
+
+        return await aremember("dept_match", tndr_pk, {"dept_name": dept_name.lower()}, lookup)
+
+    async def _fetch_page_async(self, conn, endpoint, tndr_pk, filters, queries, params, key_size, request, page_size,
+                                layout=None):
+        page, page_query, page_params = request
+
+        async def count():
+            rows = await async_db.fetch(queries[0], params, conn)
+            return rows[0][0]
+
+        total = await aremember(f"{endpoint}_count", tndr_pk, filters, count)
+        names, rows = await async_db.fetch_tuples(page_query, page_params, conn)
+        if not layout:
+            rows = [dict(zip(names, row)) for row in rows]
+        return self._page_result(endpoint, tndr_pk, filters, rows, total, key_size, page, page_size, names, layout)
+
+    async def _keyset_page_async(self, endpoint, tndr_pk, filters, queries, params, key_size,
+                                 page, page_size, cursor=None, seek_prefix=0, layout=None):
+        request = self._page_request(endpoint, tndr_pk, filters, queries, params, key_size,
+                                     page, page_size, cursor, seek_prefix)
+        if request is None:
+            return {"success": False, "error": "Invalid cursor"}
+
+        try:
+            async with async_db.acquire() as conn:
+                return await self._fetch_page_async(conn, endpoint, tndr_pk, filters, queries, params, key_size,
+                                                    request, page_size, layout)
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            return {"success": False, "error": str(e)}
+
+    @cached("overview", case_insensitive=("dept_name",))
+    async def get_overview_async(self, tndr_pk: int, dept_name: str = None):
+        if not dept_name:
+            return await self._fetch_one_async("query.dashboard.get_overview", (tndr_pk,))
+        try:
+            match = await self._match_departments_async(tndr_pk, dept_name)
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+        return await self._fetch_one_async("query.dashboard.get_overview_by_dept", (tndr_pk, match["pks"], match["codes"]))
+
+    @cached("tender_details_deptwise", case_insensitive=("dept_name",))
+    async def get_tender_details_deptwise_async(self, tndr_pk: int, dept_name: str = None, page: int = 1,
+                                                page_size: int = 10, cursor: str = None, layout: str = None):
+        queries = ("query.dashboard.count_deptwise", "query.dashboard.get_deptwise_page", "query.dashboard.get_deptwise_after")
+        params = [tndr_pk, tndr_pk]
+        if dept_name:
+            try:
+                match = await self._match_departments_async(tndr_pk, dept_name)
+            except Exception as e:
+                import traceback
+                traceback.print_exc()
+                return {"success": False, "error": str(e)}
+            queries = tuple(f"{name}_by_dept" for name in queries)
+            params += [match["pks"], match["codes"]]
+
+        filters = {"dept_name": dept_name.lower() if dept_name else None}
+        return await self._keyset_page_async("tender_details_deptwise", tndr_pk, filters, queries, params,
+                                             DEPTWISE_KEY_SIZE, page, page_size, cursor, seek_prefix=2, layout=layout)
+
+    @cached("fund_flow", case_insensitive=("dept_name",))
+    async def get_fund_flow_async(self, tndr_pk: int, dept_name: str = None):
+        if not dept_name:
+            return await self._fetch_one_async("query.dashboard.get_fund_flow", (tndr_pk,))
+        try:
+            match = await self._match_departments_async(tndr_pk, dept_name)
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+        return await self._fetch_one_async("query.dashboard.get_fund_flow_by_dept", (tndr_pk, match["pks"], match["codes"]))
+
+    @cached("projects_by_completion")
+    async def get_projects_by_completion_async(self, tndr_pk: int, completion: str = None, page: int = 1,
+                                               page_size: int = 10, cursor: str = None, layout: str = None):
+        queries, params = self._completion_queries(tndr_pk, completion)
+        return await self._keyset_page_async("projects_by_completion", tndr_pk, {"completion": completion or None},
+                                             queries, params, COMPLETION_KEY_SIZE, page, page_size, cursor,
+                                             layout=layout)
+
+    @cached("summary", case_insensitive=("dept_name",))
+    async def get_summary_async(self, tndr_pk: int, dept_name: str = None, completion: str = None, page_size: int = 10,
+                                layout: str = None):
+        try:
+            match = await self._match_departments_async(tndr_pk, dept_name) if dept_name else None
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+        summary_query, summary_params = self._summary_query(tndr_pk, match)
+        queries, params = self._completion_queries(tndr_pk, completion)
+        filters = {"completion": completion or None}
+        request = self._page_request("projects_by_completion", tndr_pk, filters, queries, params,
+                                     COMPLETION_KEY_SIZE, 1, page_size, None, 0)
+
+        try:
+            async with async_db.acquire() as conn:
+                summary = dict((await async_db.fetch(summary_query, summary_params, conn))[0])
+                projects = await self._fetch_page_async(conn, "projects_by_completion", tndr_pk, filters, queries,
+                                                        params, COMPLETION_KEY_SIZE, request, page_size, layout)
+            return self._summary_result(summary, projects)
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            return {"success": False, "error": str(e)}
+
+    @cached("tender_masters")
+    async def get_all_tender_masters_async(self):
+        try:
+            rows = await async_db.fetch("query.dashboard.get_all_tender_masters")
+            return {"success": True, "data": [dict(row) for row in rows]}
         except Exception as e:
             import traceback
             traceback.print_exc()
             return {"success": False, "error": str(e)}
-        finally:
-            if conn:
-                self.db.release_connection(conn)
@@ -1,31 +1,222 @@
 from app.api.dao.doc_dao import DocDAO
-from app.api.utils.s3_client import s3_client
+from app.api.utils.s3_client import s3_client, S3_PART_SIZE, S3_MAX_PARTS, S3_PRESIGN_EXPIRES
+from app.api.utils.dbf_reader import DBFStreamReader
+from app.api.utils.header_reader import read_columns, dbf_header_length
+from app.api.utils.excel_reader import ExcelStreamReader, resolve_engine
+from app.api.utils.executors import ingest_executor, run_blocking
+from concurrent.futures import FIRST_COMPLETED, wait
+from app.api.utils.cache import invalidate_snapshot
 import os
+import time
 import uuid
+import functools
+import io
 import tempfile
+import threading
 import pandas as pd
-from dbfread import DBF
+
+TENDER_REQUIRED_COLS = [
+    'DST_CD,N,4,0', 'WRK_CD,N,4,0', 'DPT_CD,C,5', 'WRK_NM,C,32',
+    'SAN_COST,N,7,2', 'SAN_DT,D', 'F_CL,N,7,2', 'F_CL_DT,D',
+    'LND_DT,D', 'WIP_31,N,7,2', 'WIP_1,N,7,2', 'WORK IN PROGRESS CURRENT MONTH',
+    'WIP_CR,N,7,2', 'PHY1,C,15'
+]
+DISTRICT_REQUIRED_COLS = ['Dst CD', 'Dst _Name', 'zone']
+DEPT_REQUIRED_COLS = ['Sr.N.', 'Dept. Name', 'Sub. Dept. Name', 'Dept./Sub. Dept.  Code']
+
+# required columns, strip column names, require data rows
+SOURCE_SPECS = {
+    "tender": (TENDER_REQUIRED_COLS, True, True),
+    "district": (DISTRICT_REQUIRED_COLS, False, False),
+    "department": (DEPT_REQUIRED_COLS, False, False),
+}
+
+# Presigned uploads never pass through the API, so they are not bound by its 1GB request cap
+PRESIGNED_MAX_FILE_SIZE = int(os.getenv("PRESIGNED_MAX_UPLOAD_MB", "5120")) * 1024 * 1024
+
+
+class LoadAborted(Exception):
+    """Raised inside a file load once a sibling file of the same snapshot has failed"""
+
+
+def rows_per_sec(count, started):
+    elapsed = time.perf_counter() - started
+    return round(count / elapsed) if elapsed > 0 else None
+
+
+def column_report(columns, required_cols, has_rows=True, require_rows=False):
+    """The error processors and the upload pre-flight both return, or None when the columns fit"""
+    missing_cols = [col for col in required_cols if col not in columns]
+    if require_rows and not has_rows:
+        return {"error": "File is empty, no data rows found"}
+    if missing_cols:
+        print(f"DEBUG Service: Missing columns: {missing_cols}")
+        return {"error": "Column mismatch", "missing_columns": missing_cols, "available_columns": columns}
+    return None
+
 
 class DocService:
     def __init__(self):
         self.doc_dao = DocDAO()
     
+    def validate_header(self, stream, filename: str, file_type: str):
+        """Check the columns from the file header only; returns None or the processors' error report"""
+        required_cols, strip_columns, require_rows = SOURCE_SPECS[file_type]
+        file_ext = os.path.splitext(filename)[1].lower()
+        started = time.perf_counter()
+        try:
+            columns, has_rows = read_columns(stream, file_ext)
+        except Exception as e:
+            return {"error": f"Could not read {file_type} file header: {str(e)}"}
+        if strip_columns:
+            columns = [col.strip() if isinstance(col, str) else col for col in columns]
+        print(f"DEBUG validate_header: {file_type} header checked in {(time.perf_counter() - started) * 1000:.1f}ms")
+        return column_report(columns, required_cols, has_rows, require_rows)
+
+    def validate_upload(self, file, file_type: str):
+        try:
+            return self.validate_header(file.file, file.filename, file_type)
+        finally:
+            file.file.seek(0)
+
     def upload_document(self, file, file_type: str):
         file_extension = os.path.splitext(file.filename)[1]
         unique_filename = f"tender/{file_type}/{uuid.uuid4()}{file_extension}"
         
         # Upload to S3
-        result = self.doc_dao.upload_to_s3(file, unique_filename)
+        stats = self.doc_dao.upload_to_s3(file, unique_filename)
         
-        if result:
+        if stats:
             return {
                 "success": True,
                 "filename": unique_filename,
                 "original_filename": file.filename,
+                "size_bytes": stats["size_bytes"],
+                "mb_per_sec": stats["mb_per_sec"],
                 "message": "File uploaded successfully"
             }
         return None
 
+    async def upload_document_stream(self, stream, filename: str, file_type: str, max_size: int = None):
+        """Upload a raw request body, sending S3 parts while the rest of the body is still arriving.
+
+        Bodies are counted as they arrive, so max_size holds for chunked requests too.
+        """
+        file_extension = os.path.splitext(filename)[1]
+        unique_filename = f"tender/{file_type}/{uuid.uuid4()}{file_extension}"
+        uploader = s3_client.open_upload(unique_filename)
+        buffer = bytearray()
+        # Only DBF headers can be checked from a prefix; Excel needs the zip directory at the end of the file
+        header_checked = file_extension.lower() != '.dbf'
+        received = 0
+        error = None
+        try:
+            async for chunk in stream:
+                received += len(chunk)
+                if max_size is not None and received > max_size:
+                    error = {"error": f"File too large. Maximum size is {max_size // (1024 * 1024)}MB", "too_large": True}
+                    break
+                buffer.extend(chunk)
+                if not header_checked:
+                    header_length = dbf_header_length(buffer)
+                    if header_length is None or len(buffer) < header_length:
+                        continue
+                    header_checked = True
+                    error = self.validate_header(io.BytesIO(bytes(buffer[:header_length])), filename, file_type)
+                    if error:
+                        break
+                if len(buffer) >= uploader.part_size:
+                    # Hand whole parts to the uploader so the thread hop happens once per part
+                    await run_blocking(uploader.write, bytes(buffer))
+                    buffer.clear()
+            if not error and not header_checked:
+                error = self.validate_header(io.BytesIO(bytes(buffer)), filename, file_type)
+            if error:
+                # Nothing is kept of a rejected body, including parts already sent
+                await run_blocking(uploader.abort)
+                return error
+            if buffer:
+                await run_blocking(uploader.write, bytes(buffer))
+            stats = await run_blocking(uploader.complete)
+        except Exception as e:
+            print(f"Error in upload_document_stream: {e}")
+            await run_blocking(uploader.abort)
+            return None
+
+        print(f"DEBUG upload_document_stream: {unique_filename} {stats['size_bytes']} bytes, {stats['mb_per_sec']} MB/s")
+        return {
+            "success": True,
+            "filename": unique_filename,
+            "original_filename": filename,
+            "size_bytes": stats["size_bytes"],
+            "mb_per_sec": stats["mb_per_sec"],
+            "message": "File uploaded successfully"
+        }
+
+    def create_presigned_upload(self, file_type: str, filename: str, size: int):
+        """Start a multipart upload and hand back one presigned URL per part"""
+        file_extension = os.path.splitext(filename)[1]
+        unique_filename = f"tender/{file_type}/{uuid.uuid4()}{file_extension}"
+
+        # Grow the part size for very large files so the upload stays within S3's part limit
+        part_size = max(S3_PART_SIZE, -(-size // S3_MAX_PARTS))
+        part_count = max(-(-size // part_size), 1)
+
+        # The declared size rides along as object metadata so completion can be verified statelessly
+        upload_id = s3_client.create_multipart_upload(unique_filename, {"expected-size": str(size)})
+        if not upload_id:
+            return None
+
+        return {
+            "key": unique_filename,
+            "upload_id": upload_id,
+            "part_size": part_size,
+            "part_count": part_count,
+            "expires_in": S3_PRESIGN_EXPIRES,
+            "parts": s3_client.presign_part_urls(unique_filename, upload_id, range(1, part_count + 1))
+        }
+
+    def presign_upload_parts(self, key: str, upload_id: str, part_numbers):
+        return {
+            "key": key,
+            "upload_id": upload_id,
+            "expires_in": S3_PRESIGN_EXPIRES,
+            "parts": s3_client.presign_part_urls(key, upload_id, part_numbers)
+        }
+
+    def complete_presigned_upload(self, key: str, upload_id: str, parts):
+        """Finish a client-side multipart upload and check the stored object matches what was declared"""
+        if not s3_client.complete_multipart_upload(key, upload_id, parts):
+            return {"error": "Failed to complete multipart upload"}
+
+        head = s3_client.head_object(key)
+        if not head:
+            return {"error": "Uploaded object not found"}
+
+        size = head["ContentLength"]
+        expected_size = head.get("Metadata", {}).get("expected-size")
+        if size == 0 or (expected_size is not None and int(expected_size) != size):
+            s3_client.delete_file(key)
+            return {"error": f"Uploaded size {size} does not match declared size {expected_size}"}
+
+        # Ranged reads fetch only the header, not the whole object
+        file_type = key.split("/")[1]
+        with s3_client.open_range_reader(key, size) as reader:
+            error = self.validate_header(reader, key, file_type)
+        if error:
+            s3_client.delete_file(key)
+            return error
+
+        return {
+            "success": True,
+            "filename": key,
+            "size_bytes": size,
+            "message": "File uploaded successfully"
+        }
+
+    def abort_presigned_upload(self, key: str, upload_id: str):
+        return s3_client.abort_multipart_upload(key, upload_id)
+
     def create_master_record(self, tender_s3_path, district_s3_path, dept_s3_path, username):
         master_records = {
             "tender": tender_s3_path,
@@ -33,139 +224,257 @@ class DocService:
             "department": dept_s3_path,
             "created_by": username
         }
-        return self.doc_dao.create_master_record(master_records)
+        tndr_pk = self.doc_dao.create_master_record(master_records)
+        if tndr_pk:
+            # The snapshot list now has a new entry
+            invalidate_snapshot(tndr_pk)
+        return tndr_pk
 
-    def process_tender_file(self, s3_path: str, tndr_pk: int, username: str = "system"):
-        """Stream file from S3 and process tender data"""
+    def delete_snapshot(self, tndr_pk):
+        deleted = self.doc_dao.delete_snapshot(tndr_pk)
+        invalidate_snapshot(tndr_pk)
+        return deleted
+
+    def process_snapshot(self, tender_s3_path, district_s3_path, dept_s3_path, tndr_pk, username="system", progress=None):
+        """Load the three snapshot files concurrently, all or nothing.
+
+        Each file loads on its own connection and stays uncommitted until every file has
+        succeeded; the loads are then committed together. The first failure stops the other
+        loads and rolls all of them back.
+        """
+        started = time.perf_counter()
+        loaders = {
+            "tender": (self.process_tender_file, tender_s3_path),
+            "district": (self.process_district_file, district_s3_path),
+            "department": (self.process_department_file, dept_s3_path),
+        }
+        abort = threading.Event()
+        conns = {}
+        results = {}
+        failed = []
         try:
-            print(f"DEBUG Service: Starting tender file processing for {s3_path}")
-            file_ext = os.path.splitext(s3_path)[1].lower()
+            for name in loaders:
+                conns[name] = self.doc_dao.open_load()
+            futures = {
+                ingest_executor.submit(loader, s3_path, tndr_pk, username, progress, conns[name], abort): name
+                for name, (loader, s3_path) in loaders.items()
+            }
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = futures[future]
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        results[name] = {"error": str(e)}
+                    if results[name].get("error") and not abort.is_set():
+                        failed.append(name)
+                        abort.set()
+                        print(f"DEBUG Service: {name} file failed for snapshot {tndr_pk}, stopping the other loads")
+                        for other in pending:
+                            if other.cancel():
+                                results[futures[other]] = {"error": f"Not started because {name} failed", "cancelled": True}
+                            else:
+                                # Interrupt the statement in flight; between chunks the abort event stops it
+                                conns[futures[other]].cancel()
+                        pending = {other for other in pending if not other.cancelled()}
+            for name, result in results.items():
+                if result.get("error") and name not in failed and abort.is_set():
+                    result["cancelled"] = True
+            if not failed:
+                try:
+                    self.doc_dao.publish_loads(conns.values())
+                except Exception as e:
+                    print(f"DEBUG Service: committing snapshot {tndr_pk} failed: {e}")
+                    results["publish"] = {"error": str(e)}
+                    failed = ["publish"]
+        except Exception as e:
+            # Checking out the load connections failed
+            results["load"] = {"error": str(e)}
+            failed = ["load"]
+        finally:
+            self.doc_dao.discard_loads(conns.values())
+
+        if not failed:
+            # Snapshots never change after loading, so the dashboard aggregates are computed once here
+            try:
+                results["summary"] = {"summary_rows": self.doc_dao.build_summary(tndr_pk)}
+            except Exception as e:
+                results["summary"] = {"error": str(e)}
+                failed = ["summary"]
+        if failed:
+            print(f"DEBUG Service: snapshot {tndr_pk} failed for {failed}, rolling back")
+            try:
+                deleted = self.doc_dao.delete_snapshot(tndr_pk)
+            except Exception as e:
+                print(f"DEBUG Service: removing snapshot {tndr_pk} failed: {e}")
+                deleted = False
+            # A failed delete leaves the master row (and a partial commit) for the job's next claim to remove
+            results["rollback"] = {"snapshot_deleted": deleted}
+        # Anything cached while the snapshot was loading is now wrong
+        invalidate_snapshot(tndr_pk)
+
+        print(f"DEBUG Service: snapshot {tndr_pk} processed in {time.perf_counter() - started:.2f}s")
+        return {"failed": failed, "results": results}
+
+    def _open_source(self, s3_path: str, required_cols, strip_columns=False, require_rows=False, report=None,
+                     abort=None):
+        """Open an S3 file as DataFrame chunks; returns (chunks, None) or (None, error)"""
+        file_ext = os.path.splitext(s3_path)[1].lower()
+        close = None
+
+        if file_ext in ['.xls', '.xlsx'] and resolve_engine(file_ext) == "pandas":
             file_stream = s3_client.get_file_stream(s3_path)
             if not file_stream:
-                return {"error": "Failed to stream file from S3"}
-            
-            df = pd.DataFrame()
-            if file_ext in ['.xls', '.xlsx']:
-                df = pd.read_excel(file_stream)
-            elif file_ext == '.dbf':
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.dbf') as temp_file:
-                    temp_file.write(file_stream.read())
-                    temp_file_path = temp_file.name
-                try:
-                    table = DBF(temp_file_path, load=True)
-                    df = pd.DataFrame(iter(table))
-                finally:
-                    os.unlink(temp_file_path)
-            else:
-                return {"error": "Unsupported file format"}
-            
+                return None, {"error": "Failed to stream file from S3"}
+            df = pd.read_excel(file_stream)
             print(f"DEBUG Service: DataFrame loaded, shape: {df.shape}")
-            print(f"DEBUG Service: Columns: {df.columns.tolist()}")
-            
-            if df.empty:
-                return {"error": "Excel file is empty, no data rows found"}
-            
-            # Strip whitespace/tabs from all column names
-            df.columns = df.columns.str.strip()
+            if strip_columns:
+                # Strip whitespace/tabs from all column names
+                df.columns = df.columns.str.strip()
+            columns = df.columns.tolist()
+            is_empty = df.empty
+            chunks = [df]
+        elif file_ext in ['.xls', '.xlsx']:
+            # Workbooks are zip/OLE containers that need random access, so land them in a temp file
+            with tempfile.NamedTemporaryFile(suffix=file_ext, delete=False) as temp_file:
+                temp_path = temp_file.name
+            if not s3_client.download_file(s3_path, temp_path):
+                os.unlink(temp_path)
+                return None, {"error": "Failed to stream file from S3"}
+            try:
+                reader = ExcelStreamReader(temp_path, resolve_engine(file_ext))
+            except Exception:
+                os.unlink(temp_path)
+                raise
+            print(f"DEBUG Service: Excel sheet opened with {reader.engine}")
+
+            def close():
+                reader.close()
+                os.unlink(temp_path)
+
+            columns = [col.strip() if isinstance(col, str) and strip_columns else col for col in reader.columns]
+            is_empty = reader.is_empty
+            chunks = self._closing_chunks(reader.iter_chunks(), close, strip_columns)
+        elif file_ext == '.dbf':
+            body = s3_client.get_file_body(s3_path)
+            if not body:
+                return None, {"error": "Failed to stream file from S3"}
+            try:
+                reader = DBFStreamReader(body)
+            except Exception:
+                body.close()
+                raise
+            print(f"DEBUG Service: DBF header read, records: {reader.num_records}, record length: {reader.record_length}")
+            close = body.close
+            columns = [name.strip() if strip_columns else name for name in reader.field_names]
+            is_empty = reader.num_records == 0
+            chunks = self._closing_chunks(reader.iter_chunks(), close, strip_columns)
+        else:
+            return None, {"error": "Unsupported file format"}
+
+        print(f"DEBUG Service: Columns: {columns}")
 
-            print(f"DEBUG Service: Stripped columns: {df.columns.tolist()}")
+        error = column_report(columns, required_cols, not is_empty, require_rows)
+        if error:
+            if close:
+                close()
+            return None, error
+        return self._validated_chunks(chunks, required_cols, report, abort), None
 
-            required_cols = [
-                'DST_CD,N,4,0', 'WRK_CD,N,4,0', 'DPT_CD,C,5', 'WRK_NM,C,32',
-                'SAN_COST,N,7,2', 'SAN_DT,D', 'F_CL,N,7,2', 'F_CL_DT,D',
-                'LND_DT,D', 'WIP_31,N,7,2', 'WIP_1,N,7,2', 'WORK IN PROGRESS CURRENT MONTH',
-                'WIP_CR,N,7,2', 'PHY1,C,15'
-            ]
+    def _closing_chunks(self, chunks, close, strip_columns):
+        """Pass chunks through, releasing the underlying file once they are consumed or abandoned"""
+        try:
+            for chunk in chunks:
+                if strip_columns:
+                    chunk.columns = chunk.columns.str.strip()
+                yield chunk
+        finally:
+            close()
 
-            missing_cols = [col for col in required_cols if col not in df.columns]
+    def _validated_chunks(self, chunks, required_cols, report=None, abort=None):
+        """Check each chunk against required_cols before it is handed to the DAO"""
+        parsed = 0
+        for number, chunk in enumerate(chunks, 1):
+            if abort is not None and abort.is_set():
+                raise LoadAborted("Stopped because another file of the snapshot failed")
+            missing_cols = [col for col in required_cols if col not in chunk.columns]
             if missing_cols:
-                print(f"DEBUG Service: Missing columns: {missing_cols}")
-                print(f"DEBUG Service: Available columns: {df.columns.tolist()}")
-                return {"error": "Column mismatch", "missing_columns": missing_cols, "available_columns": df.columns.tolist()}
-            
-            tender_df = df[required_cols]
-            print(f"DEBUG Service: Filtered DataFrame shape: {tender_df.shape}")
-            
-            if tender_df.empty:
-                return {"error": "No data after filtering columns"}
+                raise ValueError(f"Chunk {number} is missing columns: {missing_cols}")
+            print(f"DEBUG Service: chunk {number}: {len(chunk)} rows")
+            # The previous chunk has been fully written once the loader asks for this one
+            if report:
+                report(rows_parsed=parsed + len(chunk), rows_inserted=parsed)
+            parsed += len(chunk)
+            yield chunk[required_cols]
+        if report:
+            report(rows_parsed=parsed, rows_inserted=parsed)
+
+    def process_tender_file(self, s3_path: str, tndr_pk: int, username: str = "system", progress=None,
+                            conn=None, abort=None):
+        """Stream file from S3 and process tender data"""
+        try:
+            print(f"DEBUG Service: Starting tender file processing for {s3_path}")
+            report = functools.partial(progress, "tender") if progress else None
+            chunks, error = self._open_source(
+                s3_path, TENDER_REQUIRED_COLS, strip_columns=True, require_rows=True, report=report, abort=abort
+            )
+            if error:
+                return error
             
             print(f"DEBUG Service: Calling DAO with tndr_pk={tndr_pk}")
             
-            inserted_count = self.doc_dao.bulk_insert_tender(tender_df, tndr_pk)
+            started = time.perf_counter()
+            inserted_count = self.doc_dao.bulk_insert_tender_chunks(chunks, tndr_pk, conn=conn)
             
-            return {"message": "Tender file processed", "rows_inserted": inserted_count}
+            return {
+                "message": "Tender file processed",
+                "rows_inserted": inserted_count,
+                "rows_per_sec": rows_per_sec(inserted_count, started)
+            }
         except Exception as e:
             print(f"DEBUG Service: Exception in process_tender_file: {e}")
             import traceback
             traceback.print_exc()
             return {"error": str(e)}
 
-    def process_district_file(self, s3_path: str, tndr_pk: int, username: str = "system"):
+    def process_district_file(self, s3_path: str, tndr_pk: int, username: str = "system", progress=None,
+                              conn=None, abort=None):
         """Stream file from S3 and process district data"""
         try:
-            file_ext = os.path.splitext(s3_path)[1].lower()
-            file_stream = s3_client.get_file_stream(s3_path)
-            if not file_stream:
-                return {"error": "Failed to stream file from S3"}
-            
-            df = pd.DataFrame()
-            if file_ext in ['.xls', '.xlsx']:
-                df = pd.read_excel(file_stream)
-            elif file_ext == '.dbf':
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.dbf') as temp_file:
-                    temp_file.write(file_stream.read())
-                    temp_file_path = temp_file.name
-                try:
-                    table = DBF(temp_file_path, load=True)
-                    df = pd.DataFrame(iter(table))
-                finally:
-                    os.unlink(temp_file_path)
-            else:
-                return {"error": "Unsupported file format"}
-            
-            required_cols = ['Dst CD', 'Dst _Name', 'zone']
-            missing_cols = [col for col in required_cols if col not in df.columns]
-            if missing_cols:
-                return {"error": "Column mismatch", "missing_columns": missing_cols}
+            report = functools.partial(progress, "district") if progress else None
+            chunks, error = self._open_source(s3_path, DISTRICT_REQUIRED_COLS, report=report, abort=abort)
+            if error:
+                return error
             
-            district_df = df[required_cols]
-            inserted_count = self.doc_dao.bulk_insert_district(district_df, tndr_pk)
+            started = time.perf_counter()
+            inserted_count = self.doc_dao.bulk_insert_district_chunks(chunks, tndr_pk, conn=conn)
             
-            return {"message": "District file processed", "rows_inserted": inserted_count}
+            return {
+                "message": "District file processed",
+                "rows_inserted": inserted_count,
+                "rows_per_sec": rows_per_sec(inserted_count, started)
+            }
         except Exception as e:
             return {"error": str(e)}
     
-    def process_department_file(self, s3_path: str, tndr_pk: int, username: str = "system"):
+    def process_department_file(self, s3_path: str, tndr_pk: int, username: str = "system", progress=None,
+                                conn=None, abort=None):
         """Stream file from S3 and process department data"""
         try:
-            file_ext = os.path.splitext(s3_path)[1].lower()
-            file_stream = s3_client.get_file_stream(s3_path)
-            if not file_stream:
-                return {"error": "Failed to stream file from S3"}
-            
-            df = pd.DataFrame()
-            if file_ext in ['.xls', '.xlsx']:
-                df = pd.read_excel(file_stream)
-            elif file_ext == '.dbf':
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.dbf') as temp_file:
-                    temp_file.write(file_stream.read())
-                    temp_file_path = temp_file.name
-                try:
-                    table = DBF(temp_file_path, load=True)
-                    df = pd.DataFrame(iter(table))
-                finally:
-                    os.unlink(temp_file_path)
-            else:
-                return {"error": "Unsupported file format"}
-            
-            required_cols = ['Sr.N.', 'Dept. Name', 'Sub. Dept. Name', 'Dept./Sub. Dept.  Code']
-            missing_cols = [col for col in required_cols if col not in df.columns]
-            if missing_cols:
-                return {"error": "Column mismatch", "missing_columns": missing_cols}
+            report = functools.partial(progress, "department") if progress else None
+            chunks, error = self._open_source(s3_path, DEPT_REQUIRED_COLS, report=report, abort=abort)
+            if error:
+                return error
             
-            dept_df = df[required_cols]
-            inserted_count = self.doc_dao.bulk_insert_dept(dept_df, tndr_pk)
+            started = time.perf_counter()
+            inserted_count = self.doc_dao.bulk_insert_dept_chunks(chunks, tndr_pk, conn=conn)
             
-            return {"message": "Department file processed", "rows_inserted": inserted_count}
+            return {
+                "message": "Department file processed",
+                "rows_inserted": inserted_count,
+                "rows_per_sec": rows_per_sec(inserted_count, started)
+            }
         except Exception as e:
             return {"error": str(e)}
\ No newline at end of file
@@ -6,3 +6,6 @@ class HealthService:
     
     def get_health_info(self):
         return self.health_dao.fetch_health_data()
+
+    def get_pool_stats(self):
+        return {"success": True, "data": self.health_dao.fetch_pool_stats()}
@@ -0,0 +1,112 @@
+from app.api.dao.job_dao import JobDAO
+from app.api.services.doc_service import DocService
+from app.api.services.warmup_service import WarmupService
+from app.api.utils.executors import warmup_executor
+import os
+import threading
+
+INGEST_JOB_STALE_SECONDS = int(os.getenv("INGEST_JOB_STALE_SECONDS", "300"))
+INGEST_JOB_MAX_ATTEMPTS = int(os.getenv("INGEST_JOB_MAX_ATTEMPTS", "3"))
+INGEST_JOB_HEARTBEAT_SECONDS = int(os.getenv("INGEST_JOB_HEARTBEAT_SECONDS", "30"))
+
+
+def failure_detail(name, result):
+    return {
+        "message": f"{name.capitalize()} processing failed",
+        "error": result.get('error'),
+        "missing_columns": result.get('missing_columns', []),
+        "available_columns": result.get('available_columns', [])
+    }
+
+
+class JobService:
+    def __init__(self):
+        self.job_dao = JobDAO()
+        self.doc_service = DocService()
+        self.warmup_service = WarmupService()
+
+    def enqueue_snapshot(self, tender_s3_path, district_s3_path, dept_s3_path, username):
+        return self.job_dao.enqueue(tender_s3_path, district_s3_path, dept_s3_path, username)
+
+    def get_status(self, job_pk: int):
+        return self.job_dao.get(job_pk)
+
+    def claim_next(self):
+        """Fail jobs that keep dying, then claim the next runnable one (or None)"""
+        for tndr_pk in self.job_dao.expire_stale(INGEST_JOB_STALE_SECONDS, INGEST_JOB_MAX_ATTEMPTS):
+            # No attempt will come back for it, so the partial snapshot goes now
+            print(f"DEBUG Job: removing partial snapshot {tndr_pk} of an expired job")
+            if not self.doc_service.delete_snapshot(tndr_pk):
+                print(f"Error removing partial snapshot {tndr_pk} of an expired job")
+        return self.job_dao.claim(INGEST_JOB_STALE_SECONDS, INGEST_JOB_MAX_ATTEMPTS)
+
+    def _heartbeat(self, job_pk, stop):
+        while not stop.wait(INGEST_JOB_HEARTBEAT_SECONDS):
+            try:
+                self.job_dao.heartbeat(job_pk)
+            except Exception as e:
+                print(f"Error sending heartbeat for job {job_pk}: {e}")
+
+    def _progress_reporter(self, job_pk):
+        def report(file_type, rows_parsed=None, rows_inserted=None):
+            try:
+                self.job_dao.update_progress(job_pk, {
+                    file_type: {"rows_parsed": rows_parsed, "rows_inserted": rows_inserted}
+                })
+            except Exception as e:
+                print(f"Error updating progress for job {job_pk}: {e}")
+        return report
+
+    def _warmup_reporter(self, job_pk):
+        def report(outcome):
+            try:
+                self.job_dao.update_progress(job_pk, {"warmup": outcome})
+            except Exception as e:
+                print(f"Error recording warm-up for job {job_pk}: {e}")
+        return report
+
+    def run_job(self, job: dict):
+        """Create the master record and load the snapshot for a claimed job, recording the outcome"""
+        job_pk = job["job_pk"]
+        stop = threading.Event()
+        threading.Thread(target=self._heartbeat, args=(job_pk, stop), daemon=True).start()
+        try:
+            if job["tndr_pk"]:
+                # A previous attempt died part-way; drop what it wrote before starting again
+                print(f"DEBUG Job {job_pk}: removing partial snapshot {job['tndr_pk']} from attempt {job['attempts'] - 1}")
+                self.doc_service.delete_snapshot(job["tndr_pk"])
+
+            tndr_pk = self.doc_service.create_master_record(
+                job["tender_s3_path"], job["district_s3_path"], job["dept_s3_path"], job["crt_user"]
+            )
+            if not tndr_pk:
+                self.job_dao.fail(job_pk, {"error": "Failed to create master record"})
+                return
+            self.job_dao.set_tndr_pk(job_pk, tndr_pk)
+
+            outcome = self.doc_service.process_snapshot(
+                job["tender_s3_path"], job["district_s3_path"], job["dept_s3_path"],
+                tndr_pk, job["crt_user"], progress=self._progress_reporter(job_pk)
+            )
+            results = outcome["results"]
+            if outcome["failed"]:
+                name = outcome["failed"][0]
+                self.job_dao.fail(job_pk, failure_detail(name, results[name]))
+                return
+
+            self.job_dao.complete(job_pk, {
+                "tndr_pk": tndr_pk,
+                "tender_result": results["tender"],
+                "district_result": results["district"],
+                "department_result": results["department"],
+            })
+            print(f"DEBUG Job {job_pk}: snapshot {tndr_pk} completed")
+            # The job already reads as completed; warm-up results land in its progress when done
+            warmup_executor.submit(self.warmup_service.run, tndr_pk, self._warmup_reporter(job_pk))
+        except Exception as e:
+            print(f"Error running job {job_pk}: {e}")
+            import traceback
+            traceback.print_exc()
+            self.job_dao.fail(job_pk, {"error": f"Processing failed: {str(e)}"})
+        finally:
+            stop.set()
@@ -0,0 +1,81 @@
+from app.api.dao.doc_dao import DocDAO
+from app.api.services.dashboard_service import DashboardService, COMPLETION_STAGES
+from app.api.utils.cache import request_warmup
+from app.api.utils.redis_client import redis_client
+import os
+import time
+
+# Departments whose filtered views are precomputed, alphabetically; the rest stay lazy
+WARMUP_MAX_DEPARTMENTS = int(os.getenv("WARMUP_MAX_DEPARTMENTS", "50"))
+
+
+class WarmupService:
+    """Post-ingest warm-up: fresh planner statistics, then the default dashboard responses of the new snapshot"""
+
+    def __init__(self):
+        self.doc_dao = DocDAO()
+        self.dashboard_service = DashboardService()
+
+    def _default_calls(self, tndr_pk):
+        """(name, call) for what a first visit requests; the arguments match the routes' defaults so the cache keys do"""
+        service = self.dashboard_service
+        calls = [
+            ("snapshot_version", lambda: service.get_snapshot_version(tndr_pk)),
+            ("tender_masters", service.get_all_tender_masters),
+        ]
+        for completion in [None, *COMPLETION_STAGES]:
+            calls.append((f"projects_by_completion[{completion}]",
+                          lambda completion=completion: service.get_projects_by_completion(tndr_pk, completion)))
+        for dept_name in [None, *service.get_department_names(tndr_pk, WARMUP_MAX_DEPARTMENTS)]:
+            calls.extend([
+                (f"overview[{dept_name}]", lambda dept_name=dept_name: service.get_overview(tndr_pk, dept_name)),
+                (f"fund_flow[{dept_name}]", lambda dept_name=dept_name: service.get_fund_flow(tndr_pk, dept_name)),
+                (f"tender_details_deptwise[{dept_name}]",
+                 lambda dept_name=dept_name: service.get_tender_details_deptwise(tndr_pk, dept_name)),
+                (f"summary[{dept_name}]", lambda dept_name=dept_name: service.get_summary(tndr_pk, dept_name)),
+            ])
+        return calls
+
+    def warm_cache(self, tndr_pk: int):
+        """Compute and store the default responses in this process's cache backend"""
+        started = time.perf_counter()
+        if not redis_client.enabled:
+            return {"skipped": "cache disabled"}
+        warmed, failed = 0, []
+        try:
+            calls = self._default_calls(tndr_pk)
+        except Exception as e:
+            print(f"DEBUG warmup: could not list departments of snapshot {tndr_pk}: {e}")
+            return {"error": str(e)}
+        for name, call in calls:
+            try:
+                result = call()
+            except Exception as e:
+                print(f"DEBUG warmup: {name} failed for snapshot {tndr_pk}: {e}")
+                result = None
+            if result is None or (isinstance(result, dict) and result.get("success") is False):
+                failed.append(name)
+            else:
+                warmed += 1
+        elapsed = time.perf_counter() - started
+        print(f"DEBUG warmup: cached {warmed} responses for snapshot {tndr_pk} in {elapsed:.2f}s"
+              + (f", failed: {failed}" if failed else ""))
+        return {"cached": warmed, "failed": failed, "seconds": round(elapsed, 3)}
+
+    def run(self, tndr_pk: int, report=None):
+        """ANALYZE, then warm the shared cache here or ask each API process to warm its own LRU"""
+        outcome = {}
+        try:
+            outcome["analyze_seconds"] = round(self.doc_dao.analyze_snapshot_tables(), 3)
+        except Exception as e:
+            outcome["analyze_error"] = str(e)
+        if redis_client.enabled and redis_client.backend == "lru":
+            # An LRU lives in each API process, so filling this one would help nobody
+            request_warmup(tndr_pk)
+            outcome["cache"] = {"requested": "api processes"}
+        else:
+            outcome["cache"] = self.warm_cache(tndr_pk)
+        print(f"DEBUG warmup: snapshot {tndr_pk} warm-up done: {outcome}")
+        if report:
+            report(outcome)
+        return outcome
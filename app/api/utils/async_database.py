@@ -0,0 +1,136 @@
+import asyncio
+import contextlib
+import os
+import time
+
+import asyncpg
+
+from app.api.utils.database import get_db
+from app.api.utils.prepared_queries import PREPARE_ENABLED, PreparedQueries
+from app.api.utils.query_loader import query_loader
+
+
+class AsyncDatabase:
+    """asyncpg pool for the async dashboard routes, separate from the psycopg2 pool used by sync code"""
+
+    def __init__(self):
+        self.pool = None
+        self.pool_lock = None
+        self.slots = None
+        self.sql = {}
+        self.counters = {"checkouts": 0, "waits": 0, "timeouts": 0, "wait_ms_total": 0.0, "wait_ms_max": 0.0}
+
+    def _connection_params(self):
+        params = get_db()._connection_params()
+        return {
+            "host": params["host"],
+            "port": int(params["port"]),
+            "database": params["database"],
+            "user": params["user"],
+            "password": params["password"],
+            "ssl": params["sslmode"],
+        }
+
+    async def get_pool(self):
+        if self.pool is None:
+            if self.pool_lock is None:
+                self.pool_lock = asyncio.Lock()
+            async with self.pool_lock:
+                if self.pool is None:
+                    max_size = int(os.getenv("DB_ASYNC_MAX_CONNECTIONS", "20"))
+                    self.pool = await asyncpg.create_pool(
+                        min_size=int(os.getenv("DB_ASYNC_MIN_CONNECTIONS", "1")),
+                        max_size=max_size,
+                        # asyncpg prepares and caches every statement per connection, unless pooled
+                        # transaction-mode (PgBouncer) connections rule that out
+                        statement_cache_size=100 if PREPARE_ENABLED else 0,
+                        init=self._init_connection,
+                        **self._connection_params()
+                    )
+                    # asyncpg's own queue lets new arrivals take a freed connection ahead of
+                    # coroutines already waiting; a semaphore (FIFO) keeps checkouts in order
+                    self.slots = asyncio.Semaphore(max_size)
+        return self.pool
+
+    @staticmethod
+    async def _init_connection(conn):
+        # numeric as float, as the sync path serves it after decimal_to_float; no Decimal reaches the encoder
+        await conn.set_type_codec("numeric", encoder=str, decoder=float, schema="pg_catalog", format="text")
+
+    @contextlib.asynccontextmanager
+    async def acquire(self):
+        """Check out a connection, waiting in line up to DB_POOL_TIMEOUT seconds"""
+        pool = await self.get_pool()
+        started = time.monotonic()
+        waited = self.slots.locked()
+        try:
+            await asyncio.wait_for(self.slots.acquire(), float(os.getenv("DB_POOL_TIMEOUT", "30")))
+        except asyncio.TimeoutError:
+            self.counters["timeouts"] += 1
+            raise
+        try:
+            async with pool.acquire() as conn:
+                wait_ms = (time.monotonic() - started) * 1000
+                self.counters["checkouts"] += 1
+                self.counters["waits"] += waited
+                self.counters["wait_ms_total"] += wait_ms
+                self.counters["wait_ms_max"] = max(self.counters["wait_ms_max"], wait_ms)
+                yield conn
+        finally:
+            self.slots.release()
+
+    def get_query(self, query_name):
+        """queries.properties entry with $n placeholders, as asyncpg expects"""
+        sql = self.sql.get(query_name)
+        if sql is None:
+            raw = query_loader.get_query(query_name)
+            if raw is None:
+                raise KeyError(f"Query not found: {query_name}")
+            sql = self.sql[query_name] = PreparedQueries.to_positional(raw)
+        return sql
+
+    async def fetch(self, query_name, params=(), conn=None):
+        if conn is not None:
+            return await conn.fetch(self.get_query(query_name), *params)
+        async with self.acquire() as conn:
+            return await conn.fetch(self.get_query(query_name), *params)
+
+    async def fetch_tuples(self, query_name, params, conn):
+        """(column names, rows as tuples); the names are known even when no row comes back"""
+        sql = self.get_query(query_name)
+        rows = await conn.fetch(sql, *params)
+        if rows:
+            return list(rows[0].keys()), [tuple(row) for row in rows]
+        # prepare() skips the statement cache, so it is only worth its round trip for an empty page
+        statement = await conn.prepare(sql)
+        return [attr.name for attr in statement.get_attributes()], []
+
+    async def fetchrow(self, query_name, params=()):
+        async with self.acquire() as conn:
+            return await conn.fetchrow(self.get_query(query_name), *params)
+
+    def pool_stats(self):
+        if self.pool is None:
+            return None
+        counters = dict(self.counters)
+        checkouts = counters["checkouts"]
+        return {
+            "min": self.pool.get_min_size(),
+            "max": self.pool.get_max_size(),
+            "size": self.pool.get_size(),
+            "idle": self.pool.get_idle_size(),
+            "checkouts": checkouts,
+            "waits": counters["waits"],
+            "wait_ms_avg": round(counters["wait_ms_total"] / checkouts, 3) if checkouts else None,
+            "wait_ms_max": round(counters["wait_ms_max"], 3),
+            "timeouts": counters["timeouts"],
+        }
+
+    async def close(self):
+        if self.pool is not None:
+            pool, self.pool, self.slots = self.pool, None, None
+            await pool.close()
+
+
+# Singleton instance - pools are bound to the event loop that created them
+async_db = AsyncDatabase()
@@ -0,0 +1,257 @@
+from app.api.utils.redis_client import redis_client
+from app.api.utils.database import get_db
+from app.api.utils.single_flight import single_flight
+from decimal import Decimal
+import datetime
+import functools
+import hashlib
+import inspect
+import json
+import os
+import select
+import threading
+
+CACHE_TTL = int(os.getenv("CACHE_TTL", "3600"))
+CACHE_PREFIX = "dashboard"
+# Postgres NOTIFY channel used to tell other processes (API workers, the ingest worker) to drop entries
+CACHE_CHANNEL = "dashboard_cache"
+# Payload prefix on the same channel asking processes with a local cache to warm a snapshot
+WARM_PREFIX = "warm:"
+
+
+class CacheStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.endpoints = {}
+        self.invalidations = 0
+
+    def record(self, endpoint, outcome):
+        with self.lock:
+            counters = self.endpoints.setdefault(endpoint, {"hits": 0, "misses": 0, "errors": 0})
+            counters[outcome] += 1
+
+    def snapshot(self):
+        with self.lock:
+            endpoints = {name: dict(counters) for name, counters in self.endpoints.items()}
+            invalidations = self.invalidations
+        hits = sum(counters["hits"] for counters in endpoints.values())
+        misses = sum(counters["misses"] for counters in endpoints.values())
+        stats = {
+            "enabled": redis_client.enabled,
+            "backend": redis_client.backend,
+            "ttl_seconds": CACHE_TTL,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 3) if hits + misses else None,
+            "invalidations": invalidations,
+            "endpoints": endpoints,
+            # Misses that waited for an identical in-flight computation instead of querying
+            "coalescing": single_flight.snapshot(),
+        }
+        if redis_client.backend == "lru":
+            stats["lru"] = redis_client.client.info()
+        return stats
+
+
+cache_stats = CacheStats()
+
+
+def _json_default(value):
+    # Same text FastAPI would render, so a cache hit returns the response a miss would
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def cache_key(endpoint, tndr_pk, filters: dict):
+    scope = "global" if tndr_pk is None else tndr_pk
+    digest = hashlib.sha1(json.dumps(filters, sort_keys=True, default=str).encode()).hexdigest()[:16]
+    return f"{CACHE_PREFIX}:{scope}:{endpoint}:{digest}"
+
+
+def _lookup(endpoint, key):
+    try:
+        raw = redis_client.get(key)
+    except Exception as e:
+        print(f"Cache read failed for {key}: {e}")
+        cache_stats.record(endpoint, "errors")
+        raw = None
+    if raw is not None:
+        cache_stats.record(endpoint, "hits")
+        return json.loads(raw)
+    cache_stats.record(endpoint, "misses")
+    return None
+
+
+def _store(endpoint, key, value, should_cache):
+    if should_cache is None or should_cache(value):
+        try:
+            redis_client.set(key, json.dumps(value, default=_json_default).encode(), ex=CACHE_TTL)
+        except Exception as e:
+            print(f"Cache write failed for {key}: {e}")
+            cache_stats.record(endpoint, "errors")
+
+
+def remember(endpoint, tndr_pk, filters: dict, compute, should_cache=None):
+    """Return the cached value for (endpoint, tndr_pk, filters), computing and storing it on a miss.
+
+    Concurrent misses on the same key share one computation (see single_flight).
+    """
+    key = cache_key(endpoint, tndr_pk, filters)
+    value = _lookup(endpoint, key)
+    if value is None:
+        def compute_and_store():
+            computed = compute()
+            _store(endpoint, key, computed, should_cache)
+            return computed
+        value = single_flight.do(endpoint, key, compute_and_store)
+    return value
+
+
+async def aremember(endpoint, tndr_pk, filters: dict, compute, should_cache=None):
+    """remember() for a coroutine function; shares entries with the sync callers of the same endpoint"""
+    key = cache_key(endpoint, tndr_pk, filters)
+    value = _lookup(endpoint, key)
+    if value is None:
+        async def compute_and_store():
+            computed = await compute()
+            _store(endpoint, key, computed, should_cache)
+            return computed
+        value = await single_flight.ado(endpoint, key, compute_and_store)
+    return value
+
+
+def _successful(result):
+    return isinstance(result, dict) and result.get("success")
+
+
+def cached(endpoint, case_insensitive=()):
+    """Cache successful results of a service method, keyed by endpoint, tndr_pk and normalized filters.
+
+    Works on async methods too; an async variant cached under the same endpoint shares its entries.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        def scope(self, args, kwargs):
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            filters = {}
+            for name, value in list(bound.arguments.items())[1:]:
+                if value == "":
+                    value = None
+                if name in case_insensitive and isinstance(value, str):
+                    value = value.lower()
+                filters[name] = value
+            return filters.pop("tndr_pk", None), filters
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                tndr_pk, filters = scope(self, args, kwargs)
+                return await aremember(endpoint, tndr_pk, filters, lambda: func(self, *args, **kwargs), _successful)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            tndr_pk, filters = scope(self, args, kwargs)
+            return remember(endpoint, tndr_pk, filters, lambda: func(self, *args, **kwargs), _successful)
+        return wrapper
+    return decorator
+
+
+def _notify(payload):
+    db = get_db()
+    conn = None
+    try:
+        conn = db.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT pg_notify(%s, %s)", (CACHE_CHANNEL, payload))
+        conn.commit()
+        cursor.close()
+    except Exception as e:
+        print(f"Error publishing cache invalidation: {e}")
+    finally:
+        if conn:
+            db.release_connection(conn)
+
+
+def _delete_prefix(prefix):
+    # A cache outage must not fail the ingest or delete that triggered the invalidation
+    try:
+        return redis_client.delete_prefix(prefix)
+    except Exception as e:
+        print(f"Cache invalidation failed for {prefix}*: {e}")
+        cache_stats.record("invalidation", "errors")
+        return 0
+
+
+def _drop_local(payload):
+    if payload == "*":
+        removed = _delete_prefix(f"{CACHE_PREFIX}:")
+    else:
+        # Snapshot lists change with any snapshot, so global entries go too
+        removed = _delete_prefix(f"{CACHE_PREFIX}:{payload}:")
+        removed += _delete_prefix(f"{CACHE_PREFIX}:global:")
+    with cache_stats.lock:
+        cache_stats.invalidations += 1
+    return removed
+
+
+def invalidate_snapshot(tndr_pk):
+    """Drop cached results for a snapshot here and, through NOTIFY, in every other process"""
+    removed = _drop_local(str(tndr_pk))
+    _notify(str(tndr_pk))
+    print(f"DEBUG cache: invalidated snapshot {tndr_pk} ({removed} entries)")
+    return removed
+
+
+def request_warmup(tndr_pk):
+    """Ask every API process listening on the channel to warm its own (LRU) cache for a snapshot"""
+    _notify(f"{WARM_PREFIX}{tndr_pk}")
+
+
+def clear_all():
+    removed = _drop_local("*")
+    _notify("*")
+    return removed
+
+
+def _listen(stop, on_warm):
+    while not stop.is_set():
+        conn = None
+        try:
+            conn = get_db().connect()
+            conn.autocommit = True
+            cursor = conn.cursor()
+            cursor.execute(f"LISTEN {CACHE_CHANNEL}")
+            while not stop.is_set():
+                if select.select([conn], [], [], 5) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    payload = conn.notifies.pop(0).payload
+                    if payload.startswith(WARM_PREFIX):
+                        if on_warm:
+                            on_warm(int(payload[len(WARM_PREFIX):]))
+                    else:
+                        _drop_local(payload)
+        except Exception as e:
+            print(f"Cache invalidation listener error: {e}")
+            stop.wait(5)
+        finally:
+            if conn:
+                conn.close()
+
+
+def start_invalidation_listener(on_warm=None):
+    """Only the per-process LRU needs this; Redis entries are shared and deleted directly.
+
+    on_warm(tndr_pk) is called for warm-up requests and must not block the listener.
+    """
+    stop = threading.Event()
+    if redis_client.enabled and redis_client.backend == "lru":
+        threading.Thread(target=_listen, args=(stop, on_warm), name="cache-invalidation", daemon=True).start()
+    return stop
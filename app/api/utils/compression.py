@@ -0,0 +1,45 @@
+"""
+Response compression: brotli for clients that accept it (when the brotli package is installed),
+gzip otherwise. Built on Starlette's GZipMiddleware so both share its minimum size, excluded
+content types and streaming handling.
+"""
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, IdentityResponder
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class BrotliResponder(IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(self, app, minimum_size, quality, *, exclude_content_types):
+        super().__init__(app, minimum_size, exclude_content_types=exclude_content_types)
+        self.quality = quality
+        self._compressor = None
+
+    async def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        if self._compressor is None:
+            self._compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=self.quality)
+        if more_body:
+            # Flush each chunk so a streamed response reaches the client as it is produced
+            return self._compressor.process(body) + self._compressor.flush()
+        return self._compressor.process(body) + self._compressor.finish()
+
+
+class CompressionMiddleware(GZipMiddleware):
+    def __init__(self, app, minimum_size=500, compresslevel=5, brotli_quality=4, **kwargs):
+        super().__init__(app, minimum_size=minimum_size, compresslevel=compresslevel, **kwargs)
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if brotli is not None and scope["type"] == "http":
+            accepted = {part.split(";")[0].strip() for part in Headers(scope=scope).get("Accept-Encoding", "").split(",")}
+            if "br" in accepted:
+                responder = BrotliResponder(self.app, self.minimum_size, self.brotli_quality,
+                                            exclude_content_types=self.exclude_content_types)
+                await responder(scope, receive, send)
+                return
+        await super().__call__(scope, receive, send)
@@ -0,0 +1,184 @@
+import threading
+import time
+
+import psycopg2
+from psycopg2 import extensions
+from psycopg2.pool import PoolError
+
+
+class PoolTimeout(PoolError):
+    """No connection became free within the checkout timeout"""
+
+
+class ConnectionPool:
+    """Thread-safe psycopg2 pool where callers wait (up to a timeout) for a free connection instead of failing at maxconn.
+
+    Connections idle for longer than check_idle seconds are pinged before reuse, and
+    connections older than max_age seconds are closed and replaced.
+    """
+
+    def __init__(self, minconn, maxconn, timeout=30.0, max_age=1800.0, check_idle=30.0, **conn_params):
+        if minconn < 0 or maxconn < 1 or minconn > maxconn:
+            raise ValueError(f"Invalid pool size: min={minconn} max={maxconn}")
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.max_age = max_age
+        self.check_idle = check_idle
+        self.conn_params = conn_params
+
+        self.cond = threading.Condition()
+        self.idle = []      # (conn, created, last_used), most recently used last
+        self.in_use = {}    # id(conn) -> created
+        self.size = 0       # open connections, including ones being opened
+        self.waiting = 0
+        self.closed = False
+        self.counters = {
+            "checkouts": 0, "waits": 0, "timeouts": 0, "created": 0,
+            "recycled": 0, "failed_checks": 0, "wait_ms_total": 0.0, "wait_ms_max": 0.0,
+        }
+
+        for _ in range(minconn):
+            self.idle.append((self._open(), time.monotonic(), time.monotonic()))
+            self.size += 1
+
+    def _open(self):
+        conn = psycopg2.connect(**self.conn_params)
+        with self.cond:
+            self.counters["created"] += 1
+        return conn
+
+    @staticmethod
+    def _close(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _usable(self, conn, created, last_used):
+        now = time.monotonic()
+        if conn.closed:
+            return False
+        if now - created > self.max_age:
+            with self.cond:
+                self.counters["recycled"] += 1
+            return False
+        if now - last_used > self.check_idle:
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                conn.rollback()
+            except Exception as e:
+                print(f"Dropping pooled connection that failed its health check: {e}")
+                with self.cond:
+                    self.counters["failed_checks"] += 1
+                return False
+        return True
+
+    def getconn(self, timeout=None):
+        started = time.monotonic()
+        deadline = started + (self.timeout if timeout is None else timeout)
+        waited = False
+        with self.cond:
+            while True:
+                if self.closed:
+                    raise PoolError("connection pool is closed")
+                if self.idle:
+                    entry = self.idle.pop()
+                    break
+                if self.size < self.maxconn:
+                    self.size += 1
+                    entry = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.counters["timeouts"] += 1
+                    raise PoolTimeout(f"No database connection free within {deadline - started:.1f}s (max {self.maxconn})")
+                waited = True
+                self.waiting += 1
+                self.cond.wait(remaining)
+                self.waiting -= 1
+
+        # Opening and health checks happen outside the lock; the slot is already reserved
+        try:
+            if entry is not None and self._usable(*entry):
+                conn, created = entry[0], entry[1]
+            else:
+                if entry is not None:
+                    self._close(entry[0])
+                conn, created = self._open(), time.monotonic()
+        except Exception:
+            with self.cond:
+                self.size -= 1
+                self.cond.notify()
+            raise
+
+        wait_ms = (time.monotonic() - started) * 1000
+        with self.cond:
+            self.in_use[id(conn)] = created
+            self.counters["checkouts"] += 1
+            self.counters["waits"] += waited
+            self.counters["wait_ms_total"] += wait_ms
+            self.counters["wait_ms_max"] = max(self.counters["wait_ms_max"], wait_ms)
+        return conn
+
+    def putconn(self, conn, close=False):
+        with self.cond:
+            created = self.in_use.pop(id(conn), None)
+        if created is None:
+            raise PoolError("trying to put unkeyed connection")
+
+        keep = not close and not conn.closed
+        if keep and conn.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+            # Same as psycopg2's pools: never hand out a connection mid-transaction
+            try:
+                conn.rollback()
+            except Exception:
+                keep = False
+        if keep and time.monotonic() - created > self.max_age:
+            keep = False
+            with self.cond:
+                self.counters["recycled"] += 1
+
+        with self.cond:
+            if keep and not self.closed:
+                self.idle.append((conn, created, time.monotonic()))
+            else:
+                self.size -= 1
+                keep = False
+            self.cond.notify()
+        if not keep:
+            self._close(conn)
+
+    def closeall(self):
+        with self.cond:
+            self.closed = True
+            idle, self.idle = self.idle, []
+            self.size -= len(idle)
+            self.cond.notify_all()
+        for conn, _, _ in idle:
+            self._close(conn)
+
+    def stats(self):
+        with self.cond:
+            counters = dict(self.counters)
+            stats = {
+                "min": self.minconn,
+                "max": self.maxconn,
+                "size": self.size,
+                "in_use": len(self.in_use),
+                "idle": len(self.idle),
+                "waiting": self.waiting,
+            }
+        checkouts = counters["checkouts"]
+        stats.update({
+            "checkouts": checkouts,
+            "waits": counters["waits"],
+            "wait_ms_avg": round(counters["wait_ms_total"] / checkouts, 3) if checkouts else None,
+            "wait_ms_max": round(counters["wait_ms_max"], 3),
+            "timeouts": counters["timeouts"],
+            "created": counters["created"],
+            "recycled": counters["recycled"],
+            "failed_checks": counters["failed_checks"],
+        })
+        return stats
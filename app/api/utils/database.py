@@ -1,6 +1,7 @@
 import psycopg2
-from psycopg2.pool import SimpleConnectionPool
+from app.api.utils.connection_pool import ConnectionPool
 import os
+import threading
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -15,40 +16,58 @@ else:
 class Database:
     def __init__(self):
         self.pool = None
+        self.pool_lock = threading.Lock()
     
+    def _connection_params(self):
+        # Get SSL mode
+        sslmode = os.getenv("PGSSLMODE", "prefer")
+        
+        # Build connection parameters
+        conn_params = {
+            "host": os.getenv("PGHOST", os.getenv("DB_HOST", "localhost")),
+            "port": os.getenv("PGPORT", os.getenv("DB_PORT", "5432")),
+            "database": os.getenv("PGDATABASE", os.getenv("DB_NAME", "mydb")),
+            "user": os.getenv("PGUSER", os.getenv("DB_USER", "postgres")),
+            "password": os.getenv("PGPASSWORD", os.getenv("DB_PASSWORD", "")),
+            "sslmode": sslmode,
+        }
+        
+        # Add channel binding if specified (required for Neon)
+        channel_binding = os.getenv("PGCHANNELBINDING")
+        if channel_binding:
+            conn_params["channel_binding"] = channel_binding
+        return conn_params
+
     def _initialize_pool(self):
-        if self.pool is None:
-            # Get SSL mode
-            sslmode = os.getenv("PGSSLMODE", "prefer")
-            
-            # Build connection parameters
-            conn_params = {
-                "host": os.getenv("PGHOST", os.getenv("DB_HOST", "localhost")),
-                "port": os.getenv("PGPORT", os.getenv("DB_PORT", "5432")),
-                "database": os.getenv("PGDATABASE", os.getenv("DB_NAME", "mydb")),
-                "user": os.getenv("PGUSER", os.getenv("DB_USER", "postgres")),
-                "password": os.getenv("PGPASSWORD", os.getenv("DB_PASSWORD", "")),
-                "sslmode": sslmode,
-            }
-            
-            # Add channel binding if specified (required for Neon)
-            channel_binding = os.getenv("PGCHANNELBINDING")
-            if channel_binding:
-                conn_params["channel_binding"] = channel_binding
-            
-            self.pool = SimpleConnectionPool(
-                minconn=1,
-                maxconn=10,
-                **conn_params
-            )
+        with self.pool_lock:
+            if self.pool is None:
+                # Endpoints and snapshot loads run on worker threads; callers wait for a free connection
+                self.pool = ConnectionPool(
+                    minconn=int(os.getenv("DB_MIN_CONNECTIONS", "1")),
+                    maxconn=int(os.getenv("DB_MAX_CONNECTIONS", "10")),
+                    timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+                    max_age=float(os.getenv("DB_CONN_MAX_AGE", "1800")),
+                    check_idle=float(os.getenv("DB_HEALTH_CHECK_IDLE", "30")),
+                    **self._connection_params()
+                )
     
-    def get_connection(self):
+    def connect(self):
+        """A dedicated connection outside the pool, for long-lived uses such as LISTEN"""
+        return psycopg2.connect(**self._connection_params())
+
+    def get_connection(self, timeout=None):
+        """Check out a pooled connection, waiting up to timeout (DB_POOL_TIMEOUT by default) for one to free up"""
         if self.pool is None:
             self._initialize_pool()
-        return self.pool.getconn()
+        return self.pool.getconn(timeout)
     
-    def release_connection(self, conn):
-        self.pool.putconn(conn)
+    def release_connection(self, conn, close=False):
+        self.pool.putconn(conn, close)
+
+    def pool_stats(self):
+        if self.pool is None:
+            return None
+        return self.pool.stats()
     
     def execute_query(self, query, params=None):
         conn = self.get_connection()
@@ -66,9 +85,11 @@ class Database:
 
 # Singleton instance - use get_db() to access
 _db_instance = None
+_db_lock = threading.Lock()
 
 def get_db():
     global _db_instance
-    if _db_instance is None:
-        _db_instance = Database()
+    with _db_lock:
+        if _db_instance is None:
+            _db_instance = Database()
     return _db_instance
@@ -0,0 +1,300 @@
+import os
+import struct
+import datetime
+import numpy as np
+import pandas as pd
+
+DBF_CHUNK_ROWS = int(os.getenv("DBF_CHUNK_ROWS", "50000"))
+
+# Language driver byte -> codec, same defaults dbfread uses for common codepages
+CODEPAGES = {
+    0x00: "ascii",
+    0x01: "cp437",
+    0x02: "cp850",
+    0x03: "cp1252",
+    0x57: "cp1252",
+    0x58: "cp1252",
+    0x59: "cp1252",
+    0x64: "cp852",
+    0x65: "cp866",
+    0x7D: "cp1255",
+    0x7E: "cp1256",
+    0xC8: "cp1250",
+    0xC9: "cp1251",
+    0xCA: "cp1254",
+    0xCB: "cp1253",
+}
+
+
+class DBFField:
+    def __init__(self, name, field_type, length, decimal_count):
+        self.name = name
+        self.type = field_type
+        self.length = length
+        self.decimal_count = decimal_count
+
+
+def read_exact(stream, size):
+    """Read exactly size bytes (or up to EOF) from a file-like or S3 body"""
+    parts = []
+    remaining = size
+    while remaining > 0:
+        data = stream.read(remaining)
+        if not data:
+            break
+        parts.append(data)
+        remaining -= len(data)
+    return b"".join(parts)
+
+
+def parse_header(stream, encoding=None):
+    """Parse the DBF table header and field descriptors, consuming exactly header_length bytes"""
+    head = read_exact(stream, 32)
+    if len(head) < 32:
+        raise ValueError("Not a DBF file: header is truncated")
+
+    num_records, header_length, record_length = struct.unpack("<IHH", head[4:12])
+    if header_length < 33 or record_length < 1:
+        raise ValueError("Not a DBF file: invalid header lengths")
+
+    encoding = encoding or os.getenv("DBF_ENCODING") or CODEPAGES.get(head[29], "ascii")
+    descriptors = read_exact(stream, header_length - 32)
+    if len(descriptors) < header_length - 32:
+        raise ValueError("Not a DBF file: field descriptors are truncated")
+
+    fields = []
+    for offset in range(0, len(descriptors) - 31, 32):
+        if descriptors[offset] == 0x0D:
+            break
+        raw = descriptors[offset:offset + 32]
+        name = raw[:11].split(b"\0")[0].decode(encoding)
+        fields.append(DBFField(name, chr(raw[11]), raw[16], raw[17]))
+
+    return {
+        "num_records": num_records,
+        "header_length": header_length,
+        "record_length": record_length,
+        "encoding": encoding,
+        "fields": fields,
+    }
+
+
+def _parse_value(field, data, encoding):
+    if field.type == "C":
+        return data.rstrip(b"\0 ").decode(encoding)
+    if field.type in ("N", "F"):
+        data = data.strip().strip(b"*")
+        try:
+            return int(data)
+        except ValueError:
+            if not data.strip():
+                return None
+            return float(data.replace(b",", b"."))
+    if field.type == "D":
+        if not data.strip(b"0 \0"):
+            return None
+        try:
+            return datetime.date(int(data[:4]), int(data[4:6]), int(data[6:8]))
+        except ValueError:
+            if not data.strip(b" 0"):
+                return None
+            raise
+    if field.type == "L":
+        if data in b"TtYy":
+            return True
+        if data in b"FfNn":
+            return False
+        return None
+    raise ValueError(f"Unsupported DBF field type {field.type!r} for field {field.name}")
+
+
+def record_dtype(fields, record_length):
+    """NumPy structured dtype that maps one fixed-width DBF record"""
+    names, formats, offsets = ["_deleted"], ["S1"], [0]
+    offset = 1
+    for index, field in enumerate(fields):
+        names.append(f"f{index}")
+        formats.append(f"S{field.length}")
+        offsets.append(offset)
+        offset += field.length
+    return np.dtype({"names": names, "formats": formats, "offsets": offsets, "itemsize": record_length})
+
+
+def _raw_bytes(column, length):
+    return np.ascontiguousarray(column).view(np.uint8).reshape(-1, length)
+
+
+_CHAR_TABLES = {}
+
+
+def _char_table(encoding):
+    """Byte -> code point table for single-byte codecs (plus undecodable bytes), None otherwise"""
+    if encoding not in _CHAR_TABLES:
+        table = np.zeros(256, dtype=np.uint32)
+        invalid = []
+        try:
+            for byte in range(256):
+                try:
+                    char = bytes([byte]).decode(encoding)
+                except UnicodeDecodeError:
+                    invalid.append(byte)
+                    continue
+                if len(char) != 1:
+                    raise LookupError(encoding)
+                table[byte] = ord(char)
+            entry = (table, np.array(invalid, dtype=np.uint8))
+        except LookupError:
+            entry = None
+        _CHAR_TABLES[encoding] = entry
+    return _CHAR_TABLES[encoding]
+
+
+def _decode_text(column, length, encoding):
+    entry = _char_table(encoding)
+    if entry is None:
+        decoded = np.char.decode(np.char.rstrip(column, b"\0 "), encoding)
+        return decoded.astype(object)
+
+    table, invalid = entry
+    raw = _raw_bytes(column, length)
+    if len(invalid) and np.isin(raw, invalid).any():
+        raise ValueError(f"Field data can't be decoded with {encoding}")
+    text = table[raw].view(f"U{length}").ravel()
+    return np.char.rstrip(text, " \0").astype(object)
+
+
+def _decode_numeric(column):
+    data = np.char.strip(np.char.strip(column), b"*")
+    blank = data == b""
+    if blank.all():
+        return np.full(len(data), None, dtype=object)
+
+    if (np.char.find(data, b",") >= 0).any():
+        data = np.char.replace(data, b",", b".")
+    if not blank.any():
+        is_integral = (
+            (np.char.find(data, b".") < 0)
+            & (np.char.find(data, b"e") < 0)
+            & (np.char.find(data, b"E") < 0)
+        )
+        if is_integral.all():
+            return data.astype(np.int64)
+        return data.astype(np.float64)
+    return np.where(blank, b"nan", data).astype(np.float64)
+
+
+def _decode_date(column):
+    raw = _raw_bytes(column, 8)
+    blank = np.char.strip(column, b"0 \0") == b""
+    digits = raw.astype(np.int64) - ord("0")
+    bad_digits = ((digits < 0) | (digits > 9)).any(axis=1) & ~blank
+    if bad_digits.any():
+        if (np.char.strip(column[bad_digits], b" 0") != b"").any():
+            raise ValueError("Invalid date value in DBF field")
+        blank = blank | bad_digits
+    digits = np.where(blank[:, None], 0, digits)
+
+    years = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+    months = digits[:, 4] * 10 + digits[:, 5]
+    days = digits[:, 6] * 10 + digits[:, 7]
+    years = np.where(blank, 1970, years)
+    months = np.where(blank, 1, months)
+    days = np.where(blank, 1, days)
+    if ((months < 1) | (months > 12) | (days < 1) | (years < 1)).any():
+        raise ValueError("Invalid date value in DBF field")
+
+    month_start = (years - 1970) * 12 + (months - 1)
+    dates = month_start.astype("datetime64[M]").astype("datetime64[D]") + (days - 1)
+    if (dates.astype("datetime64[M]") != month_start.astype("datetime64[M]")).any():
+        raise ValueError("Invalid date value in DBF field")
+
+    values = dates.astype(object)
+    values[blank] = None
+    return values
+
+
+def _decode_logical(column):
+    values = np.full(len(column), None, dtype=object)
+    values[np.isin(column, [b"T", b"t", b"Y", b"y"])] = True
+    values[np.isin(column, [b"F", b"f", b"N", b"n"])] = False
+    return values
+
+
+def decode_records(records, fields, encoding):
+    """Decode a structured record array into a DataFrame with column-wise operations"""
+    records = records[records["_deleted"] != b"*"]
+    columns = {}
+    for index, field in enumerate(fields):
+        column = records[f"f{index}"]
+        if field.type == "C":
+            columns[field.name] = _decode_text(column, field.length, encoding)
+        elif field.type in ("N", "F"):
+            columns[field.name] = _decode_numeric(column)
+        elif field.type == "D" and field.length == 8:
+            columns[field.name] = _decode_date(column)
+        elif field.type == "L":
+            columns[field.name] = _decode_logical(column)
+        else:
+            raw = _raw_bytes(column, field.length)
+            columns[field.name] = [_parse_value(field, bytes(value), encoding) for value in raw]
+    return pd.DataFrame(columns, columns=[field.name for field in fields])
+
+
+def read_dbf(path, encoding=None, chunk_rows=None):
+    """Decode a local DBF file into a DataFrame over a read-only memory map"""
+    with open(path, "rb") as f:
+        header = parse_header(f, encoding)
+        file_size = os.fstat(f.fileno()).st_size
+
+    fields = header["fields"]
+    record_length = header["record_length"]
+    available = max(file_size - header["header_length"], 0) // record_length
+    num_records = min(header["num_records"], available)
+    if num_records == 0:
+        return pd.DataFrame(columns=[field.name for field in fields])
+
+    records = np.memmap(
+        path,
+        dtype=record_dtype(fields, record_length),
+        mode="r",
+        offset=header["header_length"],
+        shape=(num_records,),
+    )
+    chunk_rows = chunk_rows or DBF_CHUNK_ROWS
+    frames = [
+        decode_records(records[start:start + chunk_rows], fields, header["encoding"])
+        for start in range(0, num_records, chunk_rows)
+    ]
+    return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+
+class DBFStreamReader:
+    """Reads a DBF table from a forward-only stream in fixed-size record chunks"""
+
+    def __init__(self, stream, encoding=None):
+        self.stream = stream
+        header = parse_header(stream, encoding)
+        self.num_records = header["num_records"]
+        self.record_length = header["record_length"]
+        self.encoding = header["encoding"]
+        self.fields = header["fields"]
+
+    @property
+    def field_names(self):
+        return [field.name for field in self.fields]
+
+    def iter_chunks(self, chunk_rows=None):
+        """Yield DataFrames of at most chunk_rows live records"""
+        chunk_rows = chunk_rows or DBF_CHUNK_ROWS
+        dtype = record_dtype(self.fields, self.record_length)
+        remaining = self.num_records
+        while remaining > 0:
+            batch = min(chunk_rows, remaining)
+            data = read_exact(self.stream, batch * self.record_length)
+            batch = len(data) // self.record_length
+            if batch == 0:
+                break
+            remaining -= batch
+
+            records = np.frombuffer(data, dtype=dtype, count=batch)
+            yield decode_records(records, self.fields, self.encoding)
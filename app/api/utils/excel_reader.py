@@ -0,0 +1,112 @@
+"""
+Streaming Excel reader: yields sheet rows as fixed-size DataFrame chunks instead of
+building the whole workbook in memory the way pd.read_excel does
+"""
+import datetime
+import os
+import openpyxl
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+try:
+    import python_calamine
+except ImportError:
+    python_calamine = None
+
+EXCEL_CHUNK_ROWS = int(os.getenv("EXCEL_CHUNK_ROWS", "50000"))
+# openpyxl streams rows in bounded memory; calamine is several times faster but holds the
+# whole sheet; pandas keeps the whole-sheet read_excel path. auto: openpyxl for .xlsx,
+# calamine (when installed) for .xls, which openpyxl cannot read
+EXCEL_ENGINE = os.getenv("EXCEL_ENGINE", "auto").lower()
+
+
+def resolve_engine(file_ext: str, engine=None):
+    engine = (engine or EXCEL_ENGINE).lower()
+    if engine == "auto":
+        engine = "openpyxl" if file_ext == '.xlsx' or python_calamine is None else "calamine"
+    if engine == "calamine" and python_calamine is None:
+        print("WARNING: python-calamine is not installed, falling back to openpyxl")
+        engine = "openpyxl"
+    if engine == "openpyxl" and file_ext == '.xls':
+        # openpyxl only reads .xlsx
+        engine = "pandas"
+    return engine
+
+
+def _openpyxl_cell(value):
+    # Same conversions pandas applies to openpyxl cells
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _calamine_cell(value):
+    # Same conversions pandas applies to calamine cells
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+        return pd.Timestamp(value)
+    return value
+
+
+class ExcelStreamReader:
+    """Reads the first sheet of a workbook row by row"""
+
+    def __init__(self, path: str, engine: str):
+        self.engine = engine
+        if engine == "calamine":
+            self.workbook = python_calamine.CalamineWorkbook.from_path(path)
+            rows = self.workbook.get_sheet_by_index(0).iter_rows()
+            convert = _calamine_cell
+        else:
+            self.workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+            rows = self.workbook.worksheets[0].iter_rows(values_only=True)
+            convert = _openpyxl_cell
+        self.rows = ([convert(value) for value in row] for row in rows)
+
+        header = next(self.rows, [])
+        while header and header[-1] == "":
+            header.pop()
+        self.header = header
+        self.width = len(header)
+        self.pending = self._next_data_rows()
+        self.columns = self._frame([]).columns.tolist() if header else []
+        self.is_empty = not self.pending
+
+    def _padded(self, row):
+        return (row + [""] * self.width)[:self.width]
+
+    def _next_data_rows(self):
+        """Blank rows up to and including the next non-blank one; [] at the end of the sheet"""
+        blanks = []
+        for row in self.rows:
+            row = self._padded(row)
+            if any(value != "" for value in row):
+                return blanks + [row]
+            blanks.append(row)
+        # Trailing blank rows are dropped, as read_excel does
+        return []
+
+    def _frame(self, rows):
+        # The parser read_excel hands sheet rows to, so NA strings, numeric text and
+        # duplicate or missing headers convert exactly as before
+        return TextParser([self.header] + rows, header=0).read()
+
+    def iter_chunks(self, chunk_rows=None):
+        """Yield DataFrames of about chunk_rows rows"""
+        chunk_rows = chunk_rows or EXCEL_CHUNK_ROWS
+        batch = []
+        rows = self.pending
+        while rows:
+            batch.extend(rows)
+            if len(batch) >= chunk_rows:
+                yield self._frame(batch)
+                batch = []
+            rows = self._next_data_rows()
+        if batch:
+            yield self._frame(batch)
+
+    def close(self):
+        self.workbook.close()
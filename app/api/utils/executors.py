@@ -0,0 +1,29 @@
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import functools
+import os
+
+# Bounded pool for loading snapshot files; each task checks out its own pooled connection
+INGEST_MAX_WORKERS = int(os.getenv("INGEST_MAX_WORKERS", "3"))
+
+# Dedicated pool for blocking work started from async endpoints (file reads, S3 transfers,
+# parsing, inserts), kept separate from the threadpool FastAPI uses for sync dashboard routes
+BLOCKING_MAX_WORKERS = int(os.getenv("BLOCKING_MAX_WORKERS", "8"))
+
+ingest_executor = ThreadPoolExecutor(max_workers=INGEST_MAX_WORKERS, thread_name_prefix="ingest")
+blocking_executor = ThreadPoolExecutor(max_workers=BLOCKING_MAX_WORKERS, thread_name_prefix="blocking")
+
+# Shared pool for S3 multipart part uploads, so parts of one file go up concurrently
+# while the next part is still being read from the request
+S3_UPLOAD_MAX_WORKERS = int(os.getenv("S3_UPLOAD_MAX_WORKERS", "16"))
+
+s3_part_executor = ThreadPoolExecutor(max_workers=S3_UPLOAD_MAX_WORKERS, thread_name_prefix="s3-part")
+
+# Post-ingest warm-ups run one at a time, off the ingest and request paths
+warmup_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="warmup")
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking call on the dedicated executor without stalling the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(blocking_executor, functools.partial(func, *args, **kwargs))
@@ -0,0 +1,216 @@
+"""
+Streaming export writers: each takes the column names and an iterator of row chunks
+(lists of tuples, as fetchmany returns them) and yields the encoded file piece by piece
+"""
+import csv
+import datetime
+import io
+import zipfile
+from decimal import Decimal
+from xml.sax.saxutils import escape
+
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.utils import get_column_letter
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# format -> (media type, file extension)
+EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", ".csv"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", ".xlsx"),
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+}
+
+XLSX_MAX_ROWS = 1048576
+
+
+def available_formats():
+    return [fmt for fmt in EXPORT_FORMATS if fmt != "parquet" or pyarrow is not None]
+
+
+def write_csv(columns, chunks, type_codes=None):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for rows in chunks:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back via drain(); tell() counts everything written"""
+
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        data = b"".join(self.parts)
+        self.parts = []
+        return data
+
+
+_XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '{sheets}</Types>'
+)
+_XLSX_SHEET_TYPE = ('<Override PartName="/xl/worksheets/sheet{n}.xml" '
+                    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>')
+_XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><sheets>{sheets}</sheets></workbook>'
+)
+_XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">{sheets}</Relationships>'
+)
+_XLSX_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_XLSX_SHEET_END = '</sheetData></worksheet>'
+
+
+def _xlsx_cell(ref, value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return f'<c r="{ref}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, Decimal)):
+        if value != value or value in (float("inf"), float("-inf")):
+            return ""
+        return f'<c r="{ref}"><v>{value}</v></c>'
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        value = value.isoformat()
+    # Control characters are legal in Postgres text but not in XML
+    text = escape(ILLEGAL_CHARACTERS_RE.sub("", str(value)))
+    return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_row(number, letters, values):
+    cells = "".join(_xlsx_cell(f"{letter}{number}", value) for letter, value in zip(letters, values))
+    return f'<row r="{number}">{cells}</row>'
+
+
+def write_xlsx(columns, chunks, type_codes=None):
+    """Worksheet XML with inline strings, zipped as it is written so bytes go out while rows arrive.
+
+    Keeps the sheets unstyled (dates as ISO text); a new sheet starts at Excel's row limit.
+    """
+    letters = [get_column_letter(i + 1) for i in range(len(columns))]
+    header = _xlsx_row(1, letters, columns)
+    sink = _ChunkSink()
+    archive = zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1)
+    sheets = 0
+    sheet, sheet_rows = None, XLSX_MAX_ROWS
+    try:
+        for rows in chunks:
+            parts = []
+            for row in rows:
+                if sheet_rows >= XLSX_MAX_ROWS:
+                    if sheet is not None:
+                        sheet.write("".join(parts).encode("utf-8") + _XLSX_SHEET_END.encode())
+                        sheet.close()
+                        parts = []
+                    sheets += 1
+                    sheet = archive.open(f"xl/worksheets/sheet{sheets}.xml", "w", force_zip64=True)
+                    parts.append(_XLSX_SHEET_START + header)
+                    sheet_rows = 1
+                sheet_rows += 1
+                parts.append(_xlsx_row(sheet_rows, letters, row))
+            sheet.write("".join(parts).encode("utf-8"))
+            yield sink.drain()
+        if sheet is None:
+            sheets = 1
+            sheet = archive.open("xl/worksheets/sheet1.xml", "w")
+            sheet.write((_XLSX_SHEET_START + header).encode("utf-8"))
+        sheet.write(_XLSX_SHEET_END.encode())
+        sheet.close()
+
+        numbers = range(1, sheets + 1)
+        archive.writestr("[Content_Types].xml", _XLSX_CONTENT_TYPES.format(
+            sheets="".join(_XLSX_SHEET_TYPE.format(n=n) for n in numbers)))
+        archive.writestr("_rels/.rels", _XLSX_ROOT_RELS)
+        archive.writestr("xl/workbook.xml", _XLSX_WORKBOOK.format(
+            sheets="".join(f'<sheet name="Sheet{n}" sheetId="{n}" r:id="rId{n}"/>' for n in numbers)))
+        archive.writestr("xl/_rels/workbook.xml.rels", _XLSX_WORKBOOK_RELS.format(sheets="".join(
+            f'<Relationship Id="rId{n}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+            f'Target="worksheets/sheet{n}.xml"/>' for n in numbers)))
+    finally:
+        archive.close()
+    yield sink.drain()
+
+
+def _parquet_column(type_code):
+    """(arrow type, value conversion) for a Postgres type OID; anything unlisted is exported as text"""
+    if type_code == 16:
+        return pyarrow.bool_(), None
+    if type_code in (20, 21, 23):
+        return pyarrow.int64(), None
+    if type_code in (700, 701):
+        return pyarrow.float64(), None
+    if type_code == 1700:
+        # numeric arrives as Decimal; the JSON endpoints serve it as float too
+        return pyarrow.float64(), float
+    if type_code == 1082:
+        return pyarrow.date32(), None
+    if type_code == 1114:
+        return pyarrow.timestamp("us"), None
+    if type_code == 1184:
+        return pyarrow.timestamp("us", tz="UTC"), None
+    return pyarrow.string(), str
+
+
+def write_parquet(columns, chunks, type_codes):
+    """One row group per chunk, flushed to the response as soon as it is encoded"""
+    if pyarrow is None:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+    types = [_parquet_column(code) for code in type_codes]
+    schema = pyarrow.schema([(name, arrow_type) for name, (arrow_type, _) in zip(columns, types)])
+    sink = _ChunkSink()
+    writer = pyarrow.parquet.ParquetWriter(sink, schema, compression="snappy")
+    try:
+        for rows in chunks:
+            arrays = []
+            for values, (arrow_type, convert) in zip(zip(*rows), types):
+                if convert is not None:
+                    values = [None if v is None else convert(v) for v in values]
+                arrays.append(pyarrow.array(values, type=arrow_type))
+            writer.write_table(pyarrow.Table.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+WRITERS = {"csv": write_csv, "xlsx": write_xlsx, "parquet": write_parquet}
@@ -0,0 +1,33 @@
+"""
+Opt-in fast JSON path for the dashboard listings: numerics arrive as float straight from the
+driver, rows are built from cursor tuples, and the response is rendered once with orjson
+instead of going through decimal_to_float and FastAPI's jsonable_encoder.
+layout=rows keeps the row objects; layout=columns sends {"columns": [...], "rows": [[...]]}
+"""
+import json
+
+import psycopg2.extensions
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# numeric -> float at fetch time, scoped to the cursor it is registered on
+FLOAT_NUMERIC = psycopg2.extensions.new_type(
+    psycopg2.extensions.DECIMAL.values, "FLOAT_NUMERIC",
+    lambda value, cursor: float(value) if value is not None else None
+)
+
+
+def float_numerics(cursor):
+    psycopg2.extensions.register_type(FLOAT_NUMERIC, cursor)
+    return cursor
+
+
+def render(result) -> Response:
+    if orjson is not None:
+        # Dates come out as ISO strings, as with FastAPI's encoder
+        return Response(orjson.dumps(result), media_type="application/json")
+    return Response(json.dumps(result, default=str).encode(), media_type="application/json")
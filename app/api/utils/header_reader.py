@@ -0,0 +1,24 @@
+"""Read only the column names of a DBF or Excel file, without loading its rows"""
+import struct
+import pandas as pd
+from app.api.utils.dbf_reader import parse_header
+
+
+def read_columns(stream, file_ext: str):
+    """Return (columns, has_rows) from the DBF field descriptors or the first Excel row"""
+    if file_ext == '.dbf':
+        header = parse_header(stream)
+        return [field.name for field in header["fields"]], header["num_records"] > 0
+    if file_ext in ['.xls', '.xlsx']:
+        # One data row is enough to tell an empty sheet apart; .xlsx is read with openpyxl in read-only mode
+        df = pd.read_excel(stream, nrows=1)
+        return df.columns.tolist(), not df.empty
+    raise ValueError("Unsupported file format")
+
+
+def dbf_header_length(prefix: bytes):
+    """Bytes needed to parse the DBF header, or None until the first 32 bytes are available"""
+    if len(prefix) < 32:
+        return None
+    return struct.unpack("<H", prefix[8:10])[0]
+
@@ -0,0 +1,107 @@
+"""
+HTTP conditional caching for snapshot-scoped dashboard endpoints. A loaded snapshot never
+changes (a reload creates a new tndr_pk), so a response is identified by the path, the query
+string and the time the snapshot was published: clients may keep it briefly, and revalidate
+with If-None-Match to get a body-less 304 without the endpoint running at all. Responses are
+private and must be revalidated once stale, so a deleted snapshot stops being served within
+HTTP_CACHE_MAX_AGE seconds.
+"""
+import hashlib
+import os
+from urllib.parse import parse_qsl
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "true").lower() == "true"
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "60"))
+# Bump when a response shape changes, so clients drop what they stored under the old one
+HTTP_CACHE_VERSION = os.getenv("HTTP_CACHE_VERSION", "1")
+
+
+def snapshot_etag(path, query_pairs, tndr_pk, published_at):
+    query = "&".join(f"{name}={value}" for name, value in sorted(query_pairs))
+    digest = hashlib.sha1(f"{HTTP_CACHE_VERSION}|{path}|{query}|{tndr_pk}|{published_at}".encode()).hexdigest()
+    # Weak: the same data may go out gzip, brotli or plain
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match, etag):
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:]
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+class SnapshotCacheMiddleware:
+    """ETag, Cache-Control and 304s for GET requests under path_prefix that carry a tndr_id.
+
+    Only snapshots whose ingest has finished (summary built) get headers; while files are
+    still loading the data can change and responses stay uncached. Error responses
+    ({"success": false, ...} or non-200) never get them.
+    """
+
+    def __init__(self, app, version_lookup, path_prefix="/api/dashboard/"):
+        self.app = app
+        self.version_lookup = version_lookup
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope, receive, send):
+        if (not HTTP_CACHE_ENABLED or scope["type"] != "http" or scope["method"] not in ("GET", "HEAD")
+                or not scope["path"].startswith(self.path_prefix)):
+            await self.app(scope, receive, send)
+            return
+
+        query_pairs = parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True)
+        tndr_id = dict(query_pairs).get("tndr_id", "")
+        if not tndr_id.isdigit():
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            version = await run_in_threadpool(self.version_lookup, int(tndr_id))
+        except Exception as e:
+            print(f"DEBUG http cache: version lookup failed for snapshot {tndr_id}: {e}")
+            version = None
+        if not version or not version.get("final"):
+            await self.app(scope, receive, send)
+            return
+
+        etag = snapshot_etag(scope["path"], query_pairs, int(tndr_id), version["published_at"])
+        cache_headers = [
+            (b"etag", etag.encode()),
+            (b"cache-control", f"private, max-age={HTTP_CACHE_MAX_AGE}, must-revalidate".encode()),
+        ]
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, etag):
+            await send({"type": "http.response.start", "status": 304, "headers": cache_headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        start = None
+
+        async def send_with_etag(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                if message["status"] != 200:
+                    await send(message)
+                    return
+                # Hold the headers until the body shows whether the service reported an error
+                start = message
+                return
+            if start is not None and message["type"] == "http.response.body":
+                message_start, start = start, None
+                if not message.get("body", b"").lstrip().startswith(b'{"success":false'):
+                    headers = MutableHeaders(scope=message_start)
+                    for name, value in cache_headers:
+                        headers[name.decode()] = value.decode()
+                await send(message_start)
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
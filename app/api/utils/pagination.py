@@ -0,0 +1,30 @@
+"""Keyset (cursor) pagination helpers for the project listing endpoints"""
+import base64
+import hashlib
+import json
+
+
+def split_key(row: dict, size: int):
+    """Pop the hidden _k columns off a result row, returning the sort key"""
+    return [row.pop(f"_k{i}") for i in range(size)]
+
+
+def _scope(endpoint, tndr_pk, filters):
+    raw = json.dumps([endpoint, tndr_pk, filters], sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode()).hexdigest()[:12]
+
+
+def encode_cursor(endpoint, tndr_pk, filters, key):
+    payload = json.dumps({"s": _scope(endpoint, tndr_pk, filters), "k": key}, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token, endpoint, tndr_pk, filters):
+    """Sort key the token continues from, or None if it is malformed or was issued for other filters"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except Exception:
+        return None
+    if not isinstance(payload, dict) or payload.get("s") != _scope(endpoint, tndr_pk, filters):
+        return None
+    return payload.get("k")
@@ -0,0 +1,212 @@
+import io
+import struct
+import numpy as np
+import pandas as pd
+from psycopg2.extensions import encodings
+
+# PGCOPY binary signature, flags field and header extension length
+BINARY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+BINARY_TRAILER = struct.pack(">h", -1)
+
+_TEXT_ESCAPES = str.maketrans({
+    "\\": "\\\\",
+    "\t": "\\t",
+    "\n": "\\n",
+    "\r": "\\r",
+})
+
+
+def _as_int(value):
+    if isinstance(value, int):
+        return value
+    return int(round(float(value)))
+
+
+def _encode_text_value(value, column_type):
+    if value is None:
+        return "\\N"
+    if column_type in ("int4", "int8"):
+        return str(_as_int(value))
+    if column_type == "float8":
+        return repr(float(value))
+    return str(value).translate(_TEXT_ESCAPES)
+
+
+def _encode_binary_value(value, column_type, codec):
+    if value is None:
+        return struct.pack(">i", -1)
+    if column_type == "int4":
+        return struct.pack(">ii", 4, _as_int(value))
+    if column_type == "int8":
+        return struct.pack(">iq", 8, _as_int(value))
+    if column_type == "float8":
+        return struct.pack(">id", 8, float(value))
+    data = str(value).encode(codec)
+    return struct.pack(">i", len(data)) + data
+
+
+def _is_datetime(column):
+    return pd.api.types.is_datetime64_any_dtype(column)
+
+
+def _format_distinct(values, formatter, missing_value):
+    """Format each distinct value once and broadcast the strings back with a take"""
+    codes, uniques = pd.factorize(values)
+    formatted = np.array([formatter(value) for value in uniques] + [missing_value], dtype=object)
+    return formatted[codes]
+
+
+def _timestamp_text(value):
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def null_masked(frame, column_types):
+    """Return a frame whose values psycopg2 can adapt directly, with NaN/NaT as None"""
+    columns = {}
+    for index, column_type in enumerate(column_types):
+        column = frame.iloc[:, index]
+        if column_type == "text" and _is_datetime(column):
+            # Same text Postgres stores when a timestamp is cast to varchar
+            column = pd.Series(_format_distinct(column, _timestamp_text, None), index=frame.index)
+        missing = column.isna()
+        if missing.any():
+            column = column.astype(object).where(~missing, None)
+        columns[index] = column
+    return pd.DataFrame(columns, index=frame.index)
+
+
+def _numeric(column, column_type):
+    """pd.to_numeric that fails, like _as_int/float() and the batch loader, on values it cannot convert"""
+    coerced = pd.to_numeric(column, errors="coerce")
+    invalid = coerced.isna() & ~column.isna()
+    if invalid.any():
+        sample = column[invalid].iloc[0]
+        raise ValueError(
+            f"Column {column.name!r}: {int(invalid.sum())} value(s) are not valid {column_type}, e.g. {sample!r}"
+        )
+    return coerced
+
+
+def _text_values(column, column_type):
+    """Render one DataFrame column as COPY text values, NULLs as \\N"""
+    if column_type in ("int4", "int8"):
+        if not pd.api.types.is_integer_dtype(column):
+            # Non-integers round, as _as_int and Postgres' numeric -> integer cast do
+            column = _numeric(column, column_type).round().astype("Int64")
+        return _format_distinct(column, str, "\\N")
+    if column_type == "float8":
+        column = _numeric(column, column_type).astype("float64")
+        return _format_distinct(column, repr, "\\N")
+    if _is_datetime(column):
+        return _format_distinct(column, _timestamp_text, "\\N")
+
+    missing = column.isna().to_numpy()
+    values = list(map(str, column.tolist()))
+    joined = "".join(values)
+    if any(char in joined for char in "\\\t\n\r"):
+        values = [value.translate(_TEXT_ESCAPES) for value in values]
+    values = np.array(values, dtype=object)
+    values[missing] = "\\N"
+    return values
+
+
+def encode_text_frame(frame, column_types, codec="utf-8"):
+    """Encode a prepared DataFrame as one COPY text payload, formatting column by column"""
+    if frame.empty:
+        return b""
+    columns = [_text_values(frame.iloc[:, index], column_type).tolist() for index, column_type in enumerate(column_types)]
+    return ("\n".join(map("\t".join, zip(*columns))) + "\n").encode(codec)
+
+
+class RowStream(io.RawIOBase):
+    """Read-only file object that pulls encoded COPY data from an iterator of byte chunks"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = bytearray()
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        while size is None or size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size is None or size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
+def copy_rows(cursor, copy_sql, rows, column_types, copy_format="text", batch_rows=1000):
+    """Stream rows into Postgres with COPY ... FROM STDIN and return the row count"""
+    codec = encodings.get(cursor.connection.encoding, "utf-8")
+    count = 0
+
+    def text_chunks():
+        nonlocal count
+        lines = []
+        for row in rows:
+            lines.append("\t".join(
+                _encode_text_value(value, column_type)
+                for value, column_type in zip(row, column_types)
+            ))
+            count += 1
+            if len(lines) >= batch_rows:
+                yield ("\n".join(lines) + "\n").encode(codec)
+                lines = []
+        if lines:
+            yield ("\n".join(lines) + "\n").encode(codec)
+
+    def binary_chunks():
+        nonlocal count
+        yield BINARY_HEADER
+        field_count = struct.pack(">h", len(column_types))
+        parts = []
+        for row in rows:
+            parts.append(field_count)
+            parts.extend(
+                _encode_binary_value(value, column_type, codec)
+                for value, column_type in zip(row, column_types)
+            )
+            count += 1
+            if count % batch_rows == 0:
+                yield b"".join(parts)
+                parts = []
+        parts.append(BINARY_TRAILER)
+        yield b"".join(parts)
+
+    if copy_format == "binary":
+        chunks = binary_chunks()
+    elif copy_format == "text":
+        chunks = text_chunks()
+    else:
+        raise ValueError(f"Unsupported COPY format: {copy_format}")
+
+    cursor.copy_expert(f"{copy_sql} WITH (FORMAT {copy_format})", RowStream(chunks))
+    return count
+
+
+def copy_frames(cursor, copy_sql, frames, column_types, copy_format="text"):
+    """COPY an iterable of prepared DataFrames and return the row count"""
+    if copy_format != "text":
+        def frame_rows():
+            for frame in frames:
+                yield from frame.itertuples(index=False, name=None)
+
+        return copy_rows(cursor, copy_sql, frame_rows(), column_types, copy_format=copy_format)
+
+    codec = encodings.get(cursor.connection.encoding, "utf-8")
+    count = 0
+
+    def text_chunks():
+        nonlocal count
+        for frame in frames:
+            count += len(frame)
+            yield encode_text_frame(frame, column_types, codec)
+
+    cursor.copy_expert(f"{copy_sql} WITH (FORMAT text)", RowStream(text_chunks()))
+    return count
@@ -0,0 +1,114 @@
+from app.api.utils.query_loader import query_loader
+import os
+import re
+import threading
+import time
+import weakref
+
+import psycopg2
+
+# Session-level PREPARE does not survive transaction-mode poolers (e.g. PgBouncer); turn it off there
+PREPARE_ENABLED = os.getenv("DB_PREPARE_STATEMENTS", "true").lower() == "true"
+
+
+class PreparedQueries:
+    """Runs queries.properties entries as server-side prepared statements, prepared once per pooled connection"""
+
+    def __init__(self, loader):
+        self.loader = loader
+        self.lock = threading.Lock()
+        # connection -> names prepared on it; entries go away with the connection
+        self.prepared = weakref.WeakKeyDictionary()
+        self.stats = {}
+
+    @staticmethod
+    def statement_name(query_name):
+        return re.sub(r"\W", "_", query_name.replace("query.", "", 1))
+
+    @staticmethod
+    def to_positional(sql):
+        """%s placeholders -> $1..$n, %% -> %"""
+        counter = iter(range(1, sql.count("%s") + 1))
+        return re.sub(r"%([%s])", lambda m: "%" if m.group(1) == "%" else f"${next(counter)}", sql)
+
+    def _record(self, query_name, prepared, elapsed):
+        with self.lock:
+            counters = self.stats.setdefault(query_name, {"executions": 0, "prepares": 0, "total_ms": 0.0})
+            counters["executions"] += 1
+            counters["prepares"] += prepared
+            counters["total_ms"] += elapsed * 1000
+
+    def execute(self, cursor, query_name, params=()):
+        sql = self.loader.get_query(query_name)
+        if sql is None:
+            raise KeyError(f"Query not found: {query_name}")
+        started = time.perf_counter()
+        if not PREPARE_ENABLED:
+            cursor.execute(sql, params)
+            self._record(query_name, 0, time.perf_counter() - started)
+            return cursor
+
+        conn = cursor.connection
+        name = self.statement_name(query_name)
+        execute_sql = f"EXECUTE {name}" + (f" ({', '.join(['%s'] * len(params))})" if params else "")
+        with self.lock:
+            names = self.prepared.setdefault(conn, set())
+        # Work the caller already did in this transaction must survive a retry, so it gets a savepoint
+        in_transaction = conn.info.transaction_status == psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+        prepared = 0
+        for attempt in range(2):
+            if name not in names:
+                # PREPARE is not transactional, so it outlives the caller's rollback or commit
+                cursor.execute(f"PREPARE {name} AS {self.to_positional(sql)}")
+                names.add(name)
+                prepared += 1
+            if in_transaction:
+                cursor.execute("SAVEPOINT prepared_execute")
+            try:
+                cursor.execute(execute_sql, params)
+            except psycopg2.errors.InvalidSqlStatementName:
+                # The session lost its statements (DISCARD ALL, server-side reset): prepare again
+                if in_transaction:
+                    cursor.execute("ROLLBACK TO SAVEPOINT prepared_execute")
+                else:
+                    conn.rollback()
+                names.clear()
+                if attempt:
+                    raise
+                continue
+            if in_transaction:
+                # On its own cursor, so the caller's cursor keeps the EXECUTE's rows
+                with conn.cursor() as release:
+                    release.execute("RELEASE SAVEPOINT prepared_execute")
+            break
+        self._record(query_name, prepared, time.perf_counter() - started)
+        return cursor
+
+    def snapshot(self, cursor=None):
+        with self.lock:
+            statements = {name: dict(counters) for name, counters in self.stats.items()}
+            connections = len(self.prepared)
+        executions = sum(counters["executions"] for counters in statements.values())
+        prepares = sum(counters["prepares"] for counters in statements.values())
+        for counters in statements.values():
+            counters["avg_ms"] = round(counters.pop("total_ms") / counters["executions"], 3)
+        stats = {
+            "prepare_enabled": PREPARE_ENABLED,
+            "connections": connections,
+            "executions": executions,
+            "prepares": prepares,
+            # Executions that reused a statement already prepared (and possibly planned) on their connection
+            "reuse_ratio": round((executions - prepares) / executions, 3) if executions else None,
+            "statements": statements,
+        }
+        if cursor is not None and PREPARE_ENABLED:
+            # Plan counters are per session, so this shows the one pooled connection the request got
+            cursor.execute("SELECT name, generic_plans, custom_plans FROM pg_prepared_statements ORDER BY name")
+            stats["sample_connection_plans"] = {
+                name: {"generic_plans": generic, "custom_plans": custom} for name, generic, custom in cursor.fetchall()
+            }
+        return stats
+
+
+# Singleton instance
+prepared_queries = PreparedQueries(query_loader)
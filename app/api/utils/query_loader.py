@@ -11,8 +11,15 @@ class QueryLoader:
             raise FileNotFoundError(f"Properties file not found: {file_path}")
         
         with open(file_path, 'r') as f:
+            pending = ""
             for line in f:
                 line = line.strip()
+                # A trailing backslash continues the entry on the next line, as in Java .properties
+                if line.endswith('\\') and (pending or (line and not line.startswith('#'))):
+                    pending += line[:-1]
+                    continue
+                line = pending + line
+                pending = ""
                 if line and not line.startswith('#'):
                     if '=' in line:
                         key, value = line.split('=', 1)
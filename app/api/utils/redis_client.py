@@ -1,31 +1,149 @@
 import redis
 import os
+import threading
+import time
+from collections import OrderedDict
+from dotenv import load_dotenv
+
+load_dotenv('app/.env')
+
+
+class LRUStore:
+    """In-process fallback with the subset of the Redis API the cache uses, bounded by total value bytes"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def _drop(self, key):
+        value, _ = self.entries.pop(key)
+        self.size -= len(value)
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires is not None and expires < time.monotonic():
+                self._drop(key)
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ex=None):
+        if len(value) > self.max_bytes:
+            return False
+        with self.lock:
+            if key in self.entries:
+                self._drop(key)
+            self.entries[key] = (value, time.monotonic() + ex if ex else None)
+            self.size += len(value)
+            while self.size > self.max_bytes:
+                self._drop(next(iter(self.entries)))
+                self.evictions += 1
+        return True
+
+    def delete(self, *keys):
+        with self.lock:
+            deleted = 0
+            for key in keys:
+                if key in self.entries:
+                    self._drop(key)
+                    deleted += 1
+            return deleted
+
+    def exists(self, key):
+        return self.get(key) is not None
+
+    def scan_iter(self, match=None):
+        prefix = match.rstrip("*") if match else ""
+        with self.lock:
+            return [key for key in self.entries if key.startswith(prefix)]
+
+    def flushdb(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+        return True
+
+    def info(self):
+        with self.lock:
+            return {"entries": len(self.entries), "bytes": self.size, "max_bytes": self.max_bytes, "evictions": self.evictions}
+
+    def close(self):
+        pass
+
 
 class RedisClient:
     def __init__(self):
-        # Redis is disabled
-        self.enabled = False
+        # Redis when REDIS_URL/REDIS_HOST is set and reachable, otherwise a per-process LRU
+        self.enabled = os.getenv("CACHE_ENABLED", "true").lower() == "true"
         self.client = None
-        print("Redis caching is disabled.")
-    
+        self.backend = "lru"
+
+        redis_url = os.getenv("REDIS_URL")
+        redis_host = os.getenv("REDIS_HOST")
+        if self.enabled and (redis_url or redis_host):
+            try:
+                if redis_url:
+                    client = redis.Redis.from_url(redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+                else:
+                    client = redis.Redis(
+                        host=redis_host,
+                        port=int(os.getenv("REDIS_PORT", "6379")),
+                        db=int(os.getenv("REDIS_DB", "0")),
+                        password=os.getenv("REDIS_PASSWORD") or None,
+                        socket_timeout=0.5,
+                        socket_connect_timeout=0.5
+                    )
+                client.ping()
+                self.client = client
+                self.backend = "redis"
+            except Exception as e:
+                print(f"Redis unavailable ({e}), using in-process cache")
+
+        if self.client is None:
+            self.client = LRUStore(int(os.getenv("CACHE_LRU_MAX_MB", "64")) * 1024 * 1024)
+        print(f"Caching {'enabled' if self.enabled else 'disabled'} (backend: {self.backend})")
+
     def get(self, key):
-        return None
-    
+        if not self.enabled:
+            return None
+        return self.client.get(key)
+
     def set(self, key, value, ex=None):
-        return False
-    
+        if not self.enabled:
+            return False
+        return self.client.set(key, value, ex=ex)
+
     def delete(self, key):
-        return False
-    
+        if not self.enabled:
+            return False
+        return bool(self.client.delete(key))
+
+    def delete_prefix(self, prefix):
+        """Delete every key starting with prefix; returns how many were removed"""
+        if not self.enabled:
+            return 0
+        keys = list(self.client.scan_iter(match=f"{prefix}*"))
+        return self.client.delete(*keys) if keys else 0
+
     def exists(self, key):
-        return False
-    
+        if not self.enabled:
+            return False
+        return bool(self.client.exists(key))
+
     def flushdb(self):
-        return False
-    
+        if not self.enabled:
+            return False
+        return self.client.flushdb()
+
     def close(self):
-        pass
+        self.client.close()
 
 # Singleton instance
 redis_client = RedisClient()
-
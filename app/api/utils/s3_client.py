@@ -1,18 +1,155 @@
 import boto3
+import io
 import os
+import time
+from concurrent.futures import wait, FIRST_COMPLETED
 from dotenv import load_dotenv
 from io import BytesIO
+from app.api.utils.executors import s3_part_executor
 
 # Load environment variables
 load_dotenv('app/.env')
 
+# S3 requires every part except the last to be at least 5MB
+S3_PART_SIZE = max(int(os.getenv("S3_PART_SIZE_MB", "8")), 5) * 1024 * 1024
+# S3 caps a multipart upload at 10000 parts
+S3_MAX_PARTS = 10000
+# Lifetime of presigned part URLs handed to clients
+S3_PRESIGN_EXPIRES = int(os.getenv("S3_PRESIGN_EXPIRES", "3600"))
+# Parts of a single upload allowed in flight at once; bounds memory to roughly this many parts per file
+S3_MAX_INFLIGHT_PARTS = int(os.getenv("S3_MAX_INFLIGHT_PARTS", "4"))
+
+
+class S3RangeReader(io.RawIOBase):
+    """Seekable read-only view of an S3 object that only fetches the byte ranges that are read"""
+
+    def __init__(self, client, bucket_name, object_name, size):
+        self.client = client
+        self.bucket_name = bucket_name
+        self.object_name = object_name
+        self.size = size
+        self.position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += self.size
+        self.position = max(offset, 0)
+        return self.position
+
+    def readinto(self, buffer):
+        if self.position >= self.size or len(buffer) == 0:
+            return 0
+        end = min(self.position + len(buffer), self.size) - 1
+        response = self.client.get_object(
+            Bucket=self.bucket_name, Key=self.object_name, Range=f"bytes={self.position}-{end}"
+        )
+        data = response["Body"].read()
+        buffer[:len(data)] = data
+        self.position += len(data)
+        return len(data)
+
+
+class MultipartStreamUploader:
+    """Write bytes into an S3 multipart upload, sending each part as soon as it fills"""
+
+    def __init__(self, client, bucket_name, object_name, part_size=S3_PART_SIZE, max_inflight=S3_MAX_INFLIGHT_PARTS):
+        self.client = client
+        self.bucket_name = bucket_name
+        self.object_name = object_name
+        self.part_size = part_size
+        self.max_inflight = max_inflight
+        self.buffer = bytearray()
+        self.upload_id = None
+        self.futures = []
+        self.bytes_written = 0
+        self.started = time.perf_counter()
+
+    def _upload_part(self, part_number, body):
+        response = self.client.upload_part(
+            Bucket=self.bucket_name,
+            Key=self.object_name,
+            UploadId=self.upload_id,
+            PartNumber=part_number,
+            Body=body
+        )
+        return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+    def _submit(self, body):
+        if self.upload_id is None:
+            response = self.client.create_multipart_upload(Bucket=self.bucket_name, Key=self.object_name)
+            self.upload_id = response["UploadId"]
+        part_number = len(self.futures) + 1
+        self.futures.append(s3_part_executor.submit(self._upload_part, part_number, body))
+
+        # Back-pressure: stop reading until a slot frees up, and surface failed parts early
+        pending = [f for f in self.futures if not f.done()]
+        if len(pending) >= self.max_inflight:
+            wait(pending, return_when=FIRST_COMPLETED)
+        for future in self.futures:
+            if future.done() and future.exception():
+                raise future.exception()
+
+    def write(self, data):
+        self.buffer.extend(data)
+        self.bytes_written += len(data)
+        while len(self.buffer) >= self.part_size:
+            body = bytes(self.buffer[:self.part_size])
+            del self.buffer[:self.part_size]
+            self._submit(body)
+
+    def complete(self):
+        """Flush the tail and finish the upload; files smaller than one part go up in a single PUT"""
+        if self.upload_id is None:
+            self.client.put_object(Bucket=self.bucket_name, Key=self.object_name, Body=bytes(self.buffer))
+        else:
+            if self.buffer:
+                self._submit(bytes(self.buffer))
+            parts = [future.result() for future in self.futures]
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=self.object_name,
+                UploadId=self.upload_id,
+                MultipartUpload={"Parts": parts}
+            )
+        self.buffer = bytearray()
+        seconds = time.perf_counter() - self.started
+        return {
+            "size_bytes": self.bytes_written,
+            "parts": max(len(self.futures), 1),
+            "seconds": round(seconds, 3),
+            "mb_per_sec": round(self.bytes_written / (1024 * 1024) / seconds, 2) if seconds > 0 else None
+        }
+
+    def abort(self):
+        if self.upload_id is None:
+            return
+        wait(self.futures)
+        try:
+            self.client.abort_multipart_upload(Bucket=self.bucket_name, Key=self.object_name, UploadId=self.upload_id)
+        except Exception as e:
+            print(f"Error aborting multipart upload: {e}")
+
+
 class S3Client:
     def __init__(self):
         self.client = boto3.client(
             's3',
             aws_access_key_id=os.getenv("AWS_ACCESS_KEY"),
             aws_secret_access_key=os.getenv("AWS_SECRET_KEY"),
-            region_name=os.getenv("REGION_NAME", "us-east-1")
+            region_name=os.getenv("REGION_NAME", "us-east-1"),
+            # Point at MinIO or a moto server for local testing
+            endpoint_url=os.getenv("S3_ENDPOINT_URL") or None
         )
         self.bucket_name = os.getenv("BUCKET_NAME")
     
@@ -44,6 +181,88 @@ class S3Client:
             print(f"Error uploading file: {e}")
             return False
     
+    def open_upload(self, object_name):
+        return MultipartStreamUploader(self.client, self.bucket_name, object_name)
+
+    def upload_stream(self, fileobj, object_name, read_size=1024 * 1024):
+        """Pipe a file-like object into S3 without spooling it to disk; returns throughput stats or None"""
+        uploader = self.open_upload(object_name)
+        try:
+            while chunk := fileobj.read(read_size):
+                uploader.write(chunk)
+            stats = uploader.complete()
+            print(f"DEBUG upload_stream: {object_name} {stats['size_bytes']} bytes in "
+                  f"{stats['parts']} parts, {stats['mb_per_sec']} MB/s")
+            return stats
+        except Exception as e:
+            print(f"Error streaming upload: {e}")
+            uploader.abort()
+            return None
+
+    def create_multipart_upload(self, object_name, metadata=None):
+        try:
+            response = self.client.create_multipart_upload(
+                Bucket=self.bucket_name, Key=object_name, Metadata=metadata or {}
+            )
+            return response["UploadId"]
+        except Exception as e:
+            print(f"Error creating multipart upload: {e}")
+            return None
+
+    def presign_part_urls(self, object_name, upload_id, part_numbers, expires=S3_PRESIGN_EXPIRES):
+        """Signed locally, no S3 round trip per part"""
+        return [
+            {
+                "part_number": part_number,
+                "url": self.client.generate_presigned_url(
+                    "upload_part",
+                    Params={
+                        "Bucket": self.bucket_name,
+                        "Key": object_name,
+                        "UploadId": upload_id,
+                        "PartNumber": part_number
+                    },
+                    ExpiresIn=expires
+                )
+            }
+            for part_number in part_numbers
+        ]
+
+    def complete_multipart_upload(self, object_name, upload_id, parts):
+        try:
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=object_name,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": [
+                    {"PartNumber": part["part_number"], "ETag": part["etag"]}
+                    for part in sorted(parts, key=lambda part: part["part_number"])
+                ]}
+            )
+            return True
+        except Exception as e:
+            print(f"Error completing multipart upload: {e}")
+            return False
+
+    def abort_multipart_upload(self, object_name, upload_id):
+        try:
+            self.client.abort_multipart_upload(Bucket=self.bucket_name, Key=object_name, UploadId=upload_id)
+            return True
+        except Exception as e:
+            print(f"Error aborting multipart upload: {e}")
+            return False
+
+    def head_object(self, object_name):
+        try:
+            return self.client.head_object(Bucket=self.bucket_name, Key=object_name)
+        except Exception as e:
+            print(f"Error reading object metadata: {e}")
+            return None
+
+    def open_range_reader(self, object_name, size, buffer_size=256 * 1024):
+        """Random access to an object through ranged GETs, e.g. to read just a file header"""
+        return io.BufferedReader(S3RangeReader(self.client, self.bucket_name, object_name, size), buffer_size)
+
     def download_file(self, object_name, file_path):
         try:
             self.client.download_file(self.bucket_name, object_name, file_path)
@@ -61,6 +280,15 @@ class S3Client:
             print(f"Error streaming file: {e}")
             return None
     
+    def get_file_body(self, object_name):
+        """Return the unbuffered S3 response body so callers can read it in chunks"""
+        try:
+            response = self.client.get_object(Bucket=self.bucket_name, Key=object_name)
+            return response['Body']
+        except Exception as e:
+            print(f"Error opening file stream: {e}")
+            return None
+
     def delete_file(self, object_name):
         try:
             self.client.delete_object(Bucket=self.bucket_name, Key=object_name)
@@ -0,0 +1,95 @@
+"""
+Request coalescing for dashboard cache misses: while one caller computes a key, identical
+callers wait for its result instead of running the same query on another pooled connection.
+"""
+import asyncio
+import concurrent.futures
+import os
+import threading
+
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+
+
+class SingleFlight:
+    """One execution per key at a time; sync callers share it across threads, async callers within their event loop"""
+
+    def __init__(self, enabled=SINGLE_FLIGHT_ENABLED):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.async_calls = {}
+        self.endpoints = {}
+
+    def _join(self, calls, key, endpoint, new_future):
+        """(future, is_leader) for key, registering a new flight if none is running"""
+        with self.lock:
+            counters = self.endpoints.setdefault(endpoint, {"executions": 0, "coalesced": 0})
+            future = calls.get(key)
+            if future is not None:
+                counters["coalesced"] += 1
+                return future, False
+            counters["executions"] += 1
+            future = calls[key] = new_future()
+            return future, True
+
+    def _leave(self, calls, key):
+        with self.lock:
+            calls.pop(key, None)
+
+    def do(self, endpoint, key, compute):
+        if not self.enabled:
+            return compute()
+        future, leader = self._join(self.calls, key, endpoint, concurrent.futures.Future)
+        if not leader:
+            return future.result()
+        try:
+            value = compute()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._leave(self.calls, key)
+        future.set_result(value)
+        return value
+
+    async def ado(self, endpoint, key, compute):
+        if not self.enabled:
+            return await compute()
+        loop = asyncio.get_running_loop()
+        future, leader = self._join(self.async_calls, (id(loop), key), endpoint, loop.create_future)
+        if not leader:
+            # shield: a follower that goes away must not cancel the leader's result for the others
+            return await asyncio.shield(future)
+        try:
+            value = await compute()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Mark it retrieved so a flight without followers does not log "exception never retrieved"
+                future.exception()
+            raise
+        finally:
+            self._leave(self.async_calls, (id(loop), key))
+        future.set_result(value)
+        return value
+
+    def snapshot(self):
+        with self.lock:
+            endpoints = {name: dict(counters) for name, counters in self.endpoints.items()}
+            in_flight = len(self.calls) + len(self.async_calls)
+        executions = sum(counters["executions"] for counters in endpoints.values())
+        coalesced = sum(counters["coalesced"] for counters in endpoints.values())
+        return {
+            "enabled": self.enabled,
+            "executions": executions,
+            "coalesced": coalesced,
+            "coalesced_ratio": round(coalesced / (executions + coalesced), 3) if executions + coalesced else None,
+            "in_flight": in_flight,
+            "endpoints": endpoints,
+        }
+
+
+# Singleton instance
+single_flight = SingleFlight()
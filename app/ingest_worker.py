@@ -0,0 +1,70 @@
+"""
+Standalone ingestion worker that drains the ingest_job queue
+Usage: python -m app.ingest_worker [--concurrency N] [--poll-interval SECONDS]
+"""
+import argparse
+import os
+import signal
+import threading
+from app.api.services.job_service import JobService
+
+
+def worker_loop(worker_id, stop, poll_interval):
+    job_service = JobService()
+    while not stop.is_set():
+        try:
+            job = job_service.claim_next()
+        except Exception as e:
+            print(f"Worker {worker_id}: error claiming job: {e}")
+            stop.wait(poll_interval)
+            continue
+
+        if not job:
+            stop.wait(poll_interval)
+            continue
+
+        print(f"Worker {worker_id}: picked job {job['job_pk']} (attempt {job['attempts']})")
+        job_service.run_job(job)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tender snapshot ingestion worker")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=int(os.getenv("INGEST_WORKER_CONCURRENCY", "1")),
+        help="Number of jobs processed at the same time",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=float(os.getenv("INGEST_WORKER_POLL_SECONDS", "2")),
+        help="Seconds to wait when the queue is empty",
+    )
+    args = parser.parse_args()
+
+    stop = threading.Event()
+
+    def shutdown(signum, frame):
+        print("Stopping after current jobs finish...")
+        stop.set()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    threads = [
+        threading.Thread(target=worker_loop, args=(i + 1, stop, args.poll_interval), name=f"ingest-worker-{i + 1}")
+        for i in range(args.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    print(f"Ingest worker started with concurrency {args.concurrency}")
+
+    # Join with a timeout so the main thread keeps receiving signals
+    while any(thread.is_alive() for thread in threads):
+        for thread in threads:
+            thread.join(timeout=1)
+
+
+if __name__ == "__main__":
+    main()
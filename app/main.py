@@ -1,16 +1,55 @@
+from contextlib import asynccontextmanager
+import os
 from fastapi import FastAPI
+from starlette.middleware.gzip import DEFAULT_EXCLUDED_CONTENT_TYPES
 from app.api.controllers.health_controller import router as health_router
 from app.api.controllers.auth_controller import router as auth_router
 from app.api.controllers.doc_controller import router as doc_router
-from app.api.controllers.dashboard_controller import router as dashboard_router
+from app.api.controllers.dashboard_controller import router as dashboard_router, sync_router, async_router
+from app.api.utils.async_database import async_db
+from app.api.utils.cache import start_invalidation_listener
+from app.api.utils.exporters import EXPORT_FORMATS
+from app.api.utils.compression import CompressionMiddleware
+from app.api.utils.http_cache import SnapshotCacheMiddleware
+from app.api.services.dashboard_service import DashboardService
+from app.api.services.warmup_service import WarmupService
+from app.api.utils.executors import warmup_executor
+
+# Serve dashboard data from async routes on the asyncpg pool instead of the threadpool + psycopg2
+DASHBOARD_ASYNC = os.getenv("DASHBOARD_ASYNC", "false").lower() == "true"
+# Responses smaller than this go out uncompressed; the levels trade CPU per request for bytes
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1000"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "5"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))
+# xlsx is already a zip and parquet pages are snappy-compressed
+COMPRESSED_EXPORT_TYPES = (EXPORT_FORMATS["xlsx"][0], EXPORT_FORMATS["parquet"][0])
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Snapshots are loaded by the ingest worker; its cache invalidations and warm-up requests arrive over Postgres NOTIFY
+    warmup_service = WarmupService()
+    stop_listener = start_invalidation_listener(
+        on_warm=lambda tndr_pk: warmup_executor.submit(warmup_service.warm_cache, tndr_pk))
+    yield
+    stop_listener.set()
+    await async_db.close()
+
 
 app = FastAPI(
     title="Tender Data Analyzer API",
     description="API for analyzing tender data with dashboard endpoints",
     version="2.0.0",
-    max_request_size=1073741824
+    max_request_size=1073741824,
+    lifespan=lifespan
 )
 
+# Snapshot endpoints get ETag/Cache-Control and 304s; compression wraps it, so 304s pass through untouched
+app.add_middleware(SnapshotCacheMiddleware, version_lookup=DashboardService().get_snapshot_version)
+app.add_middleware(CompressionMiddleware, minimum_size=COMPRESSION_MIN_SIZE, compresslevel=GZIP_LEVEL,
+                   brotli_quality=BROTLI_QUALITY,
+                   exclude_content_types=DEFAULT_EXCLUDED_CONTENT_TYPES + COMPRESSED_EXPORT_TYPES)
+
 @app.get("/")
 def root():
     return {
@@ -24,4 +63,5 @@ app.include_router(health_router, prefix="/api", tags=["health"])
 app.include_router(auth_router, prefix="/api/auth", tags=["auth"])
 app.include_router(doc_router, prefix="/api/docs", tags=["documents"])
 app.include_router(dashboard_router, prefix="/api/dashboard", tags=["dashboard"])
+app.include_router(async_router if DASHBOARD_ASYNC else sync_router, prefix="/api/dashboard", tags=["dashboard"])
 
@@ -0,0 +1,99 @@
+"""
+Compare dashboard throughput of the sync routes (threadpool + psycopg2 pool) and the async
+routes (asyncpg pool) under concurrent load, driving each app in-process over ASGI.
+Run with the result cache off so every request reaches Postgres.
+Usage: CACHE_ENABLED=false python bench_async_dashboard.py --tndr-pk 14 --concurrency 200 --requests 2000
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def build_app(use_async):
+    from fastapi import FastAPI
+    from app.api.controllers.dashboard_controller import router, sync_router, async_router
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api/dashboard")
+    app.include_router(async_router if use_async else sync_router, prefix="/api/dashboard")
+    return app
+
+
+def request_paths(tndr_pk):
+    # With the cache off the deptwise total is recounted on every request, which makes it
+    # a COUNT benchmark; pass it with --path to include it anyway
+    return [
+        f"/api/dashboard/stats?tndr_id={tndr_pk}",
+        f"/api/dashboard/fund-flow?tndr_id={tndr_pk}",
+        f"/api/dashboard/projects-by-completion?tndr_id={tndr_pk}&completion=50&page=2",
+        f"/api/dashboard/tender-masters",
+    ]
+
+
+async def run(use_async, paths, concurrency, total):
+    import httpx
+    from app.api.utils.async_database import async_db
+
+    transport = httpx.ASGITransport(app=build_app(use_async))
+    latencies = []
+    failures = 0
+    queue = iter(range(total))
+
+    async def worker(client):
+        nonlocal failures
+        for i in queue:
+            started = time.perf_counter()
+            response = await client.get(paths[i % len(paths)])
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200 or not response.json().get("success"):
+                failures += 1
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        for path in paths:
+            await client.get(path)
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    await async_db.close()
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(len(latencies) * 0.95) - 1],
+        "failures": failures,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sync vs async dashboard routes")
+    parser.add_argument("--tndr-pk", type=int, required=True)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--connections", type=int, default=10, help="max connections for both pools")
+    parser.add_argument("--path", action="append", help="request path to use instead of the default mix (repeatable)")
+    args = parser.parse_args()
+
+    os.environ["DB_MAX_CONNECTIONS"] = str(args.connections)
+    os.environ["DB_ASYNC_MAX_CONNECTIONS"] = str(args.connections)
+    paths = args.path or request_paths(args.tndr_pk)
+
+    results = {}
+    for use_async in (False, True):
+        results["async" if use_async else "sync"] = asyncio.run(run(use_async, paths, args.concurrency, args.requests))
+
+    print("=" * 64)
+    print(f"{args.requests} requests, {args.concurrency} concurrent, {args.connections} connections per pool")
+    print(f"{'path':<8}{'req/s':>12}{'p50':>14}{'p95':>14}{'failures':>10}")
+    for name, r in results.items():
+        print(f"{name:<8}{r['rps']:>12.1f}{r['p50']:>12.2f}ms{r['p95']:>12.2f}ms{r['failures']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Compare the vectorized DBF decoder with dbfread on a local .dbf snapshot
+Usage: python bench_dbf_decoder.py path/to/file.dbf
+"""
+
+import sys
+import os
+import time
+
+# Ensure app directory is in path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+from dbfread import DBF
+from app.api.utils.dbf_reader import read_dbf
+
+
+def bench(path):
+    started = time.perf_counter()
+    reference = pd.DataFrame(iter(DBF(path, load=True)))
+    dbfread_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    decoded = read_dbf(path)
+    numpy_seconds = time.perf_counter() - started
+
+    print(f"File: {path} ({len(reference)} records, {len(reference.columns)} fields)")
+    print("=" * 60)
+    print(f"dbfread:        {dbfread_seconds:.3f}s")
+    print(f"numpy decoder:  {numpy_seconds:.3f}s")
+    if numpy_seconds > 0:
+        print(f"Speedup:        {dbfread_seconds / numpy_seconds:.1f}x")
+
+    if reference.equals(decoded):
+        print("Output matches dbfread ✓")
+    else:
+        print("Output differs from dbfread ✗")
+        for column in reference.columns:
+            if column not in decoded.columns or not reference[column].equals(decoded[column]):
+                print(f"   column {column!r} differs")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print(__doc__.strip())
+        sys.exit(1)
+    bench(sys.argv[1])
@@ -0,0 +1,90 @@
+"""
+Benchmark Excel ingestion: whole-sheet pd.read_excel vs the streaming readers
+(openpyxl read-only and, if installed, python-calamine). Each reader runs in its own
+process so peak memory (max RSS) is measured separately.
+Usage: python bench_excel_reader.py [rows] [--file existing.xlsx]
+"""
+
+import argparse
+import datetime
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+# Ensure app directory is in path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_workbook(path, rows):
+    import openpyxl
+    from app.api.services.doc_service import TENDER_REQUIRED_COLS
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(TENDER_REQUIRED_COLS)
+    start = datetime.datetime(2020, 1, 1)
+    for i in range(rows):
+        day = start + datetime.timedelta(days=i % 1500)
+        sheet.append([
+            i % 40, i, f"D{i % 7:02d}", f"Work {i}", round(i % 500 * 1.25, 2), day,
+            round(i % 300 * 0.5, 2), day, None if i % 10 == 0 else day, 12.5, 3.25,
+            round(i % 600 * 0.75, 2), 8.0, "In progress" if i % 3 else None,
+        ])
+    workbook.save(path)
+
+
+def run_reader(path, engine):
+    """Runs inside a child process; prints rows, seconds and max RSS in MB"""
+    import pandas as pd
+    from app.api.utils.excel_reader import ExcelStreamReader
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    if engine == "pandas":
+        rows = len(pd.read_excel(path))
+    else:
+        reader = ExcelStreamReader(path, engine)
+        rows = sum(len(chunk) for chunk in reader.iter_chunks())
+        reader.close()
+    elapsed = time.perf_counter() - started
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(rows, elapsed, (peak - baseline) / 1024, peak / 1024)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("rows", nargs="?", type=int, default=200_000)
+    parser.add_argument("--file", default=None)
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_reader(*args.child)
+        raise SystemExit(0)
+
+    path = args.file
+    if path is None:
+        path = os.path.join(tempfile.gettempdir(), f"bench_tender_{args.rows}.xlsx")
+        if not os.path.exists(path):
+            print(f"Writing {args.rows} rows to {path}...")
+            make_workbook(path, args.rows)
+
+    try:
+        import python_calamine  # noqa: F401
+        engines = ["pandas", "openpyxl", "calamine"]
+    except ImportError:
+        engines = ["pandas", "openpyxl"]
+
+    print(f"File: {path} ({os.path.getsize(path) / (1024 * 1024):.1f}MB)")
+    print("=" * 70)
+    print(f"{'engine':<12}{'rows':>10}{'seconds':>10}{'rows/sec':>12}{'RSS growth':>13}{'peak RSS':>12}")
+    for engine in engines:
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", path, engine],
+            capture_output=True, text=True, check=True
+        ).stdout.split()
+        rows, seconds, growth, peak = int(output[0]), float(output[1]), float(output[2]), float(output[3])
+        print(f"{engine:<12}{rows:>10}{seconds:>10.2f}{rows / seconds:>12.0f}{growth:>11.0f}MB{peak:>10.0f}MB")
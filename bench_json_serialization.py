@@ -0,0 +1,97 @@
+"""
+Microbenchmark the response-building cost of a listing page: today's path (dict per row,
+decimal_to_float, FastAPI's jsonable_encoder + JSONResponse) against the fast path
+(float numerics from the driver, rows from tuples, orjson) in both layouts.
+Rows are fetched once, so only the Python side is timed; --end-to-end adds full requests.
+Usage: python bench_json_serialization.py --tndr-pk 14 --page-size 100
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.api.services.dashboard_service import DashboardService, DEPTWISE_KEY_SIZE
+from app.api.utils.database import get_db
+from app.api.utils.fast_json import float_numerics, render
+from app.api.utils.prepared_queries import prepared_queries
+
+
+def fetch(tndr_pk, page_size, fast):
+    db = get_db()
+    conn = db.get_connection()
+    try:
+        cursor = conn.cursor()
+        if fast:
+            float_numerics(cursor)
+        prepared_queries.execute(cursor, "query.dashboard.get_deptwise_page",
+                                 [tndr_pk, tndr_pk, page_size + 1, 0, tndr_pk])
+        names = [desc[0] for desc in cursor.description]
+        rows = cursor.fetchall()
+        cursor.close()
+        return names, rows
+    finally:
+        db.release_connection(conn)
+
+
+def timed(fn, runs):
+    fn()
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        body = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dashboard JSON serialization paths")
+    parser.add_argument("--tndr-pk", type=int, required=True)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=500)
+    parser.add_argument("--end-to-end", action="store_true", help="also time full service calls; with CACHE_ENABLED=false the uncached COUNT dominates them")
+    args = parser.parse_args()
+
+    service = DashboardService()
+    names, decimal_rows = fetch(args.tndr_pk, args.page_size, fast=False)
+    _, float_rows = fetch(args.tndr_pk, args.page_size, fast=True)
+
+    def page(rows, layout):
+        return service._page_result("tender_details_deptwise", args.tndr_pk, {"dept_name": None}, rows, 0,
+                                    DEPTWISE_KEY_SIZE, 1, args.page_size, names, layout)
+
+    def today():
+        result = page([dict(zip(names, row)) for row in decimal_rows], None)
+        return JSONResponse(jsonable_encoder(result)).body
+
+    paths = {
+        "today (dicts + encoder)": today,
+        "fast, layout=rows": lambda: render(page(float_rows, "rows")).body,
+        "fast, layout=columns": lambda: render(page(float_rows, "columns")).body,
+    }
+    if args.end_to_end:
+        paths.update({
+            "e2e today": lambda: JSONResponse(jsonable_encoder(
+                service.get_tender_details_deptwise(args.tndr_pk, None, 1, args.page_size))).body,
+            "e2e layout=rows": lambda: render(
+                service.get_tender_details_deptwise(args.tndr_pk, None, 1, args.page_size, None, "rows")).body,
+            "e2e layout=columns": lambda: render(
+                service.get_tender_details_deptwise(args.tndr_pk, None, 1, args.page_size, None, "columns")).body,
+        })
+
+    print("=" * 64)
+    print(f"deptwise page of {args.page_size} rows, median of {args.runs} runs")
+    print(f"{'path':<28}{'time':>14}{'bytes':>12}")
+    for name, fn in paths.items():
+        elapsed, size = timed(fn, args.runs)
+        print(f"{name:<28}{elapsed:>12.3f}ms{size:>12}")
+
+
+if __name__ == "__main__":
+    main()
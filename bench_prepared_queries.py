@@ -0,0 +1,63 @@
+"""
+Compare dashboard query latency run as plain statements and as prepared statements,
+timing the service calls directly (run with the result cache off).
+Usage: CACHE_ENABLED=false python bench_prepared_queries.py --tndr-pk 14 --runs 200
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.api.services.dashboard_service import DashboardService
+from app.api.utils import prepared_queries as prepared_module
+
+
+def calls(service, tndr_pk, dept_name):
+    return {
+        "overview": lambda: service.get_overview(tndr_pk),
+        "overview (dept)": lambda: service.get_overview(tndr_pk, dept_name),
+        "fund_flow": lambda: service.get_fund_flow(tndr_pk),
+        "deptwise page 1": lambda: service.get_tender_details_deptwise(tndr_pk, None, 1, 10),
+        "completion page 1": lambda: service.get_projects_by_completion(tndr_pk, "50", 1, 10),
+    }
+
+
+def measure(fn, runs):
+    fn()
+    latencies = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        latencies.append((time.perf_counter() - started) * 1000)
+        if not result.get("success"):
+            raise RuntimeError(result)
+    return statistics.median(latencies), sorted(latencies)[int(len(latencies) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark prepared dashboard statements")
+    parser.add_argument("--tndr-pk", type=int, required=True)
+    parser.add_argument("--dept-name", default="a")
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    service = DashboardService()
+    results = {}
+    for enabled in (False, True):
+        prepared_module.PREPARE_ENABLED = enabled
+        for name, fn in calls(service, args.tndr_pk, args.dept_name).items():
+            results.setdefault(name, {})[enabled] = measure(fn, args.runs)
+
+    print("=" * 72)
+    print(f"{'query':<20}{'plain p50':>13}{'p95':>13}{'prepared p50':>13}{'p95':>13}")
+    for name, timings in results.items():
+        (plain_p50, plain_p95), (prep_p50, prep_p95) = timings[False], timings[True]
+        print(f"{name:<20}{plain_p50:>11.2f}ms{plain_p95:>11.2f}ms{prep_p50:>11.2f}ms{prep_p95:>11.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Compare S3 upload paths: temp-file spooling + upload_file vs streaming multipart upload,
+and three files uploaded one after another vs in parallel.
+Runs against an in-process moto S3 by default, or a real endpoint (e.g. MinIO) with --endpoint-url.
+Usage: python bench_s3_upload.py [--size-mb 64] [--endpoint-url http://127.0.0.1:9000 --bucket tender]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+# Ensure app directory is in path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def legacy_upload(s3_client, fileobj, object_name):
+    with tempfile.NamedTemporaryFile(delete=False) as temp_file:
+        while chunk := fileobj.read(8 * 1024 * 1024):
+            temp_file.write(chunk)
+        temp_file_path = temp_file.name
+    try:
+        return s3_client.upload_file(temp_file_path, object_name)
+    finally:
+        os.unlink(temp_file_path)
+
+
+def timed(label, size_mb, func):
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<44} {elapsed:7.2f}s {size_mb / elapsed:8.1f} MB/s")
+
+
+def run(args):
+    from app.api.utils.s3_client import s3_client
+
+    payload = os.urandom(args.size_mb * 1024 * 1024)
+    total_mb = args.size_mb * 3
+    print(f"Uploading {args.size_mb}MB files to bucket {s3_client.bucket_name}")
+    print("=" * 70)
+
+    timed("temp file + upload_file (1 file)", args.size_mb,
+          lambda: legacy_upload(s3_client, BytesIO(payload), "bench/legacy.bin"))
+    timed("streaming multipart (1 file)", args.size_mb,
+          lambda: s3_client.upload_stream(BytesIO(payload), "bench/stream.bin"))
+
+    def sequential(upload):
+        for i in range(3):
+            upload(BytesIO(payload), f"bench/seq-{i}.bin")
+
+    def parallel(upload):
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            list(pool.map(lambda i: upload(BytesIO(payload), f"bench/par-{i}.bin"), range(3)))
+
+    timed("temp file + upload_file (3 files, sequential)", total_mb,
+          lambda: sequential(lambda f, key: legacy_upload(s3_client, f, key)))
+    timed("streaming multipart (3 files, parallel)", total_mb,
+          lambda: parallel(s3_client.upload_stream))
+
+    body = s3_client.client.get_object(Bucket=s3_client.bucket_name, Key="bench/stream.bin")["Body"].read()
+    print("=" * 70)
+    print(f"Streamed object matches source: {body == payload}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--endpoint-url", default=None)
+    parser.add_argument("--bucket", default="tender-bench")
+    args = parser.parse_args()
+
+    os.environ["BUCKET_NAME"] = args.bucket
+    if args.endpoint_url:
+        os.environ["S3_ENDPOINT_URL"] = args.endpoint_url
+        run(args)
+    else:
+        try:
+            from moto import mock_aws
+        except ImportError:
+            print("moto is required without --endpoint-url: pip install moto")
+            raise SystemExit(1)
+        os.environ.setdefault("AWS_ACCESS_KEY", "testing")
+        os.environ.setdefault("AWS_SECRET_KEY", "testing")
+        with mock_aws():
+            import boto3
+            boto3.client("s3", region_name="us-east-1").create_bucket(Bucket=args.bucket)
+            run(args)
@@ -0,0 +1,93 @@
+"""
+Simulate a new snapshot being opened by many users at once: waves of identical concurrent
+dashboard requests, with request coalescing on and off. Reports time per wave, pool checkouts
+(one per query actually run) and how many requests were collapsed into another's execution.
+Run with the result cache off so every wave starts cold.
+Usage: CACHE_ENABLED=false python bench_single_flight.py --tndr-pk 14 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def build_app(use_async):
+    from fastapi import FastAPI
+    from app.api.controllers.dashboard_controller import router, sync_router, async_router
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api/dashboard")
+    app.include_router(async_router if use_async else sync_router, prefix="/api/dashboard")
+    return app
+
+
+def checkouts(use_async):
+    from app.api.utils.async_database import async_db
+    from app.api.utils.database import get_db
+
+    stats = async_db.pool_stats() if use_async else get_db().pool_stats()
+    return stats["checkouts"] if stats else 0
+
+
+async def run(use_async, paths, concurrency, waves, coalesce):
+    import httpx
+    from app.api.utils.async_database import async_db
+    from app.api.utils.single_flight import single_flight
+
+    single_flight.enabled = coalesce
+    transport = httpx.ASGITransport(app=build_app(use_async))
+    timings = []
+    failures = 0
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        for path in paths:
+            await client.get(path)
+        coalesced_before = single_flight.snapshot()["coalesced"]
+        checkouts_before = checkouts(use_async)
+        for _ in range(waves):
+            started = time.perf_counter()
+            responses = await asyncio.gather(*(client.get(paths[i % len(paths)]) for i in range(concurrency)))
+            timings.append((time.perf_counter() - started) * 1000)
+            failures += sum(1 for r in responses if r.status_code != 200 or not r.json().get("success"))
+        result = {
+            "wave_ms": statistics.median(timings),
+            "checkouts": (checkouts(use_async) - checkouts_before) / waves,
+            "coalesced": (single_flight.snapshot()["coalesced"] - coalesced_before) / waves,
+            "failures": failures,
+        }
+    await async_db.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark request coalescing of identical dashboard requests")
+    parser.add_argument("--tndr-pk", type=int, required=True)
+    parser.add_argument("--concurrency", type=int, default=50, help="identical requests per wave")
+    parser.add_argument("--waves", type=int, default=5)
+    parser.add_argument("--connections", type=int, default=10, help="max connections for the pool")
+    parser.add_argument("--async-routes", action="store_true", help="use the async routes and asyncpg pool")
+    parser.add_argument("--path", action="append", help="request path to use instead of /summary (repeatable)")
+    args = parser.parse_args()
+
+    os.environ["DB_MAX_CONNECTIONS"] = str(args.connections)
+    os.environ["DB_ASYNC_MAX_CONNECTIONS"] = str(args.connections)
+    paths = args.path or [f"/api/dashboard/summary?tndr_id={args.tndr_pk}"]
+
+    results = {}
+    for coalesce in (False, True):
+        results["coalesced" if coalesce else "separate"] = asyncio.run(
+            run(args.async_routes, paths, args.concurrency, args.waves, coalesce))
+
+    print("=" * 64)
+    print(f"{args.concurrency} identical requests per wave, {args.waves} waves, {args.connections} connections")
+    print(f"{'mode':<11}{'wave':>12}{'checkouts':>12}{'collapsed':>12}{'failures':>10}")
+    for name, r in results.items():
+        print(f"{name:<11}{r['wave_ms']:>10.1f}ms{r['checkouts']:>12.1f}{r['coalesced']:>12.1f}{r['failures']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Measure /api/dashboard/stats latency before and during a large /upload-doc request
+against a running server. Requires httpx (pip install httpx).
+Usage: python bench_upload_latency.py --tndr-id 14 --tender t.xlsx --district d.xlsx --dept p.xlsx
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+async def sample_stats(client, tndr_id, stop_event=None, count=20):
+    latencies = []
+    while True:
+        started = time.perf_counter()
+        response = await client.get("/api/dashboard/stats", params={"tndr_id": tndr_id})
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+        if stop_event is None and len(latencies) >= count:
+            break
+        if stop_event is not None and stop_event.is_set():
+            break
+        await asyncio.sleep(0.05)
+    return latencies
+
+
+async def upload(client, args, done):
+    files = {
+        "tender_file": (os.path.basename(args.tender), open(args.tender, "rb")),
+        "district_file": (os.path.basename(args.district), open(args.district, "rb")),
+        "dept_file": (os.path.basename(args.dept), open(args.dept, "rb")),
+    }
+    started = time.perf_counter()
+    try:
+        response = await client.post("/api/docs/upload-doc", files=files, timeout=None)
+        print(f"Upload finished with {response.status_code} in {time.perf_counter() - started:.1f}s")
+    finally:
+        for _, handle in files.values():
+            handle.close()
+        done.set()
+
+
+def report(label, latencies):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) > 1 else latencies[0]
+    print(f"{label:<18} n={len(latencies):<4} median={statistics.median(latencies):7.1f}ms "
+          f"p95={p95:7.1f}ms max={latencies[-1]:7.1f}ms")
+
+
+async def main(args):
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=30) as client:
+        baseline = await sample_stats(client, args.tndr_id)
+        done = asyncio.Event()
+        upload_task = asyncio.create_task(upload(client, args, done))
+        during = await sample_stats(client, args.tndr_id, stop_event=done)
+        await upload_task
+
+    print("=" * 60)
+    report("idle", baseline)
+    report("during upload", during)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8001")
+    parser.add_argument("--tndr-id", type=int, required=True)
+    parser.add_argument("--tender", required=True)
+    parser.add_argument("--district", required=True)
+    parser.add_argument("--dept", required=True)
+    args = parser.parse_args()
+
+    if httpx is None:
+        print("httpx is required: pip install httpx")
+        raise SystemExit(1)
+    asyncio.run(main(args))
@@ -0,0 +1,57 @@
+"""
+Build the TENDER_SUMMARY rows the dashboard reads, for snapshots loaded before the
+summary table existed (new snapshots get theirs at ingest time)
+Usage: python build_summaries.py [--tndr-pk N] [--all]
+"""
+
+import argparse
+import sys
+import os
+
+# Ensure app directory is in path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.api.dao.doc_dao import DocDAO
+from app.api.utils.database import get_db
+
+
+def build_summaries(tndr_pks):
+    doc_dao = DocDAO()
+    print(f"Building summaries for {len(tndr_pks)} snapshot(s)...")
+    print("=" * 60)
+
+    success_count = 0
+    fail_count = 0
+    for tndr_pk in tndr_pks:
+        try:
+            rows = doc_dao.build_summary(tndr_pk)
+            print(f"   ✓ Snapshot {tndr_pk}: {rows} summary rows")
+            success_count += 1
+        except Exception as e:
+            print(f"   ✗ Snapshot {tndr_pk}: {e}")
+            fail_count += 1
+
+    print("=" * 60)
+    print(f"Done! {success_count} succeeded, {fail_count} failed.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill snapshot summary rows")
+    parser.add_argument("--tndr-pk", type=int, action="append", help="Rebuild this snapshot (repeatable)")
+    parser.add_argument("--all", action="store_true", help="Rebuild every snapshot, not only missing ones")
+    args = parser.parse_args()
+
+    if args.tndr_pk:
+        tndr_pks = args.tndr_pk
+    elif args.all:
+        db = get_db()
+        conn = db.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT tndr_pk FROM tender_master ORDER BY tndr_pk")
+        tndr_pks = [row[0] for row in cursor.fetchall()]
+        cursor.close()
+        db.release_connection(conn)
+    else:
+        tndr_pks = DocDAO().get_snapshots_without_summary()
+
+    build_summaries(tndr_pks)
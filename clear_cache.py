@@ -1,7 +1,22 @@
-from app.api.utils.redis_client import redis_client
+"""
+Clear cached dashboard results
+Usage: python clear_cache.py [--tndr-pk N]
+"""
+
+import argparse
+from app.api.utils.cache import clear_all, invalidate_snapshot
+
+parser = argparse.ArgumentParser(description="Clear cached dashboard results")
+parser.add_argument("--tndr-pk", type=int, action="append", help="Only flush this snapshot (repeatable)")
+args = parser.parse_args()
 
 try:
-    redis_client.flushdb()
-    print("Redis cache cleared successfully!")
+    if args.tndr_pk:
+        for tndr_pk in args.tndr_pk:
+            removed = invalidate_snapshot(tndr_pk)
+            print(f"Cache cleared for snapshot {tndr_pk} ({removed} entries here; other processes notified)")
+    else:
+        removed = clear_all()
+        print(f"Cache cleared successfully! ({removed} entries here; other processes notified)")
 except Exception as e:
     print(f"Error clearing cache: {e}")
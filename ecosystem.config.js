@@ -12,5 +12,23 @@ module.exports = {
       NODE_ENV: 'production',
       PYTHONPATH: '/root/tender-data-analyser-v2'
     }
+  }, {
+    name: 'tender-ingest-worker',
+    script: '.venv/bin/python',
+    args: '-m app.ingest_worker',
+    cwd: '/root/tender-data-analyser-v2',
+    instances: 1,
+    autorestart: true,
+    watch: false,
+    max_memory_restart: '2G',
+    // Let a running job finish its current chunk before pm2 kills the process
+    kill_timeout: 30000,
+    env: {
+      NODE_ENV: 'production',
+      PYTHONPATH: '/root/tender-data-analyser-v2',
+      INGEST_WORKER_CONCURRENCY: '2',
+      // Each job loads three files in parallel
+      INGEST_MAX_WORKERS: '6'
+    }
   }]
 };
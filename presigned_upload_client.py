@@ -0,0 +1,75 @@
+"""
+Upload snapshot files straight to S3 through the presigned multipart API and print the S3 keys
+to pass to /api/docs/process-all-doc. Requires httpx (pip install httpx).
+Usage: python presigned_upload_client.py --tender t.dbf --district d.xlsx --dept p.xlsx
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+def upload_file(api, path, file_type, part_workers):
+    size = os.path.getsize(path)
+    started = time.perf_counter()
+    upload = api.post("/api/docs/presigned-upload", json={
+        "file_type": file_type, "filename": os.path.basename(path), "size": size
+    })
+    upload.raise_for_status()
+    upload = upload.json()
+    part_size = upload["part_size"]
+
+    def put_part(part):
+        with open(path, "rb") as handle:
+            handle.seek((part["part_number"] - 1) * part_size)
+            response = httpx.put(part["url"], content=handle.read(part_size), timeout=None)
+        response.raise_for_status()
+        return {"part_number": part["part_number"], "etag": response.headers["ETag"]}
+
+    try:
+        with ThreadPoolExecutor(max_workers=part_workers) as pool:
+            parts = list(pool.map(put_part, upload["parts"]))
+    except Exception:
+        api.post("/api/docs/presigned-upload/abort", json={"key": upload["key"], "upload_id": upload["upload_id"]})
+        raise
+
+    done = api.post("/api/docs/presigned-upload/complete", json={
+        "key": upload["key"], "upload_id": upload["upload_id"], "parts": parts
+    })
+    done.raise_for_status()
+    elapsed = time.perf_counter() - started
+    print(f"{file_type:<11} {size / (1024 * 1024):8.1f}MB in {elapsed:6.1f}s "
+          f"({size / (1024 * 1024) / elapsed:6.1f} MB/s) -> {upload['key']}")
+    return upload["key"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8001")
+    parser.add_argument("--tender", required=True)
+    parser.add_argument("--district", required=True)
+    parser.add_argument("--dept", required=True)
+    parser.add_argument("--part-workers", type=int, default=4)
+    args = parser.parse_args()
+
+    if httpx is None:
+        print("httpx is required: pip install httpx")
+        raise SystemExit(1)
+
+    files = {"tender": args.tender, "district": args.district, "department": args.dept}
+    with httpx.Client(base_url=args.base_url, timeout=60) as api:
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            keys = dict(zip(files, pool.map(
+                lambda item: upload_file(api, item[1], item[0], args.part_workers), files.items()
+            )))
+
+    print("=" * 60)
+    print(f"tender_s3_path={keys['tender']}")
+    print(f"district_s3_path={keys['district']}")
+    print(f"dept_s3_path={keys['department']}")
@@ -32,11 +32,26 @@ def add_indexes():
         'CREATE INDEX IF NOT EXISTS idx_dept_dtls_code ON "DEPT_DTLS"("DEPT_SUB_DEPT_CODE")',
         'CREATE INDEX IF NOT EXISTS idx_dept_dtls_name ON "DEPT_DTLS"("DEPT_NAME")',
 
+        # Trigram index for department-name lookups (needs the pg_trgm contrib extension)
+        'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+        'CREATE INDEX IF NOT EXISTS idx_dept_dtls_name_trgm ON "DEPT_DTLS" USING gin ("DEPT_NAME" gin_trgm_ops)',
+
         # Indexes for DISTRICT_DETAILS table
         'CREATE INDEX IF NOT EXISTS idx_district_code ON "DISTRICT_DETAILS"("DIST_CODE")',
 
         # Index for tender_master
         'CREATE INDEX IF NOT EXISTS idx_tender_master_pk ON tender_master(tndr_pk)',
+
+        # Keyset pagination: seek on snapshot, department/project order, then row id
+        'CREATE INDEX IF NOT EXISTS idx_tender_data_keyset ON "TENDER_DATA_DTLS"(tndr_pk, ("DEPARTMENT_CODE" IS NULL), COALESCE("DEPARTMENT_CODE", \'\'), ("PROJECT_NAME" IS NULL), COALESCE("PROJECT_NAME", \'\'), "TDM_PK")',
+        'CREATE INDEX IF NOT EXISTS idx_tender_data_stage_keyset ON "TENDER_DATA_DTLS"(tndr_pk, "COMPLETION_STAGE", ("DEPARTMENT_CODE" IS NULL), COALESCE("DEPARTMENT_CODE", \'\'), ("PROJECT_NAME" IS NULL), COALESCE("PROJECT_NAME", \'\'), "TDM_PK")',
+        'CREATE INDEX IF NOT EXISTS idx_dept_dtls_keyset ON "DEPT_DTLS"(tndr_pk, ("DEPT_NAME" IS NULL), COALESCE("DEPT_NAME", \'\'), "DEPT_DTLS_PK")',
+
+        # Index for the snapshot summary table
+        'CREATE INDEX IF NOT EXISTS idx_tender_summary_tndr_pk ON "TENDER_SUMMARY"(tndr_pk, "DEPARTMENT_CODE")',
+
+        # Index for the ingest job queue
+        'CREATE INDEX IF NOT EXISTS idx_ingest_job_status ON ingest_job(status, job_pk)',
     ]
 
     print("Adding database indexes for performance optimization...")